@@ -0,0 +1,71 @@
+"""Name normalization through precompiled alias lookups"""
+
+import difflib
+from typing import Dict, Iterable, Mapping
+
+
+class AliasIndex:
+    """Resolve spellings of a name to its canonical form with a dictionary lookup.
+
+    Canonical names and known aliases are indexed up front under a normalized key
+    (case and separators ignored). Spellings missing from the index fall back to a
+    fuzzy match against the canonical names, and the outcome is memoized so every
+    spelling is matched at most once. Without canonical names, spellings resolve to
+    themselves with collapsed whitespace.
+    """
+
+    def __init__(
+        self,
+        canonical: Iterable[str] = (),
+        aliases: Mapping[str, str] | None = None,
+        cutoff: float = 0.6,
+    ):
+        """Initialize the index.
+
+        Args:
+            canonical (Iterable[str]): Canonical names, used for the fuzzy fallback.
+            aliases (Mapping[str, str] | None): Known misspellings and their canonical
+                names.
+            cutoff (float): Minimum similarity of a fuzzy match, between 0 and 1.
+        """
+        self.canonical = list(canonical)
+        self.cutoff = cutoff
+        self._lookup: Dict[str, str | None] = {
+            self.normalize(name): name for name in self.canonical
+        }
+        self._lookup.update(
+            {self.normalize(alias): name for alias, name in (aliases or {}).items()}
+        )
+        self._learned: Dict[str, str] = {}
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Build the lookup key of a name, ignoring case, hyphens and extra spaces."""
+        return " ".join(name.replace("-", " ").split()).lower()
+
+    def resolve(self, name: str) -> str | None:
+        """Return the canonical form of `name`, or None when nothing matches."""
+        key = self.normalize(name)
+        try:
+            return self._lookup[key]
+        except KeyError:
+            pass
+
+        if self.canonical:
+            matches = difflib.get_close_matches(
+                name, self.canonical, n=1, cutoff=self.cutoff
+            )
+            match = matches[0] if matches else None
+            # Only spellings corrected by the fuzzy fallback are worth an alias
+            if match is not None and self.normalize(match) != key:
+                self._learned[key] = match
+        else:
+            match = " ".join(name.split())
+
+        # Misses are memoized too, so a bad spelling is only fuzzy matched once
+        self._lookup[key] = match
+        return match
+
+    def learned_aliases(self) -> Dict[str, str]:
+        """Return the spellings corrected by the fuzzy fallback, by normalized key."""
+        return dict(self._learned)
@@ -0,0 +1,197 @@
+"""Compression of the response bodies negotiated with `Accept-Encoding`"""
+
+import zlib
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, List
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Bodies already compressed by their format gain nothing from a second pass
+INCOMPRESSIBLE_MEDIA_TYPES = (
+    "application/vnd.apache.parquet",
+    "application/zip",
+    "application/gzip",
+)
+
+# Suffix appended to the entity tag of every encoding, e.g. `"abc-gzip"`
+ETAG_SUFFIXES = ("-zstd", "-gzip")
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """Return the content codings accepted by the client, preferred ones first."""
+    codings = []
+    for position, item in enumerate(accept_encoding.split(",")):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            codings.append((-quality, position, coding.lower()))
+    return [coding for _, _, coding in sorted(codings)]
+
+
+def strip_encoding(etag: str) -> str:
+    """Return the entity tag of the identity body, e.g. from `If-None-Match`."""
+    for suffix in ETAG_SUFFIXES:
+        if etag.endswith(f'{suffix}"'):
+            return etag[: -len(suffix) - 1] + '"'
+    return etag
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Return the entity tag of the body compressed with `encoding`."""
+    return f'{strip_encoding(etag)[:-1]}-{encoding}"'
+
+
+class GzipCompressor:
+    """Incremental gzip encoder with the interface of `zstandard` compressors."""
+
+    def __init__(self, level: int):
+        """Initialize a gzip stream, `wbits` 31 writes the gzip header and trailer."""
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Encode a part of the body, flushing it so the client can decode it."""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def flush(self) -> bytes:
+        """Finish the stream."""
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class ZstdCompressor:
+    """Incremental zstd encoder, each part is flushed so the client can decode it."""
+
+    def __init__(self, level: int):
+        """Initialize a zstd stream, requires the zstandard package."""
+        import zstandard  # pylint: disable=import-outside-toplevel,import-error
+
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        """Encode a part of the body."""
+        return self._compressor.compress(data) + self._compressor.flush(
+            self._flush_block
+        )
+
+    def flush(self) -> bytes:
+        """Finish the frame."""
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """Compress response bodies with zstd or gzip, as accepted by the client.
+
+    Streamed bodies are compressed part by part, so the first rows still reach the
+    client before the query completes. zstd is offered when the zstandard package is
+    installed. Entity tags get a suffix per encoding, keeping them strong.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): Application whose responses are compressed.
+            minimum_size (int): Single part bodies smaller than this are sent as is.
+            gzip_level (int): Compression level of gzip, from 1 to 9.
+            zstd_level (int): Compression level of zstd, from 1 to 22.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders: Dict[str, Callable[[], Any]] = {
+            "gzip": lambda: GzipCompressor(gzip_level)
+        }
+        if find_spec("zstandard") is not None:
+            self.encoders["zstd"] = lambda: ZstdCompressor(zstd_level)
+
+    def select_encoding(self, scope: Scope) -> str | None:
+        """Return the preferred encoding supported on both sides, if any."""
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        for coding in accepted_encodings(accept_encoding):
+            if coding in self.encoders:
+                return coding
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.select_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        state: Dict[str, Any] = {"start": None, "encoder": None, "skip": False}
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+        revalidating = f'-{encoding}"' in if_none_match
+
+        async def send_compressed(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                state["start"] = message
+                state["skip"] = (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith(
+                        INCOMPRESSIBLE_MEDIA_TYPES
+                    )
+                    or message["status"] in (204, 304)
+                )
+                if message["status"] == 304 and "etag" in headers and revalidating:
+                    # Matches the tag of the compressed body the client holds
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body, more_body = message.get("body", b""), message.get("more_body", False)
+            start = state["start"]
+            if start is not None:
+                # The headers are held back until the first part of the body tells
+                # whether the response is worth compressing
+                state["start"] = None
+                if state["skip"] or (not more_body and len(body) < self.minimum_size):
+                    state["skip"] = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = encoding
+                del headers["Content-Length"]
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                state["encoder"] = self.encoders[encoding]()
+                await send(start)
+
+            if state["skip"]:
+                await send(message)
+                return
+
+            encoder = state["encoder"]
+            data = encoder.compress(body) if body else b""
+            if not more_body:
+                data += encoder.flush()
+            await send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,83 @@
+"""Validators of the API responses and conditional requests"""
+
+import hashlib
+import json
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Tuple
+
+from starlette.datastructures import Headers
+
+from agritechtz.api.common.compression import strip_encoding
+
+# Time of the last ingested bulletin and date of the latest price
+Watermark = Tuple[datetime | None, date | None]
+
+
+def entity_tag(watermark: Watermark, params: Dict[str, Any]) -> str:
+    """Build a strong entity tag for a response.
+
+    The tag changes whenever a bulletin is ingested or the normalized query
+    parameters differ, without reading the rows of the response.
+
+    Args:
+        watermark (Watermark): Ingest watermark of the crop prices.
+        params (Dict[str, Any]): Normalized query parameters of the response.
+
+    Returns:
+        str: Quoted entity tag.
+    """
+    digest = hashlib.sha256(
+        json.dumps(
+            {"watermark": list(watermark), "params": params},
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def validator_headers(
+    etag: str, last_modified: datetime | None, max_age: int
+) -> Dict[str, str]:
+    """Return the validator and caching headers of a response.
+
+    `max_age` lets shared caches, e.g. the nginx front end, serve the response for a
+    few seconds before revalidating it.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def not_modified(headers: Headers, etag: str, last_modified: datetime | None) -> bool:
+    """Tell whether the client already holds the current version of the response.
+
+    `If-None-Match` takes precedence over `If-Modified-Since`, as in RFC 9110. Tags
+    compare weakly and ignore the suffix added by the compression.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {
+            strip_encoding(tag.strip().removeprefix("W/"))
+            for tag in if_none_match.split(",")
+        }
+        return "*" in tags or etag in tags
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have a one second resolution
+    return last_modified.replace(microsecond=0) <= since
@@ -1,6 +1,9 @@
 """Dependencies module for the API endpoints"""
 
+from agritechtz.cache_config import get_latest_prices, get_result_cache
+from agritechtz.latest_prices import LatestPricesSnapshot
 from agritechtz.repository import CropPricesRepository
+from agritechtz.result_cache import QueryResultCache
 
 from fastapi import Request
 
@@ -10,3 +13,13 @@ def crop_prices_repository(request: Request):
     session = request.state.session
 
     return CropPricesRepository(session)
+
+
+def query_result_cache() -> QueryResultCache:
+    """Factory function for the cache of rendered query results"""
+    return get_result_cache()
+
+
+def latest_prices_snapshot() -> LatestPricesSnapshot:
+    """Factory function for the in-process snapshot of the latest prices"""
+    return get_latest_prices()
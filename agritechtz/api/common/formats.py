@@ -0,0 +1,191 @@
+"""Output formats of the crop prices and their negotiation"""
+
+from importlib.util import find_spec
+from typing import Any, AsyncIterator, Dict, List, Literal, Sequence
+
+import anyio.to_thread
+from fastapi import HTTPException, status
+from sqlalchemy import Row
+
+OutputFormat = Literal["csv", "parquet", "arrow"]
+
+MEDIA_TYPES: Dict[OutputFormat, str] = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Other names clients send for the same formats
+MEDIA_TYPE_ALIASES: Dict[str, OutputFormat] = {
+    "application/x-parquet": "parquet",
+    "application/parquet": "parquet",
+    "application/vnd.apache.arrow.file": "arrow",
+}
+
+# Columnar formats pay off with large batches, each one becomes a Parquet row group
+COLUMNAR_CHUNK_SIZE = 50000
+
+COLUMNS = ["ts", "region", "district", "crop", "min_price", "max_price"]
+
+
+def negotiate_format(accept: str | None, requested: str | None) -> OutputFormat:
+    """Pick the output format from the `format` parameter or the `Accept` header.
+
+    The parameter wins over the header. Media ranges are tried by decreasing quality
+    and CSV is returned when none of them is supported, e.g. for `*/*`.
+
+    Args:
+        accept (str | None): Value of the `Accept` header.
+        requested (str | None): Value of the `format` query parameter.
+
+    Raises:
+        HTTPException: 406 when a columnar format is selected but pyarrow is missing.
+
+    Returns:
+        OutputFormat: Format of the response body.
+    """
+    output_format: OutputFormat = "csv"
+    if requested is not None:
+        output_format = requested  # type: ignore[assignment]
+    elif accept:
+        ranges = []
+        for position, media_range in enumerate(accept.split(",")):
+            media_type, *params = (part.strip() for part in media_range.split(";"))
+            quality = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                ranges.append((-quality, position, media_type.lower()))
+
+        by_media_type = {media_type: name for name, media_type in MEDIA_TYPES.items()}
+        by_media_type.update(MEDIA_TYPE_ALIASES)
+        for _, _, media_type in sorted(ranges):
+            if media_type in by_media_type:
+                output_format = by_media_type[media_type]
+                break
+
+    if output_format != "csv" and find_spec("pyarrow") is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"The {output_format} format requires pyarrow on the server.",
+        )
+    return output_format
+
+
+class ChunkSink:
+    """Write-only file collecting the bytes written since the last `drain`.
+
+    Unlike a truncated `BytesIO`, `tell` keeps counting from the start of the stream,
+    which the Parquet writer relies on to record the offsets of the row groups.
+    """
+
+    def __init__(self):
+        """Initialize an empty sink."""
+        self.closed = False
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        """Buffer `data` until the next `drain`."""
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        """Return the number of bytes written since the sink was created."""
+        return self._position
+
+    def writable(self) -> bool:
+        """The sink only supports writing."""
+        return True
+
+    def seekable(self) -> bool:
+        """The bytes already drained cannot be sought back to."""
+        return False
+
+    def flush(self):
+        """Nothing to flush, the bytes are kept until drained."""
+
+    def close(self):
+        """Mark the sink as closed, the buffered bytes can still be drained."""
+        self.closed = True
+
+    def drain(self) -> bytes:
+        """Return and forget the bytes written since the last call."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def record_batch(rows: Sequence[Row], schema: Any):
+    """Turn a chunk of crop price rows into an Arrow record batch, column by column."""
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel,import-error
+
+    return pa.record_batch(
+        [
+            pa.array([getattr(row, column) for row in rows], type=field.type)
+            for column, field in zip(COLUMNS, schema)
+        ],
+        schema=schema,
+    )
+
+
+async def columnar_chunks(
+    chunks: AsyncIterator[Sequence[Row]], output_format: OutputFormat
+) -> AsyncIterator[bytes]:
+    """Render chunks of crop price rows as a Parquet file or an Arrow IPC stream.
+
+    Every chunk is converted into one record batch and the bytes are sent as soon as
+    the writer produces them. Batches are built and encoded in a worker thread, so
+    the event loop keeps serving other requests. pyarrow is imported on first use,
+    so the API starts without it.
+
+    Args:
+        chunks (AsyncIterator[Sequence[Row]]): Chunks of crop price rows.
+        output_format (OutputFormat): `parquet` or `arrow`.
+
+    Yields:
+        bytes: Consecutive parts of the encoded body.
+    """
+    # pylint: disable=import-outside-toplevel,import-error
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    schema = pa.schema(
+        [
+            ("ts", pa.date32()),
+            ("region", pa.string()),
+            ("district", pa.string()),
+            ("crop", pa.string()),
+            ("min_price", pa.decimal128(12, 2)),
+            ("max_price", pa.decimal128(12, 2)),
+        ]
+    )
+
+    sink = ChunkSink()
+    if output_format == "parquet":
+        writer = pyarrow.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pyarrow.ipc.new_stream(sink, schema)
+
+    def encode(rows: Sequence[Row]) -> bytes:
+        writer.write_batch(record_batch(rows, schema))
+        return sink.drain()
+
+    try:
+        async for rows in chunks:
+            data = await anyio.to_thread.run_sync(encode, rows)
+            if data:
+                yield data
+    finally:
+        writer.close()
+
+    # The Parquet footer or the end of stream marker
+    yield sink.drain()
@@ -0,0 +1,71 @@
+"""Keyset pagination helpers for the API endpoints"""
+
+import json
+from datetime import date
+from typing import Any, List, Sequence
+
+from fastapi import HTTPException, status
+from fastapi_pagination.cursor import decode_cursor, encode_cursor
+
+
+def encode_keyset_cursor(ordering: Sequence[str], key: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor.
+
+    Args:
+        ordering (Sequence[str]): Ordering the page was sorted by, e.g. `["+ts"]`.
+        key (Sequence[Any]): Values of the keyset columns of the last row.
+
+    Returns:
+        str: URL safe cursor pointing right after the given row.
+    """
+    payload = json.dumps(
+        {"o": list(ordering), "k": [_encode_value(value) for value in key]},
+        separators=(",", ":"),
+    )
+    return encode_cursor(payload)
+
+
+def decode_keyset_cursor(
+    cursor: str, ordering: Sequence[str], key_size: int
+) -> List[Any]:
+    """Decode a cursor produced by `encode_keyset_cursor`.
+
+    Args:
+        cursor (str): Cursor received from the client.
+        ordering (Sequence[str]): Ordering of the requested page, which must match the
+            ordering the cursor was created with.
+        key_size (int): Number of keyset columns the page is sorted by.
+
+    Raises:
+        HTTPException: 400 when the cursor is malformed, e.g. holds a key of another
+            size, or was issued for another ordering.
+
+    Returns:
+        List[Any]: Values of the keyset columns to continue after.
+    """
+    try:
+        payload = json.loads(decode_cursor(cursor))
+        cursor_ordering, key = payload["o"], payload["k"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor value"
+        ) from e
+
+    if not isinstance(key, list) or len(key) != key_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor value"
+        )
+
+    if cursor_ordering != list(ordering):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor was issued for a different ordering",
+        )
+    return key
+
+
+def _encode_value(value: Any) -> Any:
+    """Make a keyset value JSON serializable."""
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
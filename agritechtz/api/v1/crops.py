@@ -1,56 +1,364 @@
 """API endpoints module for the crops"""
 
 import csv
+import os
+from email.utils import format_datetime
 from io import StringIO
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from typing import AsyncIterator, List, Sequence
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi_filter import FilterDepends
+from pydantic import TypeAdapter
+from sqlalchemy import Row
 
-from agritechtz.api.common.dependency import crop_prices_repository
-from agritechtz.api.v1.schema import CropPricesFilter
+from agritechtz.api.common.dependency import (
+    crop_prices_repository,
+    latest_prices_snapshot,
+    query_result_cache,
+)
+from agritechtz.api.common.conditional import (
+    entity_tag,
+    not_modified,
+    validator_headers,
+)
+from agritechtz.api.common.formats import (
+    COLUMNAR_CHUNK_SIZE,
+    MEDIA_TYPES,
+    OutputFormat,
+    columnar_chunks,
+    negotiate_format,
+)
+from agritechtz.api.common.pagination import (
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+)
+from agritechtz.api.v1.schema import (
+    CropPriceAggregate,
+    CropPricesFilter,
+    LatestCropPrice,
+)
+from agritechtz.exports import EXPORT_FORMATS, ExportFormat, read_manifest
+from agritechtz.latest_prices import LatestPricesSnapshot
 from agritechtz.logger import logger
-from agritechtz.repository import CropPricesRepository
+from agritechtz.repository import (
+    KEYSET_COLUMNS,
+    PRICE_BOUNDS,
+    AggregateLevel,
+    CropPricesRepository,
+)
+from agritechtz.result_cache import QueryResultCache
+from agritechtz.rollups import Period
 from agritechtz.security import limiter
+from agritechtz.settings import get_settings
 
 
 router = APIRouter()
 
+CSV_HEADER = ["ts", "region", "district", "crop", "min_price", "max_price"]
+
+# Page size used when a cursor is sent without a limit
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+
+AGGREGATES_ADAPTER = TypeAdapter(List[CropPriceAggregate])
+
+
+async def csv_chunks(chunks: AsyncIterator[Sequence[Row]]) -> AsyncIterator[str]:
+    """Render chunks of crop price rows as CSV text, starting with the header."""
+    output = StringIO()
+    writer = csv.writer(output)
+
+    # Write header, sent before the first rows are fetched
+    writer.writerow(CSV_HEADER)
+    yield output.getvalue()
+    output.seek(0)
+    output.truncate()
+
+    try:
+        async for prices in chunks:
+            # Write data rows
+            writer.writerows(
+                [
+                    price.ts,
+                    price.region,
+                    price.district,
+                    price.crop,
+                    price.min_price,
+                    price.max_price,
+                ]
+                for price in prices
+            )
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    except Exception as e:
+        # The status line is already sent, the client sees a truncated body
+        logger.exception("Exception while streaming crop prices: %s", e)
+        raise
+
+
+async def single_chunk(prices: Sequence[Row]) -> AsyncIterator[Sequence[Row]]:
+    """Expose an already fetched page as a stream with a single chunk."""
+    yield prices
+
 
 @router.get("/")
 @limiter.limit("5/minute")
 async def filter_prices_crops(
+    request: Request,
+    repository: CropPricesRepository = Depends(crop_prices_repository),
+    crop_prices_filter: CropPricesFilter = FilterDepends(CropPricesFilter),
+    result_cache: QueryResultCache = Depends(query_result_cache),
+    limit: int | None = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of rows per page"
+    ),
+    cursor: str | None = Query(
+        None, description="Opaque cursor returned in the X-Next-Cursor header"
+    ),
+    output_format: OutputFormat | None = Query(
+        None,
+        alias="format",
+        description="csv, parquet or arrow, overrides the Accept header",
+    ),
+):
+    """Filter crop prises. Allows only 5 requests/minute
+
+    Without `limit` and `cursor` the whole result is streamed. Otherwise one page is
+    returned and, when more rows follow, the `X-Next-Cursor` and `Link` headers point
+    to the next page.
+
+    Prices are sent as CSV, or as Parquet or an Arrow IPC stream when requested with
+    the `format` parameter or the `Accept` header.
+
+    Responses are cached in Redis until the next ingestion. They carry an `ETag` and
+    a `Last-Modified` header derived from the last ingestion, so polling clients get
+    `304 Not Modified` until new prices arrive.
+    """
+    output_format = negotiate_format(request.headers.get("accept"), output_format)
+    media_type = MEDIA_TYPES[output_format]
+    headers = {
+        "Content-Disposition": f"attachment; filename=crop_prices.{output_format}",
+        "Vary": "Accept",
+    }
+    params = {
+        "filter": crop_prices_filter.normalized(),
+        "limit": limit,
+        "cursor": cursor,
+        "format": output_format,
+    }
+
+    def render(chunks: AsyncIterator[Sequence[Row]]) -> AsyncIterator[str | bytes]:
+        if output_format == "csv":
+            return csv_chunks(chunks)
+        return columnar_chunks(chunks, output_format)
+
+    try:
+        ingested_at, latest_ts = await repository.watermark()
+        etag = entity_tag((ingested_at, latest_ts), params)
+        headers.update(
+            validator_headers(etag, ingested_at, get_settings().http_cache_max_age)
+        )
+        if not_modified(request.headers, etag, ingested_at):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={
+                    name: value
+                    for name, value in headers.items()
+                    if name != "Content-Disposition"
+                },
+            )
+
+        # Bodies cached before the last ingestion are not served under the new tag
+        cache_key = result_cache.key(
+            await result_cache.generation(), {**params, "etag": etag}
+        )
+        cached = await result_cache.get(cache_key)
+        if cached is not None:
+            body, cached_headers = cached
+            return Response(
+                content=body,
+                media_type=media_type,
+                headers={**cached_headers, **headers},
+            )
+
+        if limit is None and cursor is None:
+            # Rows are read from a server-side cursor while the response is sent
+            prices = repository.stream_prices(
+                crop_prices_filter,
+                chunk_size=1000 if output_format == "csv" else COLUMNAR_CHUNK_SIZE,
+            )
+            return StreamingResponse(
+                result_cache.tee(cache_key, render(prices), headers),
+                media_type=media_type,
+                headers=headers,
+            )
+
+        ordering = list(crop_prices_filter.ordering or [])
+        after = (
+            decode_keyset_cursor(cursor, ordering, len(KEYSET_COLUMNS))
+            if cursor
+            else None
+        )
+        try:
+            prices, next_key = await repository.page_prices(
+                crop_prices_filter, limit=limit or DEFAULT_PAGE_SIZE, after=after
+            )
+        except (ValueError, TypeError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+
+        if next_key is not None:
+            next_cursor = encode_keyset_cursor(ordering, next_key)
+            next_url = request.url.include_query_params(cursor=next_cursor)
+            headers["X-Next-Cursor"] = next_cursor
+            headers["Link"] = f'<{next_url}>; rel="next"'
+
+        return StreamingResponse(
+            result_cache.tee(cache_key, render(single_chunk(prices)), headers),
+            media_type=media_type,
+            headers=headers,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:  # pylint:disable=broad-exception-caught
+        logger.exception("Exception: %s", e)
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+def reject_price_bounds(crop_prices_filter: CropPricesFilter):
+    """Refuse the price bounds of a filter, e.g. on the aggregates.
+
+    Raises:
+        HTTPException: 422 when a `price__*` bound is set.
+    """
+    bounds = [
+        name for name in PRICE_BOUNDS if getattr(crop_prices_filter, name) is not None
+    ]
+    if bounds:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Aggregates cannot be filtered by price: {', '.join(bounds)}.",
+        )
+
+
+@router.get("/aggregates", response_model=List[CropPriceAggregate])
+@limiter.limit("60/minute")
+async def aggregate_prices_crops(
     request: Request,  # pylint:disable=unused-argument
     repository: CropPricesRepository = Depends(crop_prices_repository),
     crop_prices_filter: CropPricesFilter = FilterDepends(CropPricesFilter),
+    result_cache: QueryResultCache = Depends(query_result_cache),
+    period: Period = Query("month", description="Length of the aggregated periods"),
+    level: AggregateLevel = Query(
+        "region", description="Aggregate per district, per region or for the country"
+    ),
 ):
-    """Filter crop prises. Allows only 5 requests/minute"""
+    """Average crop prices per day, week or month. Allows 60 requests/minute
+
+    Aggregates are read from the rollups refreshed after every ingestion, so they are
+    cheap whatever the date range. Responses are cached in Redis until the next
+    ingestion. The rollups hold no single prices, so the `price__*` bounds are
+    refused.
+    """
+    reject_price_bounds(crop_prices_filter)
     try:
-        prices = await repository.filter_prices(crop_prices_filter)
-
-        # Convert to CSV
-        output = StringIO()
-        writer = csv.writer(output)
-
-        # Write header
-        writer.writerow(["ts", "region", "district", "crop", "min_price", "max_price"])
-
-        # Write data rows
-        for price in prices:
-            for crop in price.crop_prices:
-                writer.writerow(
-                    [
-                        price.ts,
-                        price.region,
-                        price.district,
-                        crop["name"],
-                        crop["min"],
-                        crop["max"],
-                    ]
-                )
-        # Prepare CSV response
-        output.seek(0)
-        response = Response(content=output.getvalue(), media_type="text/csv")
-        response.headers["Content-Disposition"] = "attachment; filename=crop_prices.csv"
-        return response
+        # Keyed on the rollups seen by the replica, a lagging one never caches stale
+        # aggregates under the generation of the new ingestion
+        ingested_at, refreshed_at = await repository.rollups_watermark()
+        cache_key = result_cache.key(
+            await result_cache.generation(),
+            {
+                "aggregates": crop_prices_filter.normalized(),
+                "period": period,
+                "level": level,
+                "watermark": [ingested_at, refreshed_at],
+            },
+        )
+        cached = await result_cache.get(cache_key)
+        if cached is not None:
+            body, _ = cached
+            return Response(content=body, media_type="application/json")
+
+        rows = await repository.aggregate_prices(crop_prices_filter, period, level)
+        body = AGGREGATES_ADAPTER.dump_json(
+            [CropPriceAggregate.model_validate(row) for row in rows]
+        )
+        await result_cache.set(cache_key, body, {})
+
+        return Response(content=body, media_type="application/json")
     except Exception as e:  # pylint:disable=broad-exception-caught
         logger.exception("Exception: %s", e)
         raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.get("/latest", response_model=List[LatestCropPrice])
+@limiter.limit("120/minute")
+async def latest_prices_crops(
+    request: Request,  # pylint:disable=unused-argument
+    snapshot: LatestPricesSnapshot = Depends(latest_prices_snapshot),
+):
+    """Latest prices of every crop in every district. Allows 120 requests/minute
+
+    Served from a snapshot held in memory by every worker and rebuilt once after each
+    ingestion, so requests do not touch the database.
+    """
+    if snapshot.body is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The latest prices are not loaded yet.",
+        )
+
+    headers = {"Last-Modified": format_datetime(snapshot.built_at, usegmt=True)}
+    return Response(
+        content=snapshot.body, media_type="application/json", headers=headers
+    )
+
+
+@router.get("/export")
+@limiter.limit("60/minute")
+async def export_prices_crops(
+    request: Request,
+    export_format: ExportFormat = Query(
+        "csv.gz", alias="format", description="csv.gz or parquet"
+    ),
+):
+    """Full history of the crop prices. Allows 60 requests/minute
+
+    The snapshots are written by the scheduler after every ingestion and sent by
+    nginx, no API worker reads the database or streams the file. The `ETag` is the
+    SHA-256 of the file.
+    """
+    settings = get_settings()
+    manifest = read_manifest(settings.export_dir) if settings.export_dir else None
+    if manifest is None or export_format not in manifest["files"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No {export_format} snapshot is available yet.",
+        )
+
+    entry = manifest["files"][export_format]
+    filename, media_type = EXPORT_FORMATS[export_format]
+    etag = f'"{entry["sha256"]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.http_cache_max_age}",
+        "Content-Disposition": (
+            f"attachment; filename={manifest['version']}-{filename}"
+        ),
+        "X-Snapshot-Version": manifest["version"],
+    }
+    if not_modified(request.headers, etag, None):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if not settings.export_accel_prefix:
+        return FileResponse(
+            os.path.join(settings.export_dir, entry["path"]),
+            media_type=media_type,
+            headers=headers,
+        )
+
+    # nginx replaces the empty body with the file from its internal location
+    headers["X-Accel-Redirect"] = settings.export_accel_prefix + entry["path"]
+    return Response(media_type=media_type, headers=headers)
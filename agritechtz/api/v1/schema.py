@@ -2,9 +2,10 @@
 
 from datetime import date
 from decimal import Decimal
-from typing import List
+from typing import Any, Dict, List
 from agritechtz.models import CropPrice
 from fastapi_filter.contrib.sqlalchemy import Filter
+from pydantic import BaseModel, ConfigDict
 
 
 class CropPricesFilter(Filter):
@@ -16,7 +17,9 @@ class CropPricesFilter(Filter):
     ts__gte: date | None = None
     ts__lte: date | None = None
     price__min__gte: Decimal | None = None
+    price__min__lte: Decimal | None = None
     price__max__gte: Decimal | None = None
+    price__max__lte: Decimal | None = None
 
     ordering: List[str] = ["+ts"]
 
@@ -26,3 +29,46 @@ class CropPricesFilter(Filter):
         ordering_field_name = "ordering"
         search_field_name = "crop"  # Define the field name for searches
         model = CropPrice  # This references the model to filter against
+
+    def normalized(self) -> Dict[str, Any]:
+        """Return the filter values in a canonical form, e.g. to build cache keys.
+
+        Value lists are de-duplicated and sorted and crop names are lower cased, so
+        equivalent filters normalize to the same mapping. The ordering is kept as is.
+        """
+        values = self.model_dump()
+        for name, value in values.items():
+            if isinstance(value, list) and name != self.Constants.ordering_field_name:
+                if name == "crop_prices__in":
+                    value = [crop.lower() for crop in value]
+                values[name] = sorted(set(value))
+        return values
+
+
+class CropPriceAggregate(BaseModel):
+    """Average prices of a crop over one period, in a district, a region or the country."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    bucket: date
+    region: str | None = None
+    district: str | None = None
+    crop: str
+    avg_min_price: float | None = None
+    avg_max_price: float | None = None
+    lowest_min_price: float | None = None
+    highest_max_price: float | None = None
+    samples: int
+
+
+class LatestCropPrice(BaseModel):
+    """Latest reported prices of a crop in a district."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    region: str
+    district: str
+    crop: str
+    ts: date
+    min_price: float | None = None
+    max_price: float | None = None
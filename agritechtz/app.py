@@ -1,32 +1,112 @@
 """Entrypoint for the application"""
 
-from fastapi import FastAPI, Request, Response
+import asyncio
+import random
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
+from agritechtz.api.common.compression import CompressionMiddleware
 from agritechtz.api.v1.crops import router
-from agritechtz.database import acquire_session
-from agritechtz.logger import logger
+from agritechtz.cache_config import (
+    close_redis_client,
+    get_latest_prices,
+    get_redis_client,
+)
+from agritechtz.database import acquire_session, dispose_engine, warm_up_pool
+from agritechtz.logger import (
+    configure_logging,
+    logger,
+    request_sampled,
+    stop_logging,
+)
 from agritechtz.security import limiter
+from agritechtz.settings import get_settings
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Create the worker resources before serving requests and release them after."""
+    settings = get_settings()
+    configure_logging(settings.log_level, settings.log_json, settings.log_queue)
+
+    # Connect before the worker accepts traffic instead of on the first requests
+    await warm_up_pool(settings.db_pool_warmup, read_only=True)
+    try:
+        await get_redis_client().ping()
+    except Exception as e:  # pylint:disable=broad-exception-caught
+        # The cache and the limiter degrade gracefully, do not refuse to start
+        logger.warning("Redis is not reachable: %s", e)
 
-app = FastAPI()
+    # The latest prices are served from memory. The listener builds them once
+    # subscribed and rebuilds them whenever ingestion announces new prices
+    listener = asyncio.create_task(get_latest_prices().listen())
+    logger.info("Worker ready")
 
+    try:
+        yield
+    finally:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+        await close_redis_client()
+        await dispose_engine()
+        stop_logging()
 
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+async def close_after_body(
+    body_iterator: AsyncIterator[bytes], stack: AsyncExitStack
+) -> AsyncIterator[bytes]:
+    """Pass the response body through, then release the resources held by `stack`."""
+    async with stack:
+        async for chunk in body_iterator:
+            yield chunk
+        logger.info("Finished processing")
 
 
-@app.middleware("http")
 async def database_middleware(request: Request, call_next):
     """Initialize middleware"""
-    response = Response(status_code=500)
-    async with acquire_session() as session:
-        try:
-            request.state.session = session
-            response = await call_next(request)
-        finally:
-            logger.info("Finished processing")
+    # Only a sample of the requests is logged below WARNING
+    request_sampled.set(random.random() < get_settings().log_request_sample_rate)
+
+    async with AsyncExitStack() as stack:
+        # The endpoints only read, they are served by the replica when there is one
+        request.state.session = await stack.enter_async_context(
+            acquire_session(read_only=True)
+        )
+        response = await call_next(request)
+
+        # Streamed responses read from the session while the body is sent, so the
+        # session is closed once the body is exhausted instead of right away
+        response.body_iterator = close_after_body(
+            response.body_iterator, stack.pop_all()
+        )
         return response
 
 
-app.include_router(router, prefix="/api/v1/crop-prices")
+def create_app() -> FastAPI:
+    """Build the application.
+
+    Building the application does not connect to any service, the database pool and
+    the Redis client are created by the lifespan of each worker.
+    """
+    app = FastAPI(lifespan=lifespan)
+
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    app.middleware("http")(database_middleware)
+    # Outermost, so every response is compressed once fully rendered
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=get_settings().compression_min_size
+    )
+
+    app.include_router(router, prefix="/api/v1/crop-prices")
+
+    return app
+
+
+app = create_app()
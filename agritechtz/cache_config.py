@@ -2,13 +2,60 @@
 
 # pylint: disable=import-error
 
+from functools import lru_cache
+
 from redis.asyncio import Redis
 
+from agritechtz.latest_prices import LatestPricesSnapshot
+from agritechtz.pdf_cache import PDFCache
+from agritechtz.result_cache import QueryResultCache
 from agritechtz.settings import get_settings
 
 
-_settings = get_settings()
+# Clients are created on first use, so each process connects from its own event loop
+@lru_cache
+def get_redis_client() -> Redis:
+    """Retrieve the Redis client of the current process"""
+    return Redis.from_url(get_settings().redis_backend_url)
+
+
+@lru_cache
+def get_result_cache() -> QueryResultCache:
+    """Retrieve the cache of rendered query results"""
+    settings = get_settings()
+
+    return QueryResultCache(
+        get_redis_client(),
+        ttl=settings.result_cache_ttl,
+        max_entries=settings.result_cache_max_entries,
+        max_bytes=settings.result_cache_max_bytes,
+    )
+
+
+@lru_cache
+def get_latest_prices() -> LatestPricesSnapshot:
+    """Retrieve the latest prices snapshot of the current process"""
+    return LatestPricesSnapshot(get_redis_client())
+
+
+@lru_cache
+def get_pdf_cache() -> PDFCache | None:
+    """Retrieve the local cache of raw PDFs, None when it is disabled"""
+    settings = get_settings()
+    if not settings.pdf_cache_dir:
+        return None
+
+    return PDFCache(
+        settings.pdf_cache_dir,
+        max_bytes=settings.pdf_cache_max_bytes,
+        revalidate=settings.pdf_cache_revalidate,
+    )
 
-redis_url = _settings.redis_backend_url
 
-redis_client = Redis.from_url(redis_url)
+async def close_redis_client():
+    """Close the Redis connections of the current process."""
+    if get_redis_client.cache_info().currsize:
+        await get_redis_client().aclose()
+    get_result_cache.cache_clear()
+    get_latest_prices.cache_clear()
+    get_redis_client.cache_clear()
@@ -24,6 +24,18 @@ CROPS_COLUMNS = [
     "Irish Potato Max",
 ]
 
+# Crops reported in the bulletins, in the snake case used for storage
+CROPS = [
+    "maize",
+    "rice",
+    "beans",
+    "sorghum_millet",
+    "bulrush_millet",
+    "finger_millet",
+    "wheat",
+    "irish_potato",
+]
+
 # Base URL where the crops are available
 BASE_URL = "https://www.viwanda.go.tz/documents/product-prices-domestic"
 
@@ -69,10 +81,49 @@ TZ_REGIONS = [
     "Unguja Kusini",
 ]
 
+# Spellings of regions found in the bulletins, mapped to their name in TZ_REGIONS
+REGION_ALIASES = {
+    "Dar es salaam": "Dar-es-Salaam",
+    "Dar es saalam": "Dar-es-Salaam",
+    "Singida": "Singinda",
+}
+
+# Region names as they are spelled in the bulletins, in matching order
+REGION_KEYWORDS = [
+    "Dar es salaam",
+    "Dar es saalam",
+    "Kilimanjaro",
+    "Singida",
+    "Arusha",
+    "Dodoma",
+    "Morogoro",
+    "Mtwara",
+    "Lindi",
+    "Iringa",
+    "Mara",
+    "Tanga",
+    "Songwe",
+    "Tabora",
+    "Geita",
+    "Kagera",
+    "Katavi",
+    "Manyara",
+    "Mbeya",
+    "Shinyanga",
+    "Ruvuma",
+    "Mwanza",
+    "Pwani",
+    "Simiyu",
+    "Kigoma",
+    "Rukwa",
+    "Njombe",
+]
+
+# A price cell of the bulletins, either missing (NA) or a number with thousands separators
+PRICE_CELL = r"NA|\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?"
+
 REGIONAL_PATTERN = re.compile(
-    r"(Dar es salaam|Dar es saalam|Kilimanjaro|Singida|Arusha|Dodoma|Morogoro|Mtwara|Lindi|Iringa"
-    r"|Mara|Tanga|Songwe|Tabora|Geita|Kagera|Katavi|Manyara|Mbeya|Shinyanga|Ruvuma|Mwanza|Pwani"
-    r"|Simiyu|Kigoma|Rukwa|Njombe)"
+    "(" + "|".join(REGION_KEYWORDS) + ")"
     r"\s+([\w\s\/]+?)"
     r"(?:\s+(NA|\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?))"
     r"(?:\s+(NA|\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?))"
@@ -93,6 +144,25 @@ REGIONAL_PATTERN = re.compile(
     re.IGNORECASE | re.MULTILINE | re.DOTALL,
 )
 
+# Month spellings of the bulletin file names and their English names
+MONTH_REPLACEMENTS = {
+    r"\bAgosti\b": "August",
+    r"\bMachi\b": "March",
+    r"\bJan\b": "January",
+    r"\bFeb\b": "February",
+    r"\bMar\b": "March",
+    r"\bApr\b": "April",
+    r"\bJun\b": "June",
+    r"\bJul\b": "July",
+    r"\bAug\b": "August",
+    r"\bSept\b": "September",
+    r"\bOct\b": "October",
+    r"\bNov\b": "November",
+    r"\bDec\b": "December",
+    r"\bCtober\b": "October",
+    r"\bSeptemba\b": "September",
+}
+
 DATE_PATTERN = re.compile(
     r"(\d{1,2})(?:\s*)(?:_|.)?(?:st|nd|rd|th)?(?:_|.)?(?:\s)*?(?:of\s*)?"
     r"(january|february|march|april|may|june|july|august|september|october|november|december|"
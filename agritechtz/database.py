@@ -1,38 +1,73 @@
 """Database connectivity module"""
 
+import asyncio
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Any, AsyncGenerator
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from agritechtz.models import Base
-from agritechtz.settings import Settings
+from agritechtz.settings import get_settings
 
 
-# Load environment variables from a .env file, if available
-settings = Settings()
+# Engines are created on first use instead of at import time, so every process
+# (e.g. each gunicorn worker forked from a preloaded master) gets its own pools. They
+# are cached by URL, so reads share the primary engine when there is no replica
+@lru_cache
+def get_engine_for_url(url: str) -> AsyncEngine:
+    """Retrieve the async engine of the current process connecting to `url`"""
+    settings = get_settings()
 
+    server_settings = {}
+    if settings.db_statement_timeout_ms:
+        server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
 
-# Initialize the async engine
-engine = create_async_engine(settings.database_url, echo=True)
+    return create_async_engine(
+        url,
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "server_settings": server_settings,
+        },
+    )
+
+
+def database_url(read_only: bool = False) -> str:
+    """Return the URL of the replica for reads when one is set, else of the primary"""
+    settings = get_settings()
+    if read_only and settings.database_replica_url:
+        return settings.database_replica_url
+    return settings.database_url
+
+
+def get_engine(read_only: bool = False) -> AsyncEngine:
+    """Retrieve the async engine of the current process, on the replica for reads"""
+    return get_engine_for_url(database_url(read_only))
 
 
 # Async session factory
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
-    expire_on_commit=False,
-    class_=AsyncSession,
-    autoflush=False,
-    autocommit=False,
-)
+@lru_cache
+def get_sessionmaker(read_only: bool = False) -> sessionmaker:
+    """Retrieve the async session factory bound to the engine"""
+    return sessionmaker(
+        bind=get_engine(read_only),
+        expire_on_commit=False,
+        class_=AsyncSession,
+        autoflush=False,
+        autocommit=False,
+    )
 
 
 # Dependency to get an async database session
 @asynccontextmanager
-async def acquire_session() -> AsyncGenerator[AsyncSession, Any]:
-    """Acquire database session"""
-    async with AsyncSessionLocal() as session:
+async def acquire_session(read_only: bool = False) -> AsyncGenerator[AsyncSession, Any]:
+    """Acquire database session, on the replica when `read_only` is set"""
+    async with get_sessionmaker(read_only)() as session:
         try:
             yield session
         except Exception as e:
@@ -42,10 +77,30 @@ async def acquire_session() -> AsyncGenerator[AsyncSession, Any]:
             await session.close()
 
 
+async def warm_up_pool(connections: int, read_only: bool = False):
+    """Open `connections` pooled connections up front and return them to the pool."""
+    engine = get_engine(read_only)
+    opened = [engine.connect() for _ in range(connections)]
+    try:
+        await asyncio.gather(*(connection.start() for connection in opened))
+    finally:
+        await asyncio.gather(*(connection.close() for connection in opened))
+
+
+async def dispose_engine():
+    """Close every pooled connection and forget the engines of the current process."""
+    if get_engine_for_url.cache_info().currsize:
+        # Both URLs are the primary one when there is no replica
+        urls = {database_url(), database_url(read_only=True)}
+        await asyncio.gather(*(get_engine_for_url(url).dispose() for url in urls))
+    get_sessionmaker.cache_clear()
+    get_engine_for_url.cache_clear()
+
+
 # Initialize database function (optional, can be used for setup/migration)
 async def init_db():
     """Initialize database tables."""
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         # This will create tables according to all Base subclasses (if they do not already exist)
         # await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,197 @@
+"""Full-dataset snapshots of the crop prices, served as static files"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from importlib.util import find_spec
+from typing import Any, AsyncIterator, Dict, Literal, Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agritechtz.api.common.formats import COLUMNAR_CHUNK_SIZE, COLUMNS, columnar_chunks
+from agritechtz.api.v1.schema import CropPricesFilter
+from agritechtz.logger import logger
+from agritechtz.repository import CropPricesRepository
+
+MANIFEST = "manifest.json"
+
+ExportFormat = Literal["csv.gz", "parquet"]
+
+# Snapshot formats, the file name of each and the media type it is served with
+EXPORT_FORMATS: Dict[ExportFormat, tuple] = {
+    "csv.gz": ("crop_prices.csv.gz", "application/gzip"),
+    "parquet": ("crop_prices.parquet", "application/vnd.apache.parquet"),
+}
+
+
+def read_manifest(directory: str) -> Dict[str, Any] | None:
+    """Return the manifest of the current snapshot, None when none was written."""
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def write_atomically(path: str, data: bytes):
+    """Write `data` to `path`, readers see either the old or the new content."""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(data)
+    os.replace(temporary_path, path)
+
+
+class DigestFile:
+    """Binary file hashing and counting the bytes written to it."""
+
+    def __init__(self, path: str):
+        """Open `path` for writing."""
+        self.path = path
+        self.file = open(path, "wb")  # pylint: disable=consider-using-with
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        """Write and hash `data`."""
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    def flush(self):
+        """Flush the written bytes to the operating system."""
+        self.file.flush()
+
+    def close(self) -> Dict[str, Any]:
+        """Close the file and describe it for the manifest."""
+        self.file.close()
+        return {
+            "path": os.path.basename(self.path),
+            "bytes": self.size,
+            "sha256": self.sha256.hexdigest(),
+        }
+
+
+async def write_snapshot(
+    session: AsyncSession, directory: str, keep: int = 3
+) -> Dict[str, Any] | None:
+    """Write a snapshot of every crop price and point the manifest to it.
+
+    The rows are read once from a server-side cursor and written to a gzipped CSV
+    file and, when pyarrow is installed, to a Parquet file. Every snapshot goes to
+    its own version directory and the manifest is replaced last, so files being
+    downloaded are never rewritten. Nothing is written when the ingest watermark did
+    not move since the current snapshot.
+
+    Args:
+        session (AsyncSession): Database session used to read the prices.
+        directory (str): Directory holding the manifest and the version directories.
+        keep (int): Number of snapshot versions kept on disk.
+
+    Returns:
+        Dict[str, Any] | None: Manifest of the new snapshot, None when it was current.
+    """
+    repository = CropPricesRepository(session)
+    ingested_at, latest_ts = await repository.watermark()
+    watermark = {
+        "ingested_at": ingested_at.isoformat() if ingested_at else None,
+        "latest_ts": latest_ts.isoformat() if latest_ts else None,
+    }
+
+    current = read_manifest(directory)
+    if current is not None and current["watermark"] == watermark:
+        logger.info("Export snapshot %s is current", current["version"])
+        return None
+
+    created_at = datetime.now(timezone.utc)
+    version = created_at.strftime("%Y%m%dT%H%M%SZ")
+    version_directory = os.path.join(directory, version)
+    os.makedirs(version_directory, exist_ok=True)
+
+    csv_file = DigestFile(os.path.join(version_directory, EXPORT_FORMATS["csv.gz"][0]))
+    files = {}
+    rows = 0
+    try:
+        with gzip.GzipFile(fileobj=csv_file, mode="wb", mtime=0) as compressed:
+            text = io.TextIOWrapper(compressed, encoding="utf-8", newline="")
+            writer = csv.writer(text)
+            writer.writerow(COLUMNS)
+
+            async def csv_written(
+                chunks: AsyncIterator[Sequence[Row]],
+            ) -> AsyncIterator[Sequence[Row]]:
+                nonlocal rows
+                async for chunk in chunks:
+                    writer.writerows(
+                        [getattr(price, column) for column in COLUMNS]
+                        for price in chunk
+                    )
+                    rows += len(chunk)
+                    yield chunk
+
+            chunks = csv_written(
+                repository.stream_prices(
+                    CropPricesFilter(), chunk_size=COLUMNAR_CHUNK_SIZE
+                )
+            )
+            if find_spec("pyarrow") is not None:
+                parquet_file = DigestFile(
+                    os.path.join(version_directory, EXPORT_FORMATS["parquet"][0])
+                )
+                try:
+                    async for data in columnar_chunks(chunks, "parquet"):
+                        parquet_file.write(data)
+                finally:
+                    files["parquet"] = parquet_file.close()
+            else:
+                logger.warning("pyarrow is not installed, skipping the Parquet export")
+                async for _ in chunks:
+                    pass
+
+            text.flush()
+            text.detach()
+    except BaseException:
+        # A partial snapshot is never published
+        shutil.rmtree(version_directory, ignore_errors=True)
+        raise
+    finally:
+        files["csv.gz"] = csv_file.close()
+
+    manifest = {
+        "version": version,
+        "created_at": created_at.isoformat(),
+        "watermark": watermark,
+        "rows": rows,
+        "files": {
+            name: {**entry, "path": f"{version}/{entry['path']}"}
+            for name, entry in files.items()
+        },
+    }
+    write_atomically(
+        os.path.join(directory, MANIFEST), json.dumps(manifest, indent=2).encode()
+    )
+    logger.info("Wrote export snapshot %s with %d rows", version, rows)
+
+    prune_snapshots(directory, keep)
+    return manifest
+
+
+def prune_snapshots(directory: str, keep: int):
+    """Remove all but the `keep` newest version directories.
+
+    Clients still downloading a removed file are not interrupted, the file is only
+    unlinked.
+    """
+    versions = sorted(
+        entry.name
+        for entry in os.scandir(directory)
+        if entry.is_dir() and entry.name[:1].isdigit()
+    )
+    for version in versions[: -max(keep, 1)]:
+        shutil.rmtree(os.path.join(directory, version), ignore_errors=True)
+        logger.info("Removed export snapshot %s", version)
@@ -0,0 +1,125 @@
+"""In-process snapshot of the latest price of every region, district and crop"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import List
+
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from agritechtz.api.v1.schema import LatestCropPrice
+from agritechtz.database import acquire_session
+from agritechtz.logger import logger
+from agritechtz.models import CropPrice
+
+try:
+    from sqlalchemy.dialects.postgresql import distinct_on
+except ImportError:  # SQLAlchemy < 2.1
+    distinct_on = None
+
+# Channel on which ingestion announces that new prices were committed
+INGEST_CHANNEL = "agritechtz:prices:ingested"
+
+LATEST_PRICES_ADAPTER = TypeAdapter(List[LatestCropPrice])
+
+
+def latest_prices_query():
+    """Build the select of the latest row of every region, district and crop.
+
+    `DISTINCT ON` walks the `ix_cn_crop_prices_latest` index, reading the newest row
+    of each group first.
+    """
+    query = select(
+        CropPrice.region,
+        CropPrice.district,
+        CropPrice.crop,
+        CropPrice.ts,
+        CropPrice.min_price,
+        CropPrice.max_price,
+    ).order_by(
+        CropPrice.region, CropPrice.district, CropPrice.crop, CropPrice.ts.desc()
+    )
+    groups = (CropPrice.region, CropPrice.district, CropPrice.crop)
+    # Passing columns to `distinct()` is deprecated from SQLAlchemy 2.1 on
+    if distinct_on is not None:
+        return query.ext(distinct_on(*groups))
+    return query.distinct(*groups)
+
+
+class LatestPricesSnapshot:
+    """Serve the latest crop prices from memory, rebuilt once per ingestion.
+
+    The snapshot is rendered to JSON once, so requests cost neither a query nor a
+    serialization. Each process keeps its own copy and rebuilds it when ingestion
+    publishes on `channel`.
+    """
+
+    def __init__(
+        self, redis: Redis, channel: str = INGEST_CHANNEL, retry_delay: float = 5.0
+    ):
+        """Initialize an empty snapshot.
+
+        Args:
+            redis (Redis): Client of the Redis server relaying the notifications.
+            channel (str): Channel announcing committed ingestions.
+            retry_delay (float): Seconds to wait before subscribing again after a
+                Redis error.
+        """
+        self.redis = redis
+        self.channel = channel
+        self.retry_delay = retry_delay
+        self.body: bytes | None = None
+        self.built_at: datetime | None = None
+        self._lock = asyncio.Lock()
+
+    async def rebuild(self):
+        """Query the latest prices and replace the rendered snapshot."""
+        async with self._lock:
+            # Read from the primary, a lagging replica could miss the announced prices
+            async with acquire_session() as session:
+                rows = (await session.execute(latest_prices_query())).all()
+
+            self.body = LATEST_PRICES_ADAPTER.dump_json(
+                [LatestCropPrice.model_validate(row) for row in rows]
+            )
+            self.built_at = datetime.now(timezone.utc)
+            logger.info("Rebuilt the latest prices snapshot with %d rows", len(rows))
+
+    async def listen(self):
+        """Rebuild the snapshot whenever an ingestion is announced, until cancelled.
+
+        Notifications sent while disconnected are lost, so the snapshot is rebuilt
+        after every subscription, the first one included. A snapshot that could not
+        be built, e.g. at startup, is retried until it is.
+        """
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    await self.rebuild()
+
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            await self.rebuild()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # pylint:disable=broad-exception-caught
+                logger.warning("Latest prices listener failed, retrying: %s", e)
+
+            await asyncio.sleep(self.retry_delay)
+            if self.body is None:
+                # Built without Redis meanwhile, it may stay unreachable for a while
+                try:
+                    await self.rebuild()
+                except Exception as e:  # pylint:disable=broad-exception-caught
+                    logger.warning("Could not build the latest prices snapshot: %s", e)
+
+
+async def publish_ingest(redis: Redis, channel: str = INGEST_CHANNEL):
+    """Announce that new prices were committed, e.g. to rebuild the snapshots."""
+    try:
+        await redis.publish(channel, datetime.now(timezone.utc).isoformat())
+    except RedisError as e:
+        logger.warning("Could not announce the ingestion: %s", e)
@@ -1,17 +1,130 @@
 """Configure application logging"""
 
+import json
 import logging
+import os
+import queue
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import List
 
-# Create a logger
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Whether the records of the current request are kept, see `RequestSampleFilter`
+request_sampled: ContextVar[bool] = ContextVar("request_sampled", default=True)
+
+# Create a logger, modules log before the entry points configure it, e.g. in the
+# processes parsing the PDFs, so the level is read from the environment right away
 logger = logging.getLogger("AGRITECH-TZ")
-logger.setLevel(logging.DEBUG)  # Set log level to DEBUG to capture all levels
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
 
 # Create a console handler
 console_handler = logging.StreamHandler()
 
 # Create a formatter and set it for the handler
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+formatter = logging.Formatter(TEXT_FORMAT)
 console_handler.setFormatter(formatter)
 
 # Add the handler to the logger
 logger.addHandler(console_handler)
+
+# Listeners writing the queued records, stopped by `stop_logging`
+_listeners: List[QueueListener] = []
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "process": record.process,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RequestSampleFilter(logging.Filter):
+    """Drop the records below WARNING of the requests left out of the sample.
+
+    The decision is taken once per request, so a sampled request is logged in full.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or request_sampled.get()
+
+
+def configure_logging(
+    level: str = "INFO", json_output: bool = False, queued: bool = True
+):
+    """Configure the application logger of the current process.
+
+    In queued mode the callers only put the records on a queue, a background thread
+    formats and writes them, so a slow stream never blocks the event loop. Call it
+    once the process is started, e.g. in each forked worker.
+
+    Args:
+        level (str): Minimum level of the records, e.g. `INFO`.
+        json_output (bool): Write JSON lines instead of text.
+        queued (bool): Write the records from a background thread.
+    """
+    stop_logging()
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        JsonFormatter() if json_output else logging.Formatter(TEXT_FORMAT)
+    )
+
+    logger.setLevel(level.upper())
+    for previous in list(logger.handlers):
+        logger.removeHandler(previous)
+
+    if queued:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = QueueHandler(records)
+        queue_handler.addFilter(RequestSampleFilter())
+        logger.addHandler(queue_handler)
+
+        listener = QueueListener(records, handler, respect_handler_level=True)
+        listener.start()
+        _listeners.append(listener)
+    else:
+        handler.addFilter(RequestSampleFilter())
+        logger.addHandler(handler)
+
+
+def write_directly(listener: QueueListener):
+    """Replace the queue of `listener` by its handlers on the logger."""
+    for previous in list(logger.handlers):
+        if isinstance(previous, QueueHandler):
+            logger.removeHandler(previous)
+    for handler in listener.handlers:
+        handler.addFilter(RequestSampleFilter())
+        logger.addHandler(handler)
+
+
+def stop_logging():
+    """Write the queued records and stop the background thread.
+
+    Later records are written directly by the handlers of the listener, so nothing
+    logged during the shutdown is lost.
+    """
+    while _listeners:
+        listener = _listeners.pop()
+        listener.stop()
+        write_directly(listener)
+
+
+def _after_fork_in_child():
+    """Write directly in forked children, e.g. parser processes, the thread is gone."""
+    while _listeners:
+        write_directly(_listeners.pop())
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
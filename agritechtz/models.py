@@ -1,33 +1,121 @@
 """Relational database/Object mapping module"""
 
 from decimal import Decimal
-from datetime import date
-from typing import Dict, List
+from datetime import date, datetime
 
+from sqlalchemy import DateTime, Index, Numeric, String, func, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.types import JSON
 
 Base = declarative_base()
 
 
 class CropPrice(Base):
-    """Mapper class for the crop prices stored in the database."""
+    """Mapper class for the crop prices stored in the database.
+
+    Each row holds the price range of one crop in one district on one day.
+    """
 
     __tablename__ = "cn_crop_prices"
 
-    source_url: Mapped[str] = mapped_column(primary_key=True)
     ts: Mapped[date] = mapped_column(primary_key=True)
     region: Mapped[str] = mapped_column(primary_key=True)
     district: Mapped[str] = mapped_column(primary_key=True)
+    crop: Mapped[str] = mapped_column(primary_key=True)
+
+    source_url: Mapped[str] = mapped_column(nullable=False, index=True)
+    min_price: Mapped[Decimal | None] = mapped_column(Numeric(12, 2))
+    max_price: Mapped[Decimal | None] = mapped_column(Numeric(12, 2))
+
+    __table_args__ = (
+        Index("ix_cn_crop_prices_crop_ts", "crop", "ts"),
+        Index("ix_cn_crop_prices_region_district_ts", "region", "district", "ts"),
+        # Price thresholds of a crop, e.g. maize above 1,000 TZS
+        Index("ix_cn_crop_prices_crop_min_price", "crop", "min_price"),
+        Index("ix_cn_crop_prices_crop_max_price", "crop", "max_price"),
+        # Newest row of every district and crop first, covering the latest prices
+        Index(
+            "ix_cn_crop_prices_latest",
+            "region",
+            "district",
+            "crop",
+            text("ts DESC"),
+            postgresql_include=["min_price", "max_price"],
+        ),
+        # Rows are appended roughly in date order, a BRIN index stays tiny
+        Index("ix_cn_crop_prices_ts_brin", "ts", postgresql_using="brin"),
+        # Monthly partitions, created on ingestion by `agritechtz.partitions`
+        {"postgresql_partition_by": "RANGE (ts)"},
+    )
 
-    crop_prices: Mapped[List[Dict[str, str | Decimal | None]]] = mapped_column(
-        JSON, nullable=False
+    def __repr__(self):
+        return (
+            f"<CropPrice(ts={self.ts}, region={self.region}, "
+            f"district={self.district}, crop={self.crop}, "
+            f"min_price={self.min_price}, max_price={self.max_price}, "
+            f"source_url={self.source_url})>"
+        )
+
+
+class CropPriceRollup(Base):
+    """Mapper class for the crop prices pre-aggregated per period.
+
+    Each row sums the prices of one crop in one district over a day, an ISO week or a
+    month. Sums and counts are kept instead of averages, so averages over regions or
+    the whole country are computed from a handful of rows.
+    """
+
+    __tablename__ = "cn_crop_price_rollups"
+
+    period: Mapped[str] = mapped_column(primary_key=True)
+    bucket: Mapped[date] = mapped_column(primary_key=True)
+    region: Mapped[str] = mapped_column(primary_key=True)
+    district: Mapped[str] = mapped_column(primary_key=True)
+    crop: Mapped[str] = mapped_column(primary_key=True)
+
+    min_price_sum: Mapped[Decimal | None] = mapped_column(Numeric(18, 2))
+    min_price_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    max_price_sum: Mapped[Decimal | None] = mapped_column(Numeric(18, 2))
+    max_price_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    lowest_min_price: Mapped[Decimal | None] = mapped_column(Numeric(12, 2))
+    highest_max_price: Mapped[Decimal | None] = mapped_column(Numeric(12, 2))
+    # Moves on every refresh, so caches of the aggregates follow the rollups
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_cn_crop_price_rollups_period_crop_bucket", "period", "crop", "bucket"
+        ),
+    )
+
+    def __repr__(self):
+        return (
+            f"<CropPriceRollup(period={self.period}, bucket={self.bucket}, "
+            f"region={self.region}, district={self.district}, crop={self.crop})>"
+        )
+
+
+class Document(Base):
+    """Mapper class for the bulletins ingested into `cn_crop_prices`.
+
+    Each row records the parser version a bulletin was last parsed with, so the
+    bulletins parsed by an older version can be re-parsed from the cached PDFs.
+    """
+
+    __tablename__ = "cn_documents"
+
+    source_url: Mapped[str] = mapped_column(primary_key=True)
+    sha256: Mapped[str | None] = mapped_column(String(64))
+    parser_version: Mapped[str | None] = mapped_column(index=True)
+    row_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    ingested_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
     )
 
     def __repr__(self):
         return (
-            f"<CropPrice(id={self.source_url}, "
-            f"ts={self.ts}, region={self.region}, "
-            f"district={self.district}), crop_prices={self.crop_prices}>"
+            f"<Document(source_url={self.source_url}, sha256={self.sha256}, "
+            f"parser_version={self.parser_version}, row_count={self.row_count})>"
         )
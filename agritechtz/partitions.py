@@ -0,0 +1,68 @@
+"""Monthly range partitions of the crop prices table"""
+
+from datetime import date
+from typing import Iterable, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agritechtz.logger import logger
+from agritechtz.models import CropPrice
+from agritechtz.rollups import bucket_end, bucket_start
+
+
+def partition_name(month: date) -> str:
+    """Return the name of the partition holding the prices of `month`."""
+    return f"{CropPrice.__tablename__}_y{month:%Y}m{month:%m}"
+
+
+def partition_ddl(month: date) -> str:
+    """Return the statement creating the partition of the month starting on `month`."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {CropPrice.__tablename__} "
+        f"FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{bucket_end('month', month).isoformat()}')"
+    )
+
+
+async def ensure_partitions(session: AsyncSession, days: Iterable[date]) -> List[str]:
+    """Create the missing partitions of the months holding `days`.
+
+    Rows outside every partition are rejected, so ingestion creates the partitions of
+    the months it is about to insert. Existing partitions are looked up first, which
+    spares the lock a `CREATE TABLE` takes on the parent table. Nothing is committed.
+
+    Args:
+        session (AsyncSession): Database session used for the inserts.
+        days (Iterable[date]): Dates of the rows about to be inserted.
+
+    Returns:
+        List[str]: Names of the created partitions.
+    """
+    months = sorted({bucket_start("month", day) for day in days})
+    if not months:
+        return []
+
+    existing = set(
+        (
+            await session.scalars(
+                text(
+                    "SELECT c.relname FROM pg_inherits AS i "
+                    "JOIN pg_class AS c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = CAST(:parent AS regclass)"
+                ),
+                {"parent": CropPrice.__tablename__},
+            )
+        ).all()
+    )
+
+    created = []
+    for month in months:
+        name = partition_name(month)
+        if name in existing:
+            continue
+        await session.execute(text(partition_ddl(month)))
+        logger.info("Created partition %s", name)
+        created.append(name)
+    return created
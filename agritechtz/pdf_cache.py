@@ -0,0 +1,221 @@
+"""Content-addressed on-disk cache of the raw bulletin PDFs"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Set, Tuple
+
+from agritechtz.logger import logger
+
+
+class PDFCache:
+    """Keep downloaded PDFs on disk, keyed by their URL and the SHA-256 of their content.
+
+    Contents are stored once under `objects/` whatever the number of URLs serving them,
+    and `urls/` maps every URL to its content digest and the `ETag` / `Last-Modified`
+    validators of the response, used for conditional requests on revalidation. Once the
+    contents exceed `max_bytes`, the least recently used ones are evicted, except the
+    ones in use by this process.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 2 * 1024 * 1024 * 1024,
+        revalidate: bool = False,
+    ):
+        """Initialize the cache.
+
+        Args:
+            directory (str): Directory holding the cache, created when missing.
+            max_bytes (int): Total size of the cached contents kept after eviction.
+            revalidate (bool): Revalidate cached PDFs with the server before using them.
+                Published bulletins never change, so cached PDFs are used as they are
+                by default.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.revalidate = revalidate
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "urls"), exist_ok=True)
+
+        # Modification time and size of every content, read from disk on first store
+        self._objects: Dict[str, Tuple[float, int]] | None = None
+        self._total = 0
+        self._in_use: Counter = Counter()
+        self._evicting = asyncio.Lock()
+
+    def object_path(self, sha256: str) -> str:
+        """Path of the content with the given digest."""
+        return os.path.join(self.directory, "objects", sha256[:2], f"{sha256}.pdf")
+
+    def entry_path(self, url: str) -> str:
+        """Path of the index entry of the given URL."""
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, "urls", f"{digest}.json")
+
+    def lookup(self, url: str) -> Dict[str, Any] | None:
+        """Return the index entry of `url` when its content is cached, marking it used."""
+        try:
+            with open(self.entry_path(url), encoding="utf-8") as fh:
+                entry = json.load(fh)
+            # The access time of the content drives the LRU eviction
+            object_path = self.object_path(entry["sha256"])
+            os.utime(object_path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        if self._objects is not None and object_path in self._objects:
+            self._objects[object_path] = (time.time(), self._objects[object_path][1])
+        return entry
+
+    @contextmanager
+    def in_use(self, path: str) -> Iterator[str]:
+        """Keep the content at `path` from being evicted until the block exits."""
+        self._in_use[path] += 1
+        try:
+            yield path
+        finally:
+            self._in_use[path] -= 1
+            if not self._in_use[path]:
+                del self._in_use[path]
+
+    def conditional_headers(self, entry: Dict[str, Any] | None) -> Dict[str, str]:
+        """Build the headers revalidating a cached entry with the server."""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    async def store(
+        self,
+        url: str,
+        chunks: AsyncIterator[bytes],
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> Dict[str, Any]:
+        """Write a downloaded PDF to the cache and return its index entry.
+
+        The content is hashed while written to a temporary file, which is then moved
+        to its content address, so readers never see a partial PDF.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".part", delete=False
+        ) as fh:
+            try:
+                async for chunk in chunks:
+                    fh.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            except BaseException:
+                os.remove(fh.name)
+                raise
+
+        entry = {
+            "url": url,
+            "sha256": digest.hexdigest(),
+            "size": size,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        object_path = self.object_path(entry["sha256"])
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        os.replace(fh.name, object_path)
+
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".part", delete=False, encoding="utf-8"
+        ) as index:
+            json.dump(entry, index)
+        os.replace(index.name, self.entry_path(url))
+
+        await self._account(object_path, size)
+        return entry
+
+    def scan(self) -> Dict[str, Tuple[float, int]]:
+        """Read the modification time and size of every cached content from disk."""
+        objects = {}
+        for root, _, files in os.walk(os.path.join(self.directory, "objects")):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                objects[path] = (stat.st_mtime, stat.st_size)
+        return objects
+
+    async def _account(self, path: str, size: int):
+        """Add a stored content to the running total, evicting others beyond it.
+
+        The directory is only walked once, the total is kept up to date afterwards.
+        The files are removed from a thread, so the event loop keeps downloading.
+        """
+        if self._objects is None:
+            self._objects = await asyncio.to_thread(self.scan)
+            self._total = sum(size for _, size in self._objects.values())
+
+        previous = self._objects.get(path)
+        self._total += size - (previous[1] if previous else 0)
+        self._objects[path] = (time.time(), size)
+
+        if self._total <= self.max_bytes or self._evicting.locked():
+            return
+        async with self._evicting:
+            keep = {path, *self._in_use}
+            removed = await asyncio.to_thread(
+                self.evict, list(self._objects.items()), self._total, keep
+            )
+            for removed_path in removed:
+                _, removed_size = self._objects.pop(removed_path, (0.0, 0))
+                self._total -= removed_size
+
+    def evict(
+        self,
+        objects: List[Tuple[str, Tuple[float, int]]],
+        total: int,
+        keep: Set[str],
+    ) -> List[str]:
+        """Remove the least recently used contents until they fit in `max_bytes`.
+
+        Contents in `keep`, e.g. the one just stored or the ones being parsed, and the
+        ones used since `objects` was read are kept, even if they alone exceed
+        `max_bytes`. Index entries of evicted contents are left behind and read as
+        misses.
+
+        Args:
+            objects (List[Tuple[str, Tuple[float, int]]]): Path, modification time
+                and size of the cached contents.
+            total (int): Total size of the cached contents.
+            keep (Set[str]): Paths of the contents never evicted.
+
+        Returns:
+            List[str]: Paths of the evicted contents.
+        """
+        removed = []
+        for path, (mtime, size) in sorted(objects, key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            if path in keep or path in self._in_use:
+                continue
+            try:
+                if os.stat(path).st_mtime > mtime:
+                    continue
+                logger.info("Evicting cached PDF %s", path)
+                os.remove(path)
+            except FileNotFoundError:
+                # Already evicted, e.g. by another process
+                pass
+            except OSError:
+                continue
+            removed.append(path)
+            total -= size
+        return removed
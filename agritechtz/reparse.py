@@ -0,0 +1,75 @@
+"""Re-parse the ingested bulletins from the cached PDFs after a parser change"""
+
+import argparse
+import asyncio
+import json
+from typing import Dict
+
+import agritechtz.database as db
+from agritechtz.cache_config import (
+    get_pdf_cache,
+    get_redis_client,
+    get_result_cache,
+)
+from agritechtz.latest_prices import publish_ingest
+from agritechtz.logger import configure_logging, stop_logging
+from agritechtz.rollups import refresh_rollups
+from agritechtz.settings import get_settings
+from agritechtz.streamed_scrapper import CropPricesPDFParser
+from agritechtz.workers import parser_executor, parser_processes, reparse_documents
+
+
+async def main(everything: bool = False, learned_aliases: Dict[str, str] | None = None):
+    """Entry point"""
+
+    settings = get_settings()
+    pdf_cache = get_pdf_cache()
+    if pdf_cache is None:
+        raise SystemExit("PDF_CACHE_DIR must point to the cached PDFs to re-parse.")
+
+    with parser_executor(settings.parser_workers) as executor:
+        async with db.acquire_session() as session:
+            counts = await reparse_documents(
+                session=session,
+                parser=CropPricesPDFParser(
+                    engine=settings.parser_engine, streaming=settings.parser_streaming
+                ),
+                pdf_cache=pdf_cache,
+                executor=executor,
+                concurrency=max(parser_processes(settings.parser_workers), 1),
+                batch_size=settings.ingest_batch_size,
+                result_cache=get_result_cache(),
+                everything=everything,
+                learned_aliases=learned_aliases,
+            )
+            if counts["changed"]:
+                await refresh_rollups(session)
+                await get_result_cache().invalidate()
+                await publish_ingest(get_redis_client())
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--all",
+        action="store_true",
+        dest="everything",
+        help="Re-parse every bulletin instead of those parsed by another parser version",
+    )
+    arg_parser.add_argument(
+        "--learned-aliases",
+        action="store_true",
+        help="Print the region spellings corrected by fuzzy matching as JSON",
+    )
+    args = arg_parser.parse_args()
+
+    config = get_settings()
+    configure_logging(config.log_level, config.log_json, config.log_queue)
+    learned: Dict[str, str] = {}
+    try:
+        asyncio.run(main(everything=args.everything, learned_aliases=learned))
+    finally:
+        stop_logging()
+        # Candidates for `REGION_ALIASES`, also those learned before a failure
+        if args.learned_aliases:
+            print(json.dumps(learned, indent=2, sort_keys=True))
@@ -1,15 +1,47 @@
 """Data repository module"""
 
-from typing import List
+from datetime import date, datetime
+from typing import Any, AsyncIterator, List, Literal, Sequence, Tuple
 
-from sqlalchemy import and_, any_, column, func, true
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import Row, and_, func, null, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.sql import lateral
 
-from agritechtz.models import CropPrice
+from agritechtz.constants import CROPS
+from agritechtz.models import CropPrice, CropPriceRollup, Document
 from agritechtz.api.v1.schema import CropPricesFilter
+from agritechtz.rollups import Period, bucket_start
+
+
+# Columns identifying a row, in the order used to break ties between pages
+KEYSET_COLUMNS = ["ts", "region", "district", "crop"]
+
+# Price thresholds of the filter, the column they compare and whether it is a minimum
+PRICE_BOUNDS = {
+    "price__min__gte": ("min_price", True),
+    "price__min__lte": ("min_price", False),
+    "price__max__gte": ("max_price", True),
+    "price__max__lte": ("max_price", False),
+}
+
+# Geographic level the rollups are aggregated to
+AggregateLevel = Literal["country", "region", "district"]
+
+
+def expand_crops(patterns: List[str]) -> List[str]:
+    """Resolve the requested crops into the stored crop names.
+
+    A crop matches when its name ends with one of the patterns, ignoring case, so
+    `millet` selects every millet variety.
+
+    Args:
+        patterns (List[str]): Crop names or name suffixes requested by the client.
+
+    Returns:
+        List[str]: Stored crop names matching at least one pattern.
+    """
+    suffixes = [pattern.strip().lower().replace(" ", "_") for pattern in patterns]
+    return [crop for crop in CROPS if any(crop.endswith(suffix) for suffix in suffixes)]
 
 
 class CropPricesRepository:
@@ -19,70 +51,281 @@ class CropPricesRepository:
         """Initialize the CropPrices data repository."""
         self.session = session
 
-    async def filter_prices(
-        self, crop_prices_filter: CropPricesFilter
-    ) -> List[CropPrice]:
-        """Filter crop prices from the repository using CropPricesFilter.
+    def build_query(self, crop_prices_filter: CropPricesFilter, sort: bool = True):
+        """Build the select statement for the given filter.
 
         Args:
-            filter (CropPricesFilter): Filter instance containing filtering criteria.
-
-        Returns:
-            List[CropPrice]: A list of filtered CropPrice records.
+            crop_prices_filter (CropPricesFilter): Filter instance containing filtering
+                criteria.
+            sort (bool): Apply the ordering of the filter.
         """
-        query = select(CropPrice)
+        query = select(
+            CropPrice.ts,
+            CropPrice.region,
+            CropPrice.district,
+            CropPrice.crop,
+            CropPrice.min_price,
+            CropPrice.max_price,
+        )
 
         if crop_prices_filter.crop_prices__in:
-            # Alias the table
-            cp = CropPrice.__table__.alias("cp")
-
-            # Define the lateral function with proper aliasing
-            elem = lateral(
-                func.json_array_elements(cp.c.crop_prices)
-                .table_valued(column("value", JSON))
-                .alias("elem")
-            )
-            patterns = [f"%{crop}" for crop in crop_prices_filter.crop_prices__in]
-
-            # Apply the conditions
-            subquery = (
-                select(
-                    cp.c.source_url.label("source_url"),
-                    cp.c.ts.label("ts"),
-                    cp.c.region.label("region"),
-                    cp.c.district.label("district"),
-                    func.jsonb_agg(elem.c.value).label("crop_prices"),
-                )
-                .select_from(cp.join(elem, true()))
-                .where(elem.c.value["name"].astext.ilike(any_(patterns)))
-                .group_by(cp.c.source_url, cp.c.ts, cp.c.region, cp.c.district)
-                .subquery()
-            )
-
-            query = select(
-                CropPrice.source_url,
-                CropPrice.ts,
-                CropPrice.region,
-                CropPrice.district,
-                subquery.c.crop_prices,
-            ).join(
-                subquery,
-                and_(
-                    CropPrice.source_url == subquery.c.source_url,
-                    CropPrice.ts == subquery.c.ts,
-                    CropPrice.region == subquery.c.region,
-                    CropPrice.district == subquery.c.district,
-                ),
+            query = query.where(
+                CropPrice.crop.in_(expand_crops(crop_prices_filter.crop_prices__in))
             )
 
             # Clear the crop_prices__crop_in filter to prevent re-application
             crop_prices_filter.crop_prices__in = None
 
+        # The filter library cannot resolve the nested price field names, the bounds
+        # compare the price columns directly and use the (crop, price) indexes
+        for name, (column, lower) in PRICE_BOUNDS.items():
+            bound = getattr(crop_prices_filter, name)
+            if bound is None:
+                continue
+            price = getattr(CropPrice, column)
+            query = query.where(price >= bound if lower else price <= bound)
+            setattr(crop_prices_filter, name, None)
+
         # Apply filter criteria to query
         query = crop_prices_filter.filter(query)  # Apply filter criteria to query
 
         # Apply order
-        query = crop_prices_filter.sort(query)
+        return crop_prices_filter.sort(query) if sort else query
+
+    def keyset_ordering(
+        self, crop_prices_filter: CropPricesFilter
+    ) -> List[Tuple[str, bool]]:
+        """Resolve the filter ordering into a total order over the keyset columns.
+
+        The requested fields come first, the remaining keyset columns follow in the
+        direction of the first requested field so every row has a unique position.
+
+        Args:
+            crop_prices_filter (CropPricesFilter): Filter instance with the ordering.
+
+        Raises:
+            ValueError: When ordering by a column that is not part of the keyset.
+
+        Returns:
+            List[Tuple[str, bool]]: `(column, descending)` pairs.
+        """
+        ordering: List[Tuple[str, bool]] = []
+        for field in crop_prices_filter.ordering or []:
+            name = field.lstrip("+-")
+            if name not in KEYSET_COLUMNS:
+                raise ValueError(
+                    f"Ordering by {name} is not supported with pagination, "
+                    f"use any of {', '.join(KEYSET_COLUMNS)}."
+                )
+            if name not in dict(ordering):
+                ordering.append((name, field.startswith("-")))
+
+        descending = ordering[0][1] if ordering else False
+        ordering.extend(
+            (name, descending) for name in KEYSET_COLUMNS if name not in dict(ordering)
+        )
+        return ordering
+
+    async def page_prices(
+        self,
+        crop_prices_filter: CropPricesFilter,
+        limit: int,
+        after: Sequence[Any] | None = None,
+    ) -> Tuple[List[Row], Tuple[Any, ...] | None]:
+        """Fetch one page of filtered crop prices using keyset pagination.
+
+        Pages continue from the key of the last row of the previous page instead of
+        an OFFSET, so deep pages cost the same as the first one.
+
+        Args:
+            crop_prices_filter (CropPricesFilter): Filter instance containing filtering
+                criteria.
+            limit (int): Maximum number of rows in the page.
+            after (Sequence[Any] | None): Keyset values of the last row of the previous
+                page, in the order returned by `keyset_ordering`.
+
+        Returns:
+            Tuple[List[Row], Tuple[Any, ...] | None]: The rows of the page and the key of
+            its last row when more rows follow.
+        """
+        ordering = self.keyset_ordering(crop_prices_filter)
+        columns = [getattr(CropPrice, name) for name, _ in ordering]
+
+        query = self.build_query(crop_prices_filter, sort=False)
+
+        if after is not None:
+            key = [
+                date.fromisoformat(value) if name == "ts" else value
+                for (name, _), value in zip(ordering, after)
+            ]
+            query = query.where(self._after_key(ordering, columns, key))
+
+        query = query.order_by(
+            *(
+                column.desc() if descending else column.asc()
+                for column, (_, descending) in zip(columns, ordering)
+            )
+        ).limit(limit + 1)
+
+        rows = (await self.session.execute(query)).all()
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, tuple(getattr(rows[-1], name) for name, _ in ordering)
+
+    @staticmethod
+    def _after_key(ordering, columns, key):
+        """Build the predicate selecting the rows sorted after `key`."""
+        directions = {descending for _, descending in ordering}
+        if len(directions) == 1:
+            # A row value comparison can walk a composite index directly
+            if directions.pop():
+                return tuple_(*columns) < tuple_(*key)
+            return tuple_(*columns) > tuple_(*key)
+
+        # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+        conditions = []
+        for position, (column, (_, descending)) in enumerate(zip(columns, ordering)):
+            equal_prefix = [
+                previous == value
+                for previous, value in zip(columns[:position], key[:position])
+            ]
+            beyond = column < key[position] if descending else column > key[position]
+            conditions.append(and_(*equal_prefix, beyond))
+        return or_(*conditions)
+
+    async def watermark(self) -> Tuple[datetime | None, date | None]:
+        """Return when the last bulletin was ingested and the date of the latest price.
+
+        Both are read from indexes in a single round trip, so conditional requests
+        are answered without running the query of the response.
+        """
+        query = select(
+            select(func.max(Document.ingested_at)).scalar_subquery(),
+            select(func.max(CropPrice.ts)).scalar_subquery(),
+        )
+        ingested_at, latest_ts = (await self.session.execute(query)).one()
+        return ingested_at, latest_ts
+
+    async def rollups_watermark(self) -> Tuple[datetime | None, datetime | None]:
+        """Return when the last bulletin was ingested and the rollups last refreshed.
+
+        The rollups are refreshed in their own transaction after the ingestion, so a
+        replica may hold the new bulletins but not yet their aggregates.
+        """
+        query = select(
+            select(func.max(Document.ingested_at)).scalar_subquery(),
+            select(func.max(CropPriceRollup.refreshed_at)).scalar_subquery(),
+        )
+        ingested_at, refreshed_at = (await self.session.execute(query)).one()
+        return ingested_at, refreshed_at
+
+    async def filter_prices(self, crop_prices_filter: CropPricesFilter) -> List[Row]:
+        """Filter crop prices from the repository using CropPricesFilter.
+
+        Args:
+            filter (CropPricesFilter): Filter instance containing filtering criteria.
+
+        Returns:
+            List[Row]: A list of filtered crop price rows, one per district and crop.
+        """
+        result = await self.session.execute(self.build_query(crop_prices_filter))
+        return result.all()
+
+    async def stream_prices(
+        self, crop_prices_filter: CropPricesFilter, chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Stream filtered crop prices from a server-side cursor in chunks.
+
+        Only `chunk_size` rows are held in memory at a time, whatever the size of the
+        result.
+
+        Args:
+            filter (CropPricesFilter): Filter instance containing filtering criteria.
+            chunk_size (int): Number of rows fetched from the cursor per chunk.
+
+        Yields:
+            Sequence[Row]: Consecutive chunks of filtered crop price rows.
+        """
+        query = self.build_query(crop_prices_filter).execution_options(
+            yield_per=chunk_size
+        )
+        result = await self.session.stream(query)
+        async for rows in result.partitions(chunk_size):
+            yield rows
+
+    async def aggregate_prices(
+        self,
+        crop_prices_filter: CropPricesFilter,
+        period: Period = "month",
+        level: AggregateLevel = "region",
+    ) -> List[Row]:
+        """Aggregate crop prices per period from the pre-computed rollups.
+
+        Averages are weighted by the number of prices reported in every district, so
+        they match averaging the daily prices directly. The region, district, crop and
+        date filters apply, a date range selects the periods overlapping it.
+
+        Args:
+            crop_prices_filter (CropPricesFilter): Filter instance containing filtering
+                criteria.
+            period (Period): Length of the aggregated periods.
+            level (AggregateLevel): Aggregate per district, per region or for the whole
+                country.
+
+        Returns:
+            List[Row]: One row per period, place and crop, ordered by period.
+        """
+        # Places above the requested level are left empty
+        region = CropPriceRollup.region if level != "country" else null()
+        district = CropPriceRollup.district if level == "district" else null()
+
+        groups = [CropPriceRollup.bucket]
+        if level != "country":
+            groups.append(CropPriceRollup.region)
+        if level == "district":
+            groups.append(CropPriceRollup.district)
+        groups.append(CropPriceRollup.crop)
+
+        min_count = func.sum(CropPriceRollup.min_price_count)
+        max_count = func.sum(CropPriceRollup.max_price_count)
+        query = (
+            select(
+                CropPriceRollup.bucket,
+                region.label("region"),
+                district.label("district"),
+                CropPriceRollup.crop,
+                (
+                    func.sum(CropPriceRollup.min_price_sum) / func.nullif(min_count, 0)
+                ).label("avg_min_price"),
+                (
+                    func.sum(CropPriceRollup.max_price_sum) / func.nullif(max_count, 0)
+                ).label("avg_max_price"),
+                func.min(CropPriceRollup.lowest_min_price).label("lowest_min_price"),
+                func.max(CropPriceRollup.highest_max_price).label("highest_max_price"),
+                func.greatest(min_count, max_count).label("samples"),
+            )
+            .where(CropPriceRollup.period == period)
+            .group_by(*groups)
+            .order_by(*groups)
+        )
+
+        # The filter targets the daily prices, its criteria are mapped to the rollups
+        regions = crop_prices_filter.region__in
+        districts = crop_prices_filter.district__in
+        crops = crop_prices_filter.crop_prices__in
+        if regions:
+            query = query.where(CropPriceRollup.region.in_(regions))
+        if districts:
+            query = query.where(CropPriceRollup.district.in_(districts))
+        if crops:
+            query = query.where(CropPriceRollup.crop.in_(expand_crops(crops)))
+        if crop_prices_filter.ts__gte:
+            first = bucket_start(period, crop_prices_filter.ts__gte)
+            query = query.where(CropPriceRollup.bucket >= first)
+        if crop_prices_filter.ts__lte:
+            query = query.where(CropPriceRollup.bucket <= crop_prices_filter.ts__lte)
 
         result = await self.session.execute(query)
         return result.all()
@@ -0,0 +1,133 @@
+"""Cache of rendered query results backed by Redis"""
+
+import hashlib
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from agritechtz.logger import logger
+
+
+class QueryResultCache:
+    """Cache rendered API responses keyed on their normalized query parameters.
+
+    Entries are stored under the current generation, which ingestion bumps after new
+    rows are committed, so stale entries are never read again and expire with their
+    TTL. The number of entries is bounded by evicting the least recently used ones.
+    Redis errors are logged and treated as cache misses.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        prefix: str = "agritechtz:prices",
+        ttl: int = 3600,
+        max_entries: int = 1000,
+        max_bytes: int = 5 * 1024 * 1024,
+    ):
+        """Initialize the cache.
+
+        Args:
+            redis (Redis): Client of the Redis server holding the entries.
+            prefix (str): Prefix of every key written by the cache.
+            ttl (int): Lifetime of an entry in seconds.
+            max_entries (int): Number of entries kept before evicting the oldest.
+            max_bytes (int): Responses with a larger body are not cached.
+        """
+        self.redis = redis
+        self.prefix = prefix
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    @property
+    def generation_key(self) -> str:
+        """Key of the counter bumped whenever the underlying data changes."""
+        return f"{self.prefix}:generation"
+
+    @property
+    def index_key(self) -> str:
+        """Key of the sorted set tracking the last access time of every entry."""
+        return f"{self.prefix}:index"
+
+    async def generation(self) -> int:
+        """Return the current data generation, 0 when nothing was ingested yet."""
+        try:
+            return int(await self.redis.get(self.generation_key) or 0)
+        except RedisError as e:
+            logger.warning("Could not read the cache generation: %s", e)
+            return 0
+
+    def key(self, generation: int, params: Dict[str, Any]) -> str:
+        """Build the entry key for the given generation and normalized parameters."""
+        digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"{self.prefix}:{generation}:{digest}"
+
+    async def get(self, key: str) -> Tuple[bytes, Dict[str, str]] | None:
+        """Return the cached body and headers stored under `key`, if any."""
+        try:
+            entry = await self.redis.hgetall(key)
+            if not entry:
+                return None
+            await self.redis.zadd(self.index_key, {key: time.time()})
+        except RedisError as e:
+            logger.warning("Could not read cache entry %s: %s", key, e)
+            return None
+
+        return entry[b"body"], json.loads(entry[b"headers"])
+
+    async def set(self, key: str, body: bytes, headers: Dict[str, str]):
+        """Store a rendered response and evict the least recently used entries."""
+        if len(body) > self.max_bytes:
+            return
+
+        try:
+            now = time.time()
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping={"body": body, "headers": json.dumps(headers)})
+                pipe.expire(key, self.ttl)
+                pipe.zadd(self.index_key, {key: now})
+                # Forget entries which already expired
+                pipe.zremrangebyscore(self.index_key, "-inf", now - self.ttl)
+                pipe.zcard(self.index_key)
+                *_, size = await pipe.execute()
+
+            if size > self.max_entries:
+                evicted = await self.redis.zrange(
+                    self.index_key, 0, size - self.max_entries - 1
+                )
+                if evicted:
+                    await self.redis.delete(*evicted)
+                    await self.redis.zrem(self.index_key, *evicted)
+        except RedisError as e:
+            logger.warning("Could not write cache entry %s: %s", key, e)
+
+    async def tee(
+        self, key: str, chunks: AsyncIterator[str | bytes], headers: Dict[str, str]
+    ) -> AsyncIterator[str | bytes]:
+        """Pass a streamed body through and cache it once fully sent.
+
+        Bodies growing beyond `max_bytes` are streamed without being cached.
+        """
+        body: bytearray | None = bytearray()
+        async for chunk in chunks:
+            if body is not None:
+                body.extend(chunk.encode() if isinstance(chunk, str) else chunk)
+                if len(body) > self.max_bytes:
+                    body = None
+            yield chunk
+
+        if body is not None:
+            await self.set(key, bytes(body), headers)
+
+    async def invalidate(self):
+        """Start a new generation, making every cached entry unreachable."""
+        try:
+            await self.redis.incr(self.generation_key)
+        except RedisError as e:
+            logger.warning("Could not invalidate the result cache: %s", e)
@@ -0,0 +1,145 @@
+"""Crop prices pre-aggregated per day, ISO week and month"""
+
+from datetime import date, timedelta
+from typing import Iterable, List, Literal, Tuple
+
+from sqlalchemy import (
+    Date,
+    and_,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agritechtz.logger import logger
+from agritechtz.models import CropPrice, CropPriceRollup
+
+Period = Literal["day", "week", "month"]
+PERIODS: Tuple[Period, ...] = ("day", "week", "month")
+
+
+def bucket_start(period: Period, day: date) -> date:
+    """Return the first day of the bucket holding `day`, as `date_trunc` does."""
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def bucket_end(period: Period, start: date) -> date:
+    """Return the first day after the bucket starting on `start`."""
+    if period == "week":
+        return start + timedelta(days=7)
+    if period == "month":
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def bucket_ranges(period: Period, days: Iterable[date]) -> List[Tuple[date, date]]:
+    """Merge the buckets holding `days` into as few `[start, end)` ranges as possible.
+
+    A backfill touching every day of a year refreshes a single range instead of
+    hundreds of separate buckets.
+    """
+    ranges: List[Tuple[date, date]] = []
+    for start in sorted({bucket_start(period, day) for day in days}):
+        end = bucket_end(period, start)
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def rollup_query(period: Period):
+    """Build the select aggregating the crop prices into the buckets of `period`."""
+    if period not in PERIODS:
+        raise ValueError(f"Unknown rollup period: {period}")
+
+    # Inlined rather than bound, so the bucket expressions of the SELECT and GROUP BY
+    # clauses are identical to the server
+    bucket = func.date_trunc(literal_column(f"'{period}'"), CropPrice.ts).cast(Date)
+    return select(
+        literal(period),
+        bucket,
+        CropPrice.region,
+        CropPrice.district,
+        CropPrice.crop,
+        func.sum(CropPrice.min_price),
+        func.count(CropPrice.min_price),
+        func.sum(CropPrice.max_price),
+        func.count(CropPrice.max_price),
+        func.min(CropPrice.min_price),
+        func.max(CropPrice.max_price),
+    ).group_by(bucket, CropPrice.region, CropPrice.district, CropPrice.crop)
+
+
+async def refresh_rollups(session: AsyncSession, days: Iterable[date] | None = None):
+    """Recompute the rollups of the buckets holding `days`, or every bucket.
+
+    The buckets are deleted and aggregated again from `cn_crop_prices` in a single
+    transaction, so readers see either the old or the new aggregates.
+
+    Args:
+        session (AsyncSession): Database session used for the refresh.
+        days (Iterable[date] | None): Days whose prices changed, e.g. the dates of the
+            bulletins just ingested. Every bucket is recomputed when omitted.
+    """
+    days = None if days is None else list(days)
+
+    for period in PERIODS:
+        stale = delete(CropPriceRollup).where(CropPriceRollup.period == period)
+        query = rollup_query(period)
+
+        if days is not None:
+            ranges = bucket_ranges(period, days)
+            if not ranges:
+                continue
+            stale = stale.where(
+                or_(
+                    *(
+                        and_(
+                            CropPriceRollup.bucket >= start,
+                            CropPriceRollup.bucket < end,
+                        )
+                        for start, end in ranges
+                    )
+                )
+            )
+            query = query.where(
+                or_(
+                    *(
+                        and_(CropPrice.ts >= start, CropPrice.ts < end)
+                        for start, end in ranges
+                    )
+                )
+            )
+            logger.info("Refreshing %d %s rollup ranges", len(ranges), period)
+
+        await session.execute(stale)
+        await session.execute(
+            insert(CropPriceRollup).from_select(
+                [
+                    "period",
+                    "bucket",
+                    "region",
+                    "district",
+                    "crop",
+                    "min_price_sum",
+                    "min_price_count",
+                    "max_price_sum",
+                    "max_price_count",
+                    "lowest_min_price",
+                    "highest_max_price",
+                ],
+                query,
+            )
+        )
+
+    await session.commit()
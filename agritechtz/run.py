@@ -1,26 +1,52 @@
 """A module to test daily execution"""
 
+import argparse
 import asyncio
+import json
+from typing import Dict
 
 import agritechtz.database as db
-from agritechtz.constants import BASE_URL
-from agritechtz.streamed_scrapper import CropPricesPDFParser
-from agritechtz.workers import download_daily_updates
+from agritechtz.logger import configure_logging, stop_logging
+from agritechtz.settings import get_settings
+from agritechtz.workers import ingest_and_publish, parser_executor
 
 
-async def main():
+async def main(full_crawl: bool = False, learned_aliases: Dict[str, str] | None = None):
     """Entry point"""
 
+    settings = get_settings()
+
     # Initialize the database (if needed)
     await db.init_db()
 
-    # Start a session and run the download task
-    async with db.acquire_session() as session:
-        await download_daily_updates(
-            session=session, parser=CropPricesPDFParser(), base_url=BASE_URL
+    # Run the download task
+    with parser_executor(settings.parser_workers) as executor:
+        await ingest_and_publish(
+            executor=executor, full_crawl=full_crawl, learned_aliases=learned_aliases
         )
 
 
 if __name__ == "__main__":
-
-    asyncio.run(main())
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--full-crawl",
+        action="store_true",
+        help="Walk every listing page instead of stopping at already ingested ones",
+    )
+    arg_parser.add_argument(
+        "--learned-aliases",
+        action="store_true",
+        help="Print the region spellings corrected by fuzzy matching as JSON",
+    )
+    args = arg_parser.parse_args()
+
+    config = get_settings()
+    configure_logging(config.log_level, config.log_json, config.log_queue)
+    learned: Dict[str, str] = {}
+    try:
+        asyncio.run(main(full_crawl=args.full_crawl, learned_aliases=learned))
+    finally:
+        stop_logging()
+        # Candidates for `REGION_ALIASES`, also those learned before a failure
+        if args.learned_aliases:
+            print(json.dumps(learned, indent=2, sort_keys=True))
@@ -1,46 +1,49 @@
 """A module for scheduling tasks to be performed periodically"""
 
 import asyncio
+from concurrent.futures import Executor
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from agritechtz.constants import BASE_URL
-from agritechtz.database import acquire_session
-from agritechtz.streamed_scrapper import CropPricesPDFParser
-from agritechtz.workers import download_daily_updates
+from agritechtz.logger import configure_logging, stop_logging
+from agritechtz.settings import get_settings
+from agritechtz.workers import ingest_and_publish, parser_executor
 
 
-async def daily_updates_job():
+async def daily_updates_job(executor: Executor | None = None):
     """Check daily updates from the Viwanda data and download into the database."""
 
-    async with acquire_session() as session:
-        parser = CropPricesPDFParser()
-        base_url = BASE_URL
-
-        await download_daily_updates(base_url=base_url, session=session, parser=parser)
+    await ingest_and_publish(executor=executor)
 
 
 def main():
     """Entry point for the schedulers"""
 
+    settings = get_settings()
+    configure_logging(settings.log_level, settings.log_json, settings.log_queue)
+
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)  # Set the new event loop
+        with parser_executor(settings.parser_workers) as executor:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)  # Set the new event loop
 
-        scheduler = AsyncIOScheduler()
-        # Runs daily at midnight
-        scheduler.add_job(daily_updates_job, "cron", minute=0)
+            scheduler = AsyncIOScheduler()
+            # Runs daily at midnight
+            scheduler.add_job(daily_updates_job, "cron", minute=0, args=[executor])
 
-        # Start the scheduler
-        scheduler.start()
+            # Start the scheduler
+            scheduler.start()
 
-        # Run the daily update job immediately (after scheduler starts)
-        loop.run_until_complete(daily_updates_job())  # Execute the job immediately
+            # Run the daily update job immediately (after scheduler starts)
+            loop.run_until_complete(daily_updates_job(executor))
 
-        # Let the scheduler keep running indefinitely
-        loop.run_forever()
+            # Let the scheduler keep running indefinitely
+            loop.run_forever()
 
     except (KeyboardInterrupt, SystemExit):
         pass
+    finally:
+        stop_logging()
 
 
 if __name__ == "__main__":
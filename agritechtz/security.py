@@ -4,10 +4,15 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 
-from agritechtz.cache_config import redis_url
+from agritechtz.settings import get_settings
 
 
-limiter = Limiter(key_func=get_remote_address, storage_uri=redis_url)
+limiter = Limiter(
+    key_func=get_remote_address, storage_uri=get_settings().redis_backend_url
+)
 """
 Configure rate limiter against DoS attacks
+
+The storage only connects on the first request and its connection pool is fork
+safe, so the limiter can be created before gunicorn forks its workers.
 """
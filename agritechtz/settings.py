@@ -1,6 +1,7 @@
 """Settings Module"""
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,6 +11,70 @@ class Settings(BaseSettings):
 
     database_url: str
     redis_backend_url: str
+    # Read replica serving the API queries, they go to the primary when it is empty
+    database_replica_url: str = ""
+
+    # Connection pool of every engine, per process
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Test connections before using them, e.g. after a database restart
+    db_pool_pre_ping: bool = True
+    # Prepared statements cached per connection, 0 behind pgbouncer transaction pooling
+    db_statement_cache_size: int = 100
+    # Log every SQL statement
+    db_echo: bool = False
+    # Abort statements running longer than this many milliseconds, 0 never aborts
+    db_statement_timeout_ms: int = 0
+
+    # Connections opened by each API worker before it accepts traffic
+    db_pool_warmup: int = 2
+
+    # Number of PDFs downloaded and parsed at the same time by the scraper
+    scraper_concurrency: int = 4
+    # Number of processes used for parsing PDFs, one per core when unset and 0 parses
+    # on the event loop
+    parser_workers: int | None = None
+    # Number of rows per multi-row INSERT when saving parsed bulletins
+    ingest_batch_size: int = 1000
+    # How rows are read from the PDF text, "regex" or the linear-time "tokens" engine
+    parser_engine: Literal["regex", "tokens"] = "regex"
+    # Parse PDFs one page at a time, bounding memory and skipping unreadable pages
+    parser_streaming: bool = False
+    # Size up to which downloaded PDFs are kept in memory, 0 writes them to temporary files
+    pdf_spool_max_bytes: int = 0
+
+    # Local cache of the raw PDFs, disabled when no directory is set
+    pdf_cache_dir: str = ""
+    pdf_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+    # Revalidate cached PDFs with conditional requests instead of trusting them
+    pdf_cache_revalidate: bool = False
+
+    # Cache of rendered API responses, invalidated whenever new prices are ingested
+    result_cache_ttl: int = 3600
+    result_cache_max_entries: int = 1000
+    result_cache_max_bytes: int = 5 * 1024 * 1024
+
+    # Directory of the full-dataset snapshots written by the scheduler, disabled when
+    # no directory is set. It is shared with the API and nginx, which serves the files
+    export_dir: str = ""
+    export_keep: int = 3
+    # Internal nginx location mapped to `export_dir`, an empty prefix makes the API
+    # send the files itself, e.g. in development
+    export_accel_prefix: str = "/_exports/"
+
+    # Seconds shared caches, e.g. the nginx micro-cache, may serve API responses
+    http_cache_max_age: int = 5
+    # Responses smaller than this are not compressed
+    compression_min_size: int = 1024
+
+    # Minimum level of the application logs, e.g. DEBUG, INFO or WARNING
+    log_level: str = "INFO"
+    # Write the logs as JSON lines instead of text
+    log_json: bool = False
+    # Write the logs from a background thread, off the event loop
+    log_queue: bool = True
+    # Share of the API requests whose records below WARNING are kept
+    log_request_sample_rate: float = 0.1
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
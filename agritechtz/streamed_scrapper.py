@@ -1,13 +1,30 @@
 """Harvest Module"""
 
-import difflib
+import asyncio
+import hashlib
+import io
+import json
 import os
 import tempfile
+import time
 import re
 import urllib.parse
 
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator, List, Set, Tuple
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import AsyncExitStack, aclosing, asynccontextmanager
+from datetime import date
+from typing import (
+    AsyncGenerator,
+    Deque,
+    IO,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Set,
+    Tuple,
+)
 
 from bs4 import BeautifulSoup
 import httpx
@@ -15,45 +32,194 @@ import numpy as np
 import pandas as pd
 from pypdf import PdfReader
 
+from agritechtz.aliases import AliasIndex
 from agritechtz.constants import (
     CROPS_COLUMNS,
     DATE_PATTERN,
     DATE_PATTERN_WITH_MONTH_FIRST,
+    MONTH_REPLACEMENTS,
     PAGES_PATTERN,
     PDF_PATTERN,
+    REGION_ALIASES,
+    REGION_KEYWORDS,
     REGIONAL_PATTERN,
     TZ_REGIONS,
 )
 from agritechtz.logger import logger
+from agritechtz.pdf_cache import PDFCache
+from agritechtz.tokenizer import RowTokenizer
 
 
 pd.set_option("future.no_silent_downcasting", True)
 
+ParserEngine = Literal["regex", "tokens"]
+
+# Bump whenever a change to the parsing code alters the rows read from the bulletins
+PARSER_REVISION = 1
+
+# A PDF as accepted by the parser: a path, an open binary file or the raw bytes
+PDFSource = str | IO[bytes] | bytes
+
 
 class CropPricesPDFParser:
     """Class to extract text and convert data from PDFs into structured data (DataFrame)."""
 
+    def __init__(self, engine: ParserEngine = "regex", streaming: bool = False):
+        """Initialize the parser with the alias indexes used to normalize names.
+
+        Args:
+            engine (ParserEngine): How rows are read from the PDF text, either with
+                `REGIONAL_PATTERN` or with the linear-time `RowTokenizer`.
+            streaming (bool): Parse documents one page at a time instead of extracting
+                the whole text first, see `iter_dataframes`.
+        """
+        if engine not in ("regex", "tokens"):
+            raise ValueError(f"Unknown parser engine: {engine}")
+        self.engine = engine
+        self.streaming = streaming
+        self.tokenizer = RowTokenizer()
+        self.region_index = AliasIndex(TZ_REGIONS, REGION_ALIASES)
+        self.district_index = AliasIndex()
+        self._region_indexes: Dict[Tuple[str, ...], AliasIndex] = {
+            tuple(TZ_REGIONS): self.region_index
+        }
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of the code and constants shaping the parsed rows.
+
+        Documents ingested under another version may parse differently and are the
+        ones picked up by the re-parse job.
+        """
+        fingerprint = {
+            "revision": PARSER_REVISION,
+            "engine": self.engine,
+            "pattern": [REGIONAL_PATTERN.pattern, REGIONAL_PATTERN.flags],
+            "region_keywords": REGION_KEYWORDS,
+            "regions": TZ_REGIONS,
+            "region_aliases": REGION_ALIASES,
+            "date_patterns": [
+                DATE_PATTERN.pattern,
+                DATE_PATTERN_WITH_MONTH_FIRST.pattern,
+            ],
+            "months": MONTH_REPLACEMENTS,
+            "columns": CROPS_COLUMNS,
+        }
+        return hashlib.sha256(
+            json.dumps(fingerprint, sort_keys=True).encode()
+        ).hexdigest()[:16]
+
     def standardize_region(self, region: str, regions: List[str]):
         """Standardize region names by fixing naming issues from the source"""
-        close_matches = difflib.get_close_matches(region, regions, n=1, cutoff=0.6)
+        index = self._region_indexes.get(tuple(regions))
+        if index is None:
+            index = self._region_indexes[tuple(regions)] = AliasIndex(regions)
 
-        if len(close_matches) == 0:
+        standardized = index.resolve(region)
+        if standardized is None:
             raise ValueError(f"Could not find region: {region} from the list.")
-        return close_matches[0]
+        return standardized
+
+    def standardize_district(self, district: str) -> str:
+        """Standardize district names by collapsing line breaks and repeated spaces"""
+        return self.district_index.resolve(district)
 
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def learned_aliases(self) -> Dict[str, str]:
+        """Return the region spellings corrected by the fuzzy fallback so far.
+
+        Parsed in another process, the parser is a copy, so the spellings learned from
+        a document are also attached to its DataFrame, see `parse_dataframe`.
+        """
+        learned: Dict[str, str] = {}
+        for index in self._region_indexes.values():
+            learned.update(index.learned_aliases())
+        return learned
+
+    def open_pdf(self, pdf_path: PDFSource) -> PdfReader:
+        """Open a PDF given as a path, a binary file or bytes, without copying files."""
+        if isinstance(pdf_path, bytes):
+            pdf_path = io.BytesIO(pdf_path)
+        return PdfReader(pdf_path)
+
+    def extract_text_from_pdf(self, pdf_path: PDFSource) -> str:
         """Extracts text from all pages in a PDF file.
 
         Args:
-            pdf_path (str): Path to the PDF file.
+            pdf_path (PDFSource): Path to the PDF file, or its content.
 
         Returns:
             str: Combined text content of the PDF.
         """
-        pdf_reader = PdfReader(pdf_path)
+        pdf_reader = self.open_pdf(pdf_path)
         text = "".join(page.extract_text() for page in pdf_reader.pages)
         return text
 
+    def iter_page_texts(self, pdf_path: PDFSource) -> Iterator[str]:
+        """Extracts text from a PDF file one page at a time.
+
+        Pages whose text cannot be extracted are logged and skipped, so a single broken
+        page does not fail the whole document.
+
+        Args:
+            pdf_path (PDFSource): Path to the PDF file, or its content.
+
+        Yields:
+            str: Text content of each readable page.
+        """
+        pdf_reader = self.open_pdf(pdf_path)
+        for number, page in enumerate(pdf_reader.pages, start=1):
+            try:
+                yield page.extract_text()
+            except Exception as e:
+                logger.warning("Skipping page %d of %s: %s", number, pdf_path, e)
+
+    def find_rows(self, text: str) -> Iterator[Tuple[Tuple, int]]:
+        """Yield the raw rows of the text found by the selected engine, along with the
+        offset right after each row."""
+        if self.engine == "tokens":
+            yield from self.tokenizer.iter_rows(text)
+        else:
+            for match in REGIONAL_PATTERN.finditer(text):
+                yield match.groups(), match.end()
+
+    def iter_row_batches(self, pdf_path: PDFSource) -> Iterator[List[Tuple]]:
+        """Extracts and cleans the rows of a PDF file one page at a time.
+
+        The text following the last complete row of a page is carried over to the next
+        page, so rows wrapping across a page boundary are read whole, as when the pages
+        are joined. A row ending right at the end of a page is carried over as well,
+        since its last price cell may continue on the next page.
+
+        Args:
+            pdf_path (PDFSource): Path to the PDF file, or its content.
+
+        Yields:
+            List[Tuple]: The cleaned rows completed by each page, shaped like those of
+            `match_and_clean_text`.
+        """
+        carry = ""
+        for text in self.iter_page_texts(pdf_path):
+            if not text:
+                continue
+
+            combined = carry + text
+            rows, end, found = [], 0, False
+            for row, row_end in self.find_rows(combined):
+                found = True
+                if row_end < len(combined):
+                    rows.append(row)
+                    end = row_end
+
+            # Without any row in sight the carried text is dropped, which keeps the
+            # memory bounded by about two pages
+            carry = combined[end:] if found else text
+            if rows:
+                yield self.clean_rows(rows)
+
+        rows = [row for row, _ in self.find_rows(carry)]
+        if rows:
+            yield self.clean_rows(rows)
+
     def match_and_clean_text(self, text: str, pattern: re.Pattern):
         """
         Matches groups from the input text using a specified regex pattern, standardizes region
@@ -70,24 +236,41 @@ class CropPricesPDFParser:
         """
         # Find all matching groups in the text using the provided regex pattern.
         # This returns a list of tuples where each tuple represents a row of matched data.
-        rows = pattern.findall(text)
+        return self.clean_rows(pattern.findall(text))
+
+    def tokenize_and_clean_text(self, text: str):
+        """
+        Reads rows from the input text with the tokenizer, standardizes region and district
+        names, and returns the cleaned rows, shaped like those of `match_and_clean_text`.
 
+        Args:
+            text (str): The extracted text content from the PDF document.
+
+        Returns:
+            List[Tuple]: A list of tuples, where each tuple contains the standardized region
+            and district followed by the price cells.
+        """
+        return self.clean_rows(self.tokenizer.rows(text))
+
+    def clean_rows(self, rows: List[Tuple]) -> List[Tuple]:
+        """Standardize the region and district names of the matched rows in place."""
         # Iterate over each row of matched data to standardize the region name.
         for i, row in enumerate(rows):
             # Check if the row contains at least one element (the region name).
             if len(row) > 0:
                 # Extract and standardize the first element as the region name.
                 region = self.standardize_region(row[0], TZ_REGIONS)
+                district = self.standardize_district(row[1])
 
-                # Update the current row by replacing the original region with the standardized one,
-                # while keeping the remaining elements in the tuple unchanged.
-                rows[i] = (region,) + row[1:]
+                # Update the current row by replacing the original region and district with the
+                # standardized ones, while keeping the remaining elements in the tuple unchanged.
+                rows[i] = (region, district) + row[2:]
 
         # Return the list of standardized and cleaned rows.
         return rows
 
     def parse_dataframe(
-        self, downloaded_file_path: str, source_file_path: str
+        self, downloaded_file_path: PDFSource, source_file_path: str
     ) -> pd.DataFrame:
         """Converts text from PDF into a DataFrame using predefined regex patterns.
 
@@ -96,16 +279,69 @@ class CropPricesPDFParser:
 
         Returns:
             pd.DataFrame: Structured data with each row representing a region's crop prices.
+                The region spellings first corrected in this document are listed in
+                `attrs["learned_aliases"]`.
+        """
+        known = self.learned_aliases()
+        if self.streaming:
+            dataframes = list(
+                self.iter_dataframes(downloaded_file_path, source_file_path)
+            )
+            if dataframes:
+                df = pd.concat(dataframes, ignore_index=True)
+            else:
+                df = self.rows_to_dataframe([], source_file_path)
+        else:
+            corpus = self.extract_text_from_pdf(downloaded_file_path)
+            if self.engine == "tokens":
+                rows = self.tokenize_and_clean_text(corpus)
+            else:
+                rows = self.match_and_clean_text(corpus, REGIONAL_PATTERN)
+            df = self.rows_to_dataframe(rows, source_file_path)
+
+        df.attrs["learned_aliases"] = {
+            spelling: region
+            for spelling, region in self.learned_aliases().items()
+            if spelling not in known
+        }
+        return df
+
+    def iter_dataframes(
+        self, downloaded_file_path: PDFSource, source_file_path: str
+    ) -> Iterator[pd.DataFrame]:
+        """Converts a PDF into DataFrames one page at a time.
+
+        Only the text of the current page and the unfinished row of the previous one
+        are held in memory, see `iter_row_batches`.
+
+        Args:
+            downloaded_file_path (PDFSource): Path to the PDF file, or its content.
+            source_file_path (str): Name of the PDF file, holding its date.
+
+        Yields:
+            pd.DataFrame: The rows completed by each page, as in `parse_dataframe`.
         """
-        corpus = self.extract_text_from_pdf(downloaded_file_path)
-        rows = self.match_and_clean_text(corpus, REGIONAL_PATTERN)
+        for rows in self.iter_row_batches(downloaded_file_path):
+            yield self.rows_to_dataframe(rows, source_file_path)
 
+    def rows_to_dataframe(
+        self, rows: List[Tuple], source_file_path: str
+    ) -> pd.DataFrame:
+        """Converts cleaned rows into a DataFrame dated from the PDF file name.
+
+        Args:
+            rows (List[Tuple]): Cleaned rows, as returned by `match_and_clean_text`.
+            source_file_path (str): Name of the PDF file, holding its date.
+
+        Returns:
+            pd.DataFrame: Structured data with each row representing a region's crop prices.
+        """
         # Create the dataframe from the matched groups
         df = pd.DataFrame(rows, columns=CROPS_COLUMNS)
 
         # Extract and add the date column from the PDF content
         date = self.extract_date_from_file_path(source_file_path)
-        print(date)
+        logger.debug("Bulletin %s is dated %s", source_file_path, date)
         df.insert(0, "Date", pd.to_datetime(date, dayfirst=True, format="%d %B %Y"))
 
         # Convert numeric columns, handling missing values and commas
@@ -139,24 +375,7 @@ class CropPricesPDFParser:
         raise ValueError("Date not found in the PDF corpus.")
 
     def standardize_month(self, month: str) -> str:
-        replacements = {
-            r"\bAgosti\b": "August",
-            r"\bMachi\b": "March",
-            r"\bJan\b": "January",
-            r"\bFeb\b": "February",
-            r"\bMar\b": "March",
-            r"\bApr\b": "April",
-            r"\bJun\b": "June",
-            r"\bJul\b": "July",
-            r"\bAug\b": "August",
-            r"\bSept\b": "September",
-            r"\bOct\b": "October",
-            r"\bNov\b": "November",
-            r"\bDec\b": "December",
-            r"\bCtober\b": "October",
-            r"\bSeptemba\b": "September",
-        }
-        for pattern, replacement in replacements.items():
+        for pattern, replacement in MONTH_REPLACEMENTS.items():
             month = re.sub(pattern, replacement, month, flags=re.IGNORECASE)
         return month.title()
 
@@ -164,38 +383,76 @@ class CropPricesPDFParser:
 class Paginator:
     """Utility for identifying and retrieving PDF links across multiple pages."""
 
-    def __init__(self, base_url: str, start_page=1):
-        """Initialize Paginator with base URL"""
+    def __init__(self, base_url: str, start_page=1, concurrency: int = 1):
+        """Initialize Paginator with base URL
+
+        Args:
+            base_url (str): Base URL for page navigation.
+            start_page (int): Starting page number to begin navigation.
+            concurrency (int): Maximum number of listing pages fetched at once.
+        """
         self.base_url = base_url
         self.current_page = start_page
         self.start_page = start_page
-        self.total_pages = None  # Will be computed by the compute_total_pages() method
-
-    async def compute_total_pages(self) -> int:
+        self.concurrency = concurrency
+        self.total_pages = None  # Discovered while iterating through the pages
+
+    def page_url(self, page_number: int) -> str:
+        """Return the URL of the listing page with the given number."""
+        return f"{self.base_url}?page={page_number}"
+
+    async def fetch_page_links(
+        self, client: httpx.AsyncClient, page_number: int
+    ) -> Tuple[int, List[dict]]:
+        """Download a listing page and return all its anchor elements."""
+        response = await client.get(self.page_url(page_number))
+        soup = BeautifulSoup(response.text, "html.parser")
+        return page_number, soup.find_all("a", href=True)
+
+    async def iter_pages(
+        self, client: httpx.AsyncClient | None = None
+    ) -> AsyncGenerator[Tuple[str, List[Tuple[str, str]]], None]:
         """
-        Calculates the total number of pages with PDF links.
+        Walk the listing pages once, yielding each page URL with its PDF links.
+
+        Every page is downloaded and parsed a single time. The last page number is
+        discovered from the pagination links of the pages already fetched, and the
+        pages known to exist are fetched `concurrency` at a time. Pages are yielded
+        in order.
 
         Args:
-            base_url (str): Base URL for page navigation.
-            start_page (int): Starting page number to begin navigation.
+            client (httpx.AsyncClient | None): Client reused for all requests. A new
+                one is created for the duration of the iteration when omitted.
         """
-        current_page = self.current_page
-
-        async with httpx.AsyncClient() as client:
-            while True:
-                response = await client.get(
-                    f"{self.base_url}?page={current_page}", timeout=500
-                )
-                soup = BeautifulSoup(response.text, "html.parser")
-                links = soup.find_all("a", href=True)
-
-                # Get next page
-                next_page = self.get_next_page(current_page, links)
-                if not next_page:
-                    break
-                current_page = next_page
-            self.total_pages = current_page
-        return self.total_pages
+        if client is None:
+            async with httpx.AsyncClient(timeout=500) as own_client:
+                async for page in self.iter_pages(own_client):
+                    yield page
+            return
+
+        next_page = self.start_page
+        last_page = self.start_page
+        pending: Deque[asyncio.Task] = deque()
+
+        try:
+            while pending or next_page <= last_page:
+                while next_page <= last_page and len(pending) < self.concurrency:
+                    pending.append(
+                        asyncio.create_task(self.fetch_page_links(client, next_page))
+                    )
+                    next_page += 1
+
+                page_number, links = await pending.popleft()
+                last_page = max(last_page, self.get_last_page(page_number, links))
+                self.total_pages = last_page
+                self.current_page = page_number
+
+                yield self.page_url(page_number), self.filter_pdf_links(links)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
     def filter_pdf_links(self, page_links: List[dict]) -> List[str]:
         """Filters and returns PDF links from HTML anchor elements.
@@ -236,38 +493,160 @@ class Paginator:
                     return next_page
         return None
 
+    def get_last_page(self, current_page: int, links: List[dict]) -> int:
+        """
+        Given the current page and list of links, return the highest page number seen.
+
+        Args:
+            current_page (int): The current page number.
+            links (list): A list of page links, each a dictionary with 'href' as a key.
+
+        Returns:
+            int: The highest page number referenced, or the current page if none is higher.
+        """
+        page_numbers = [
+            int(match.group(1))
+            for link in links
+            if (match := PAGES_PATTERN.search(link["href"]))
+        ]
+        return max([current_page, *page_numbers])
+
     def __aiter__(self):
-        """Make paginator iterable"""
-        # Reset to the start_page each time iteration begins
-        self.current_page = self.start_page
-        return self
-
-    async def __anext__(self):
-        """Asynchronous next method for iterating through pages and PDF links"""
-        if self.total_pages is None:
-            await self.compute_total_pages()
-        if self.current_page > self.total_pages:
-            raise StopAsyncIteration
-        current_url = f"{self.base_url}?page={self.current_page}"
-        self.current_page += 1
-        return current_url
+        """Make paginator iterable, yielding `(page_url, pdf_links)` pairs"""
+        return self.iter_pages()
+
+
+class DownloadStats:
+    """Bytes copied and time spent per stage while handling a downloaded PDF."""
+
+    def __init__(self, pdf_url: str):
+        self.pdf_url = pdf_url
+        self.stages: Dict[str, Tuple[int, float]] = {}
+
+    def record(self, stage: str, copied: int, started: float):
+        """Add the bytes copied by `stage` and the time elapsed since `started`."""
+        total, elapsed = self.stages.get(stage, (0, 0.0))
+        self.stages[stage] = (total + copied, elapsed + time.perf_counter() - started)
+
+    def __str__(self) -> str:
+        return ", ".join(
+            f"{stage} {copied} B in {elapsed:.3f}s"
+            for stage, (copied, elapsed) in self.stages.items()
+        )
+
+
+async def cached_pdf(
+    client: httpx.AsyncClient, cache: PDFCache, pdf_url: str, stats: DownloadStats
+) -> str:
+    """
+    Return the path of a PDF in the cache, downloading it into the cache on a miss.
+
+    Cached PDFs are used without any request unless the cache revalidates, in which
+    case a conditional request is sent and the cached copy is kept when the server
+    answers 304 Not Modified or cannot be reached.
+    """
+    started = time.perf_counter()
+    entry = cache.lookup(pdf_url)
+    if entry is not None and not cache.revalidate:
+        stats.record("cache", 0, started)
+        return cache.object_path(entry["sha256"])
+
+    try:
+        async with client.stream(
+            "GET", pdf_url, headers=cache.conditional_headers(entry), timeout=500
+        ) as response:
+            if entry is not None and response.status_code == 304:
+                stats.record("revalidate", 0, started)
+                return cache.object_path(entry["sha256"])
+
+            response.raise_for_status()
+            entry = await cache.store(
+                pdf_url,
+                response.aiter_bytes(),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+    except httpx.HTTPError as e:
+        if entry is None:
+            raise
+        logger.warning(
+            "Using the cached copy of %s, revalidation failed: %s", pdf_url, e
+        )
+        return cache.object_path(entry["sha256"])
+
+    stats.record("download", entry["size"], started)
+    return cache.object_path(entry["sha256"])
 
 
 @asynccontextmanager
-async def downloaded_pdf(pdf_url: str):
+async def downloaded_pdf(
+    pdf_url: str,
+    client: httpx.AsyncClient | None = None,
+    spool_max_size: int | None = None,
+    stats: DownloadStats | None = None,
+    pdf_cache: PDFCache | None = None,
+):
     """
     Asynchronous context manager for downloading a PDF into a temporary file
     and dispose it automatically
+
+    When `spool_max_size` is given, the response body is streamed into an in-memory
+    buffer instead, which only spills to disk once it grows beyond `spool_max_size`
+    bytes, and the open buffer is yielded in place of a file name.
+
+    With a `pdf_cache`, the PDF is read from the cache and only downloaded on a miss,
+    see `cached_pdf`. The cached file is yielded, or opened when `spool_max_size` is
+    given, and kept after usage. It is not evicted while yielded.
+
+    Args:
+        pdf_url (str): URL of the PDF to download.
+        client (httpx.AsyncClient | None): Pooled client to download with. A new
+            client is created for this download when omitted.
+        spool_max_size (int | None): Size above which the in-memory buffer spills to
+            disk. The PDF is written to a named temporary file when omitted.
+        stats (DownloadStats | None): Receives the bytes copied and time per stage.
+        pdf_cache (PDFCache | None): Local cache of the raw PDFs.
     """
+    stats = stats or DownloadStats(pdf_url)
+
+    async with AsyncExitStack() as stack:
+        if client is None:
+            client = await stack.enter_async_context(httpx.AsyncClient())
+
+        if pdf_cache is not None:
+            pdf_path = await cached_pdf(client, pdf_cache, pdf_url, stats)
+            stack.enter_context(pdf_cache.in_use(pdf_path))
+            if spool_max_size is not None:
+                yield stack.enter_context(open(pdf_path, "rb"))
+            else:
+                yield pdf_path
+            return
 
-    async with httpx.AsyncClient() as client:
         logger.info("Downloading PDF from %s", pdf_url)
+        started = time.perf_counter()
+
+        if spool_max_size is not None:
+            buffer = stack.enter_context(
+                tempfile.SpooledTemporaryFile(max_size=spool_max_size)
+            )
+            async with client.stream("GET", pdf_url, timeout=500) as response:
+                async for chunk in response.aiter_bytes():
+                    buffer.write(chunk)
+            stats.record("download", buffer.tell(), started)
+            buffer.seek(0)
+
+            yield buffer
+            return
+
         response = await client.get(pdf_url, timeout=500)
+        stats.record("download", len(response.content), started)
 
         # Create a temporary file for storing the PDF
+        started = time.perf_counter()
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
         with open(temp_file.name, "wb") as fh:
             fh.write(response.content)
+        stats.record("write", len(response.content), started)
 
         try:
             # Yield the temp file for storing PDF
@@ -279,32 +658,164 @@ async def downloaded_pdf(pdf_url: str):
             os.remove(temp_file.name)
 
 
+async def download_and_parse(
+    parser: CropPricesPDFParser,
+    pdf_url: str,
+    filename: str,
+    executor: Executor | None = None,
+    client: httpx.AsyncClient | None = None,
+    spool_max_size: int | None = None,
+    pdf_cache: PDFCache | None = None,
+) -> pd.DataFrame:
+    """
+    Download a single PDF and parse it into a DataFrame.
+
+    When an `executor` is given, the CPU-bound parsing runs there (typically a
+    `ProcessPoolExecutor`) so the event loop stays free for downloads and DB writes.
+    An in-memory download (see `downloaded_pdf`) cannot be shared with another
+    process, so its bytes are sent to the executor instead. The bytes copied and
+    time spent per stage are logged once the PDF is parsed.
+    """
+    stats = DownloadStats(pdf_url)
+
+    async with downloaded_pdf(
+        pdf_url, client, spool_max_size, stats, pdf_cache
+    ) as pdf_file:
+        started = time.perf_counter()
+        if executor is None:
+            df = parser.parse_dataframe(
+                downloaded_file_path=pdf_file, source_file_path=filename
+            )
+        else:
+            if not isinstance(pdf_file, str):
+                pdf_file = pdf_file.read()
+                stats.record("transfer", len(pdf_file), started)
+                started = time.perf_counter()
+
+            loop = asyncio.get_running_loop()
+            df = await loop.run_in_executor(
+                executor, parser.parse_dataframe, pdf_file, filename
+            )
+        stats.record("parse", 0, started)
+
+    logger.info("Handled PDF %s: %s", pdf_url, stats)
+    return df
+
+
+def source_filename(source_url: str) -> str:
+    """Recover the file name a bulletin was parsed with from its stored URL."""
+    return urllib.parse.unquote(source_url).rsplit("/", 1)[-1]
+
+
+def is_already_ingested(
+    parser: CropPricesPDFParser,
+    url: str,
+    filename: str,
+    skip_urls: Set[str] | None,
+    since: date | None,
+) -> bool:
+    """
+    Tell whether a PDF link points to a bulletin that is already in the database.
+
+    A link counts as ingested when its URL is in `skip_urls` or the date in its file
+    name is before the `since` high-water mark. Links without a recognizable date are
+    never considered ingested by date.
+    """
+    pdf_url = urllib.parse.quote(f"{url}{filename}", safe=":/,")
+    if skip_urls and pdf_url in skip_urls:
+        return True
+    if since is None:
+        return False
+
+    try:
+        published = pd.to_datetime(
+            parser.extract_date_from_file_path(filename), format="%d %B %Y"
+        ).date()
+    except ValueError:
+        return False
+    return published < since
+
+
 async def parsed_dataframes_stream(
-    parser: CropPricesPDFParser, base_url: str, skip_urls: Set[str] | None = None
+    parser: CropPricesPDFParser,
+    base_url: str,
+    skip_urls: Set[str] | None = None,
+    concurrency: int = 1,
+    executor: Executor | None = None,
+    incremental: bool = False,
+    since: date | None = None,
+    spool_max_size: int | None = None,
+    pdf_cache: PDFCache | None = None,
 ) -> AsyncGenerator[Tuple[str, pd.DataFrame], None]:
     """
-    Asynchronous context manager for downloading multiple PDFs and extract data
+    Asynchronous generator for downloading multiple PDFs and extract data.
+
+    Up to `concurrency` PDFs are downloaded and parsed at the same time. Results are
+    yielded in the order the links appear on the listing pages, and no new download is
+    scheduled until the oldest one has been consumed, so at most `concurrency` parsed
+    documents are held in memory at any time. Parsing is offloaded to `executor`
+    when one is given.
+
+    In `incremental` mode the listing pages are fetched one at a time and paging stops
+    after the first page whose PDFs are all either in `skip_urls` or dated before
+    `since`. New bulletins are published on the first page, so an up to date database
+    only needs one or two listing requests.
+
+    PDFs are downloaded into memory when `spool_max_size` is given, and read from
+    `pdf_cache` when they are cached there, see `downloaded_pdf`.
     """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+    paginator = Paginator(
+        base_url=base_url, concurrency=1 if incremental else concurrency
+    )
+    pending: Deque[Tuple[str, asyncio.Task]] = deque()
+
+    try:
+        # A single pooled client serves both the listing pages and the PDF downloads
+        async with httpx.AsyncClient(timeout=500) as client, aclosing(
+            paginator.iter_pages(client)
+        ) as pages:
+            async for page_url, pdf_links in pages:
+                if incremental and all(
+                    is_already_ingested(parser, url, filename, skip_urls, since)
+                    for url, filename in pdf_links
+                ):
+                    logger.info("No new bulletins on %s, stop paging.", page_url)
+                    break
 
-    paginator = Paginator(base_url=base_url)
-
-    async with httpx.AsyncClient() as client:
-        async for page in paginator:
-            response = await client.get(page)
-            soup = BeautifulSoup(response.text, "html.parser")
-            links = soup.find_all("a", href=True)
-
-            # Filter PDF links from the page
-            pdf_links = paginator.filter_pdf_links(links)
-
-            for url, filename in pdf_links:
-                pdf_url = urllib.parse.quote(f"{url}{filename}", safe=":/,")
-                if (skip_urls) and (pdf_url in skip_urls):
-                    logger.info("URL %s already downloaded, skipping.", pdf_url)
-                    continue
-                async with downloaded_pdf(pdf_url) as pdf_file:
-                    # Extract content
-                    df = parser.parse_dataframe(
-                        downloaded_file_path=pdf_file, source_file_path=filename
+                for url, filename in pdf_links:
+                    pdf_url = urllib.parse.quote(f"{url}{filename}", safe=":/,")
+                    if (skip_urls) and (pdf_url in skip_urls):
+                        logger.info("URL %s already downloaded, skipping.", pdf_url)
+                        continue
+
+                    task = asyncio.create_task(
+                        download_and_parse(
+                            parser,
+                            pdf_url,
+                            filename,
+                            executor,
+                            client,
+                            spool_max_size,
+                            pdf_cache,
+                        )
                     )
-                    yield pdf_url, df
+                    pending.append((pdf_url, task))
+
+                    # Backpressure: wait for the oldest download once the window is full
+                    if len(pending) >= concurrency:
+                        source_url, oldest = pending.popleft()
+                        yield source_url, await oldest
+
+            # Drain the downloads still in flight
+            while pending:
+                source_url, oldest = pending.popleft()
+                yield source_url, await oldest
+    finally:
+        # Cancel in-flight downloads if the consumer stops early or an error occurs
+        for _, task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
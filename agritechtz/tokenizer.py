@@ -0,0 +1,121 @@
+"""Linear-time tokenizer for the regional price rows of the bulletins"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from agritechtz.constants import PRICE_CELL, REGION_KEYWORDS
+
+# Runs of digits are split from adjacent letters, as page texts are joined without a
+# separator and the last price of a page can stick to the region starting the next one
+LEXEME_PATTERN = re.compile(r"\d[\d,.]*|[^\s\d]+")
+
+PRICE_TOKEN = re.compile(PRICE_CELL, re.IGNORECASE)
+DISTRICT_TOKEN = re.compile(r"[\w/]+")
+
+
+class RowTokenizer:
+    """Read region, district and price cells from bulletin text with a state machine.
+
+    The text is split into tokens once and each token is visited a bounded number of
+    times, so parsing time grows linearly with the text size, unlike the backtracking
+    of `REGIONAL_PATTERN` on malformed rows. A row is a region keyword, one or more
+    district words and `price_columns` price cells. Rows with fewer price cells are
+    skipped.
+    """
+
+    def __init__(
+        self, regions: Iterable[str] = REGION_KEYWORDS, price_columns: int = 16
+    ):
+        """Initialize the tokenizer.
+
+        Args:
+            regions (Iterable[str]): Region keywords starting a row, matched ignoring
+                case. Keywords can span several words.
+            price_columns (int): Number of price cells following the district.
+        """
+        self.price_columns = price_columns
+        # Keywords by their first word, longest first so "Dar es salaam" wins
+        self._regions: Dict[str, List[Tuple[str, ...]]] = {}
+        for region in regions:
+            words = tuple(region.lower().split())
+            self._regions.setdefault(words[0], []).append(words)
+        for candidates in self._regions.values():
+            candidates.sort(key=len, reverse=True)
+
+    def region_width(self, tokens: List[str], position: int) -> int:
+        """Return how many tokens the region keyword at `position` spans, 0 if none."""
+        for words in self._regions.get(tokens[position].lower(), ()):
+            end = position + len(words)
+            if tuple(token.lower() for token in tokens[position:end]) == words:
+                return len(words)
+        return 0
+
+    def rows(self, text: str) -> List[Tuple[str, ...]]:
+        """Extract the rows of the text.
+
+        Args:
+            text (str): The extracted text content from the PDF document.
+
+        Returns:
+            List[Tuple[str, ...]]: Rows shaped like the groups of `REGIONAL_PATTERN`,
+            the region and district followed by the price cells.
+        """
+        return [row for row, _ in self.iter_rows(text)]
+
+    def iter_rows(self, text: str) -> Iterator[Tuple[Tuple[str, ...], int]]:
+        """Yield the rows of the text along with the offset right after each row."""
+        lexemes = list(LEXEME_PATTERN.finditer(text))
+        for row, end in self.scan([lexeme.group() for lexeme in lexemes]):
+            yield row, lexemes[end - 1].end()
+
+    def scan(self, tokens: List[str]) -> List[Tuple[Tuple[str, ...], int]]:
+        """Extract the rows of a token list.
+
+        Returns:
+            List[Tuple[Tuple[str, ...], int]]: The rows along with the position right
+            after each row in the token list.
+        """
+        rows = []
+        position = 0
+        total = len(tokens)
+
+        while position < total:
+            # State 1: look for a region keyword
+            width = self.region_width(tokens, position)
+            if not width:
+                position += 1
+                continue
+
+            # State 2: read the district words
+            district_start = cursor = position + width
+            while (
+                cursor < total
+                and DISTRICT_TOKEN.fullmatch(tokens[cursor])
+                and not PRICE_TOKEN.fullmatch(tokens[cursor])
+            ):
+                cursor += 1
+            prices_start = cursor
+
+            # State 3: read the price cells
+            while (
+                cursor < total
+                and cursor - prices_start < self.price_columns
+                and PRICE_TOKEN.fullmatch(tokens[cursor])
+            ):
+                cursor += 1
+
+            if prices_start > district_start and (
+                cursor - prices_start == self.price_columns
+            ):
+                row = (
+                    " ".join(tokens[position:district_start]),
+                    " ".join(tokens[district_start:prices_start]),
+                    *tokens[prices_start:cursor],
+                )
+                rows.append((row, cursor))
+
+            # A region keyword among the skipped tokens would run into the same cells,
+            # so scanning resumes after them and every token is read once
+            position = cursor
+
+        return rows
@@ -2,6 +2,7 @@
 
 import re
 import math
+from decimal import Decimal
 
 
 # Function to convert camelCase to snake_case
@@ -22,3 +23,10 @@ def sanitize_data(data):
     if math.isnan(float(data)):
         return None
     return data
+
+
+def to_decimal(value) -> Decimal | None:
+    """Convert a parsed price into a `Decimal`, mapping missing values to None."""
+    if value is None or sanitize_data(value) is None:
+        return None
+    return Decimal(str(value))
@@ -1,82 +1,538 @@
 """Module for the tasks"""
 
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Deque, Dict, Iterator, List, Literal, Set, Tuple
+
 import pandas as pd
-from sqlalchemy import select
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from agritechtz.cache_config import get_pdf_cache, get_redis_client, get_result_cache
+from agritechtz.constants import BASE_URL, CROPS
+from agritechtz.database import acquire_session
+from agritechtz.exports import write_snapshot
+from agritechtz.latest_prices import publish_ingest
 from agritechtz.logger import logger
-from agritechtz.models import CropPrice
+from agritechtz.models import CropPrice, Document
+from agritechtz.partitions import ensure_partitions
+from agritechtz.pdf_cache import PDFCache
+from agritechtz.result_cache import QueryResultCache
+from agritechtz.rollups import refresh_rollups
+from agritechtz.settings import get_settings
 from agritechtz.utils import camel_to_snake
-from agritechtz.streamed_scrapper import CropPricesPDFParser, parsed_dataframes_stream
-from agritechtz.utils import sanitize_data
+from agritechtz.streamed_scrapper import (
+    CropPricesPDFParser,
+    parsed_dataframes_stream,
+    source_filename,
+)
+from agritechtz.utils import to_decimal
+
+
+WriteMode = Literal["orm", "bulk"]
+ConflictAction = Literal["nothing", "update"]
+
+PRIMARY_KEY = ["ts", "region", "district", "crop"]
+
+
+def parser_processes(workers: int | None) -> int:
+    """Return the number of parser processes, one per core when `workers` is None."""
+    if workers is None:
+        return os.cpu_count() or 1
+    return max(workers, 0)
+
+
+@contextmanager
+def parser_executor(workers: int | None) -> Iterator[Executor | None]:
+    """Yield a pool of parser processes, or None to parse on the event loop.
+
+    Shared by every entry point, so `workers` means the same everywhere: None starts
+    one process per core and 0 parses inline. Pending parses are cancelled when the
+    block exits.
+    """
+    workers = parser_processes(workers)
+    if workers == 0:
+        yield None
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        yield executor
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def collect_learned_aliases(
+    source_url: str, df: pd.DataFrame, learned_aliases: Dict[str, str] | None
+):
+    """Log the region spellings first corrected in a bulletin and collect them."""
+    learned = df.attrs.get("learned_aliases")
+    if not learned:
+        return
+
+    logger.info("Learned region aliases from %s: %s", source_url, learned)
+    if learned_aliases is not None:
+        learned_aliases.update(learned)
+
+
+def dataframe_to_records(source_url: str, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a parsed bulletin into rows of the `cn_crop_prices` table.
+
+    Args:
+        source_url (str): URL the bulletin was downloaded from.
+        df (pd.DataFrame): Parsed bulletin with snake case columns and a `ts` column.
+
+    Returns:
+        List[Dict[str, Any]]: One mapping per district and crop with a reported price.
+    """
+    records = []
+
+    for row in df.to_dict(orient="records"):
+        for crop in CROPS:
+            min_price = to_decimal(row.get(f"{crop}_min", None))
+            max_price = to_decimal(row.get(f"{crop}_max", None))
+            if min_price is None and max_price is None:
+                continue
+
+            records.append(
+                {
+                    "ts": row["ts"],
+                    "region": row["region"],
+                    "district": row["district"],
+                    "crop": crop,
+                    "source_url": source_url,
+                    "min_price": min_price,
+                    "max_price": max_price,
+                }
+            )
+
+    return records
+
+
+async def save_records_orm(session: AsyncSession, records: List[Dict[str, Any]]):
+    """Save the records through the ORM unit of work, one object per row."""
+    session.add_all(CropPrice(**record) for record in records)
+    await session.commit()
+
+
+async def save_records_bulk(
+    session: AsyncSession,
+    records: List[Dict[str, Any]],
+    batch_size: int = 1000,
+    on_conflict: ConflictAction = "nothing",
+):
+    """Save the records with multi-row `INSERT ... ON CONFLICT` statements.
+
+    The rows bypass the ORM unit of work and are sent `batch_size` at a time. Rows that
+    already exist are either left untouched (`nothing`) or get their prices replaced
+    (`update`), so a partially ingested bulletin no longer aborts the run.
+
+    Args:
+        session (AsyncSession): Database session used for the inserts.
+        records (List[Dict[str, Any]]): Rows of the `cn_crop_prices` table.
+        batch_size (int): Number of rows per INSERT statement.
+        on_conflict (ConflictAction): What to do with rows whose primary key exists.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+
+    # A single statement cannot touch the same row twice, keep the last duplicate
+    unique_records = list(
+        {
+            tuple(record[key] for key in PRIMARY_KEY): record for record in records
+        }.values()
+    )
+
+    for start in range(0, len(unique_records), batch_size):
+        statement = insert(CropPrice).values(unique_records[start : start + batch_size])
+        if on_conflict == "update":
+            statement = statement.on_conflict_do_update(
+                index_elements=PRIMARY_KEY,
+                set_={
+                    "source_url": statement.excluded.source_url,
+                    "min_price": statement.excluded.min_price,
+                    "max_price": statement.excluded.max_price,
+                },
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=PRIMARY_KEY)
+        await session.execute(statement)
+
+    await session.commit()
+
+
+async def record_document(
+    session: AsyncSession,
+    source_url: str,
+    parser_version: str,
+    row_count: int,
+    sha256: str | None = None,
+):
+    """Record an ingested bulletin along with the parser version it was parsed with.
+
+    The statement joins the current transaction, so it is committed together with
+    the rows of the bulletin.
+    """
+    statement = insert(Document).values(
+        source_url=source_url,
+        sha256=sha256,
+        parser_version=parser_version,
+        row_count=row_count,
+        ingested_at=func.now(),
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["source_url"],
+        set_={
+            "sha256": func.coalesce(statement.excluded.sha256, Document.sha256),
+            "parser_version": statement.excluded.parser_version,
+            "row_count": statement.excluded.row_count,
+            "ingested_at": statement.excluded.ingested_at,
+        },
+    )
+    await session.execute(statement)
 
 
 async def download_daily_updates(
     base_url: str,
     session: AsyncSession,
     parser: CropPricesPDFParser,
-):
-    """Download daily crop prices from the source and save to the database."""
+    concurrency: int = 1,
+    executor: Executor | None = None,
+    full_crawl: bool = False,
+    write_mode: WriteMode = "bulk",
+    batch_size: int = 1000,
+    on_conflict: ConflictAction = "nothing",
+    result_cache: QueryResultCache | None = None,
+    spool_max_size: int | None = None,
+    pdf_cache: PDFCache | None = None,
+    ingested_dates: Set[date] | None = None,
+    learned_aliases: Dict[str, str] | None = None,
+) -> Set[date]:
+    """Download daily crop prices from the source and save to the database.
+
+    Args:
+        base_url (str): Listing URL of the crop prices bulletins.
+        session (AsyncSession): Database session used to store the prices.
+        parser (CropPricesPDFParser): Parser used to convert PDFs into DataFrames.
+        concurrency (int): Maximum number of PDFs downloaded and parsed at once.
+        executor (Executor | None): Executor used for parsing PDFs, e.g. a process pool.
+            Parsing runs on the event loop when omitted.
+        full_crawl (bool): Walk every listing page instead of stopping at the first page
+            without new bulletins.
+        write_mode (WriteMode): `bulk` for multi-row upserts, `orm` for the ORM path.
+        batch_size (int): Number of rows per INSERT statement in `bulk` mode.
+        on_conflict (ConflictAction): How `bulk` mode handles rows that already exist.
+        result_cache (QueryResultCache | None): Cache of API responses invalidated
+            after every committed bulletin.
+        spool_max_size (int | None): Download PDFs into memory, spilling to disk above
+            this size. PDFs are written to temporary files when omitted.
+        pdf_cache (PDFCache | None): Local cache of the raw PDFs, consulted before
+            downloading them.
+        ingested_dates (Set[date] | None): Collects the dates of the committed
+            bulletins, still filled when a later bulletin fails.
+        learned_aliases (Dict[str, str] | None): Collects the region spellings
+            corrected by the fuzzy matching, e.g. to add them to `REGION_ALIASES`.
+
+    Returns:
+        Set[date]: Dates of the prices saved, e.g. to refresh their rollups.
+    """
+    if ingested_dates is None:
+        ingested_dates = set()
 
     try:
         # Retrieve the last page downloaded
         # Retrieve all downloaded URLs to avoid re-downloading
-        downloaded_urls_result = await session.execute(select(CropPrice.source_url))
+        downloaded_urls_result = await session.execute(select(Document.source_url))
         downloaded_urls = {url for url, in downloaded_urls_result.fetchall()}
 
+        # High-water mark of the ingested bulletins, used to stop paging early
+        latest_ts = None
+        if not full_crawl:
+            latest_ts = await session.scalar(select(func.max(CropPrice.ts)))
+
         async for source_url, df in parsed_dataframes_stream(
-            parser=parser, base_url=base_url, skip_urls=downloaded_urls
+            parser=parser,
+            base_url=base_url,
+            skip_urls=downloaded_urls,
+            concurrency=concurrency,
+            executor=executor,
+            incremental=not full_crawl,
+            since=latest_ts,
+            spool_max_size=spool_max_size,
+            pdf_cache=pdf_cache,
         ):
 
+            collect_learned_aliases(source_url, df, learned_aliases)
             df.columns = [camel_to_snake(column) for column in df.columns]
             df = df.rename(columns={"date": "ts"})
+            records = dataframe_to_records(source_url, df) if not df.empty else []
+
+            cached = pdf_cache.lookup(source_url) if pdf_cache is not None else None
+            await record_document(
+                session,
+                source_url,
+                parser.version,
+                len(records),
+                sha256=cached["sha256"] if cached else None,
+            )
+
             if df.empty:
+                # Recorded all the same, so the bulletin is not downloaded again
                 logger.info("No new data to download.")
+                await session.commit()
                 continue
 
-            logger.debug("DataFrame: %s", df)
-
-            # `CropPrice` is the SQLAlchemy model with crop prices stored in a JSON field
-            crop_price_instances = []
-
-            for row in df.to_dict(orient="records"):
-                # Prepare the `crop_prices` dictionary with crop data
-                crop_prices = [
-                    {
-                        "name": crop,
-                        "min": sanitize_data(row.get(f"{crop}_min", None)),
-                        "max": sanitize_data(row.get(f"{crop}_max", None)),
-                    }
-                    for crop in [
-                        "maize",
-                        "rice",
-                        "beans",
-                        "sorghum_millet",
-                        "bulrush_millet",
-                        "finger_millet",
-                        "wheat",
-                        "irish_potato",
-                    ]
-                    if pd.notnull(row.get(f"{crop}_min"))
-                    or pd.notnull(row.get(f"{crop}_max"))
-                ]
-
-                # Create an instance of `CropPrice` for each row
-                crop_price_instance = CropPrice(
-                    source_url=source_url,
-                    ts=row["ts"],
-                    region=row["region"],
-                    district=row["district"],
-                    crop_prices=crop_prices,
+            # Rendering the whole DataFrame would cost more than parsing it
+            logger.debug("Parsed %s into %d rows x %d columns", source_url, *df.shape)
+
+            days = {pd.Timestamp(record["ts"]).date() for record in records}
+            await ensure_partitions(session, days)
+            if write_mode == "orm":
+                await save_records_orm(session, records)
+            else:
+                await save_records_bulk(
+                    session, records, batch_size=batch_size, on_conflict=on_conflict
                 )
+            ingested_dates.update(days)
 
-                crop_price_instances.append(crop_price_instance)
-
-            session.add_all(crop_price_instances)
-            # Commit transaction
-            await session.commit()
+            if result_cache is not None:
+                await result_cache.invalidate()
 
     except Exception as e:
         await session.rollback()
         logger.exception("An error occurred during the download and insert process.")
         raise e
+
+    return ingested_dates
+
+
+async def ingest_and_publish(
+    executor: Executor | None = None,
+    full_crawl: bool = False,
+    learned_aliases: Dict[str, str] | None = None,
+) -> Set[date]:
+    """Ingest the new bulletins and publish them to the API and the exports.
+
+    Args:
+        executor (Executor | None): Executor used for parsing PDFs, e.g. a process pool.
+        full_crawl (bool): Walk every listing page instead of stopping at the first page
+            without new bulletins.
+        learned_aliases (Dict[str, str] | None): Collects the region spellings
+            corrected by the fuzzy matching.
+
+    Returns:
+        Set[date]: Dates of the prices saved.
+    """
+    settings = get_settings()
+    result_cache = get_result_cache()
+
+    async with acquire_session() as session:
+        ingested_dates: Set[date] = set()
+        try:
+            await download_daily_updates(
+                base_url=BASE_URL,
+                session=session,
+                parser=CropPricesPDFParser(
+                    engine=settings.parser_engine, streaming=settings.parser_streaming
+                ),
+                concurrency=settings.scraper_concurrency,
+                executor=executor,
+                full_crawl=full_crawl,
+                batch_size=settings.ingest_batch_size,
+                spool_max_size=settings.pdf_spool_max_bytes or None,
+                pdf_cache=get_pdf_cache(),
+                result_cache=result_cache,
+                ingested_dates=ingested_dates,
+                learned_aliases=learned_aliases,
+            )
+        finally:
+            # Only the rollup buckets holding the new bulletins are recomputed, also
+            # those committed before a failing bulletin
+            if ingested_dates:
+                await refresh_rollups(session, ingested_dates)
+                await result_cache.invalidate()
+                await publish_ingest(get_redis_client())
+
+    # Also written on the first run, the snapshot is skipped when it is current. It is
+    # read from the primary, a lagging replica would publish the previous prices
+    # under a snapshot taken after the ingestion
+    if settings.export_dir:
+        async with acquire_session() as session:
+            await write_snapshot(session, settings.export_dir, settings.export_keep)
+
+    return ingested_dates
+
+
+def comparable_rows(records: List[Dict[str, Any]]) -> set:
+    """Reduce rows of the `cn_crop_prices` table to comparable tuples."""
+    return {
+        (
+            record["ts"].date() if isinstance(record["ts"], datetime) else record["ts"],
+            record["region"],
+            record["district"],
+            record["crop"],
+            record["min_price"],
+            record["max_price"],
+        )
+        for record in records
+    }
+
+
+async def reparse_documents(
+    session: AsyncSession,
+    parser: CropPricesPDFParser,
+    pdf_cache: PDFCache,
+    executor: Executor | None = None,
+    concurrency: int = 1,
+    batch_size: int = 1000,
+    result_cache: QueryResultCache | None = None,
+    everything: bool = False,
+    learned_aliases: Dict[str, str] | None = None,
+) -> Dict[str, int]:
+    """Re-parse ingested bulletins from their cached PDFs with the current parser.
+
+    Only the bulletins recorded with another parser version are re-parsed, unless
+    `everything` is set. The rows of a bulletin are replaced only when the parser now
+    reads different rows; otherwise just its parser version is updated. Rows whose
+    key was saved from another bulletin of the same day are left to that bulletin.
+
+    Args:
+        session (AsyncSession): Database session used to store the prices.
+        parser (CropPricesPDFParser): Parser used to convert PDFs into DataFrames.
+        pdf_cache (PDFCache): Local cache holding the raw PDFs.
+        executor (Executor | None): Executor used for parsing PDFs, e.g. a process pool.
+            Parsing runs on the event loop when omitted.
+        concurrency (int): Maximum number of PDFs parsed at once.
+        batch_size (int): Number of rows per INSERT statement.
+        result_cache (QueryResultCache | None): Cache of API responses invalidated
+            after every changed bulletin.
+        everything (bool): Re-parse every bulletin, whatever its parser version.
+        learned_aliases (Dict[str, str] | None): Collects the region spellings
+            corrected by the fuzzy matching, e.g. to add them to `REGION_ALIASES`.
+
+    Returns:
+        Dict[str, int]: Number of bulletins `changed`, `unchanged` and `missing` from
+        the cache.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+    query = select(Document.source_url).order_by(Document.source_url)
+    if not everything:
+        query = query.where(
+            or_(
+                Document.parser_version.is_(None),
+                Document.parser_version != parser.version,
+            )
+        )
+    source_urls = (await session.scalars(query)).all()
+    logger.info(
+        "Re-parsing %d bulletins with parser %s", len(source_urls), parser.version
+    )
+
+    loop = asyncio.get_running_loop()
+    counts = {"changed": 0, "unchanged": 0, "missing": 0}
+
+    async def parse(source_url: str, pdf_path: str) -> pd.DataFrame:
+        filename = source_filename(source_url)
+        with pdf_cache.in_use(pdf_path):
+            if executor is None:
+                return parser.parse_dataframe(pdf_path, filename)
+            return await loop.run_in_executor(
+                executor, parser.parse_dataframe, pdf_path, filename
+            )
+
+    async def save(source_url: str, sha256: str, df: pd.DataFrame):
+        collect_learned_aliases(source_url, df, learned_aliases)
+        df.columns = [camel_to_snake(column) for column in df.columns]
+        df = df.rename(columns={"date": "ts"})
+        records = dataframe_to_records(source_url, df) if not df.empty else []
+        days = {pd.Timestamp(record["ts"]).date() for record in records}
+
+        rows = (
+            await session.execute(
+                select(
+                    CropPrice.source_url,
+                    CropPrice.ts,
+                    CropPrice.region,
+                    CropPrice.district,
+                    CropPrice.crop,
+                    CropPrice.min_price,
+                    CropPrice.max_price,
+                ).where(or_(CropPrice.source_url == source_url, CropPrice.ts.in_(days)))
+            )
+        ).all()
+        stored = {tuple(row[1:]) for row in rows if row[0] == source_url}
+
+        # Keys saved from another bulletin of the same day stay with it, as during
+        # the ingestion, so they are neither compared nor inserted again
+        taken = {tuple(row[1:5]) for row in rows if row[0] != source_url}
+        records = [
+            record
+            for record in records
+            if (
+                pd.Timestamp(record["ts"]).date(),
+                record["region"],
+                record["district"],
+                record["crop"],
+            )
+            not in taken
+        ]
+        changed = comparable_rows(records) != stored
+
+        await record_document(
+            session, source_url, parser.version, len(records), sha256=sha256
+        )
+        if not changed:
+            counts["unchanged"] += 1
+            await session.commit()
+            return
+
+        counts["changed"] += 1
+        await ensure_partitions(session, days)
+        await session.execute(
+            delete(CropPrice).where(CropPrice.source_url == source_url)
+        )
+        # Commits the deletion and the new rows together
+        await save_records_bulk(session, records, batch_size=batch_size)
+        if result_cache is not None:
+            await result_cache.invalidate()
+
+    pending: Deque[Tuple[str, str, asyncio.Task]] = deque()
+    try:
+        for source_url in source_urls:
+            entry = pdf_cache.lookup(source_url)
+            if entry is None:
+                logger.warning("No cached PDF for %s, skipping it", source_url)
+                counts["missing"] += 1
+                continue
+
+            pdf_path = pdf_cache.object_path(entry["sha256"])
+            task = asyncio.create_task(parse(source_url, pdf_path))
+            pending.append((source_url, entry["sha256"], task))
+
+            # Parse up to `concurrency` PDFs ahead of the writes, in order
+            if len(pending) >= concurrency:
+                source_url, sha256, task = pending.popleft()
+                await save(source_url, sha256, await task)
+
+        while pending:
+            source_url, sha256, task = pending.popleft()
+            await save(source_url, sha256, await task)
+    except Exception:
+        await session.rollback()
+        logger.exception("An error occurred while re-parsing the bulletins.")
+        raise
+    finally:
+        for *_, task in pending:
+            task.cancel()
+        # Waits for the cancelled parses, so no task or executor future is left behind
+        await asyncio.gather(*(task for *_, task in pending), return_exceptions=True)
+
+    logger.info("Re-parsed bulletins: %s", counts)
+    return counts
@@ -0,0 +1,25 @@
+"""create index on the ingestion time of the documents
+
+Revision ID: 0b6e4f8a2d91
+Revises: f5b7d2a9c318
+Create Date: 2026-10-17 18:11:53.276034
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0b6e4f8a2d91"
+down_revision: Union[str, None] = "f5b7d2a9c318"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_cn_documents_ingested_at", "cn_documents", ["ingested_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cn_documents_ingested_at", table_name="cn_documents")
@@ -0,0 +1,95 @@
+"""normalize cn_crop_prices into one row per crop
+
+Revision ID: 5b1f7c2e9a41
+Revises: d24b3fe6968a
+Create Date: 2026-10-17 09:12:41.218304
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "5b1f7c2e9a41"
+down_revision: Union[str, None] = "d24b3fe6968a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the JSON table around until its rows have been copied
+    op.rename_table("cn_crop_prices", "cn_crop_prices_json")
+    op.execute("ALTER INDEX cn_crop_prices_pkey RENAME TO cn_crop_prices_json_pkey")
+
+    op.create_table(
+        "cn_crop_prices",
+        sa.Column("ts", sa.Date(), nullable=False),
+        sa.Column("region", sa.String(), nullable=False),
+        sa.Column("district", sa.String(), nullable=False),
+        sa.Column("crop", sa.String(), nullable=False),
+        sa.Column("source_url", sa.String(), nullable=False),
+        sa.Column("min_price", sa.Numeric(12, 2), nullable=True),
+        sa.Column("max_price", sa.Numeric(12, 2), nullable=True),
+        sa.PrimaryKeyConstraint("ts", "region", "district", "crop"),
+    )
+
+    # Unnest the JSON array. When a day was published twice the first uploaded
+    # bulletin wins, uploads being ordered by the Unix time in their file names,
+    # `sw-<time>-Wholesale...`. Other names come last, by URL
+    op.execute(
+        """
+        INSERT INTO cn_crop_prices
+            (ts, region, district, crop, source_url, min_price, max_price)
+        SELECT p.ts, p.region, p.district, e.value ->> 'name', p.source_url,
+               (e.value ->> 'min')::numeric, (e.value ->> 'max')::numeric
+        FROM cn_crop_prices_json AS p
+        CROSS JOIN LATERAL json_array_elements(p.crop_prices) AS e
+        WHERE e.value ->> 'name' IS NOT NULL
+        ORDER BY substring(p.source_url from '/sw-([0-9]+)-')::bigint NULLS LAST,
+                 p.source_url
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+    op.create_index("ix_cn_crop_prices_source_url", "cn_crop_prices", ["source_url"])
+    op.create_index("ix_cn_crop_prices_crop_ts", "cn_crop_prices", ["crop", "ts"])
+    op.create_index(
+        "ix_cn_crop_prices_region_district_ts",
+        "cn_crop_prices",
+        ["region", "district", "ts"],
+    )
+
+    op.drop_table("cn_crop_prices_json")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "cn_crop_prices_json",
+        sa.Column("source_url", sa.String(), nullable=False),
+        sa.Column("ts", sa.Date(), nullable=False),
+        sa.Column("region", sa.String(), nullable=False),
+        sa.Column("district", sa.String(), nullable=False),
+        sa.Column("crop_prices", sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "source_url", "ts", "region", "district", name="cn_crop_prices_json_pkey"
+        ),
+    )
+
+    op.execute(
+        """
+        INSERT INTO cn_crop_prices_json (source_url, ts, region, district, crop_prices)
+        SELECT source_url, ts, region, district,
+               json_agg(
+                   json_build_object('name', crop, 'min', min_price, 'max', max_price)
+                   ORDER BY crop
+               )
+        FROM cn_crop_prices
+        GROUP BY source_url, ts, region, district
+        """
+    )
+
+    op.drop_table("cn_crop_prices")
+    op.rename_table("cn_crop_prices_json", "cn_crop_prices")
+    op.execute("ALTER INDEX cn_crop_prices_json_pkey RENAME TO cn_crop_prices_pkey")
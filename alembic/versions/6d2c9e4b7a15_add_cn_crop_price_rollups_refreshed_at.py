@@ -0,0 +1,42 @@
+"""add the refresh time of the crop price rollups
+
+Revision ID: 6d2c9e4b7a15
+Revises: 0b6e4f8a2d91
+Create Date: 2026-10-17 21:04:37.518290
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "6d2c9e4b7a15"
+down_revision: Union[str, None] = "0b6e4f8a2d91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "cn_crop_price_rollups",
+        sa.Column(
+            "refreshed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_cn_crop_price_rollups_refreshed_at",
+        "cn_crop_price_rollups",
+        ["refreshed_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_cn_crop_price_rollups_refreshed_at", table_name="cn_crop_price_rollups"
+    )
+    op.drop_column("cn_crop_price_rollups", "refreshed_at")
@@ -0,0 +1,53 @@
+"""create cn_documents table recording the parser version of each bulletin
+
+Revision ID: 8c3d4e6f1a27
+Revises: 5b1f7c2e9a41
+Create Date: 2026-10-17 11:03:27.540912
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "8c3d4e6f1a27"
+down_revision: Union[str, None] = "5b1f7c2e9a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cn_documents",
+        sa.Column("source_url", sa.String(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=True),
+        sa.Column("parser_version", sa.String(), nullable=True),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "ingested_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("source_url"),
+    )
+    op.create_index(
+        "ix_cn_documents_parser_version", "cn_documents", ["parser_version"]
+    )
+
+    # Bulletins ingested so far have an unknown parser version, so they count as stale
+    op.execute(
+        """
+        INSERT INTO cn_documents (source_url, row_count)
+        SELECT source_url, count(*)
+        FROM cn_crop_prices
+        GROUP BY source_url
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cn_documents_parser_version", table_name="cn_documents")
+    op.drop_table("cn_documents")
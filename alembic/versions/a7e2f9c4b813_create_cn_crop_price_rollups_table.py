@@ -0,0 +1,65 @@
+"""create cn_crop_price_rollups table with day, week and month aggregates
+
+Revision ID: a7e2f9c4b813
+Revises: 8c3d4e6f1a27
+Create Date: 2026-10-17 13:41:09.802117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a7e2f9c4b813"
+down_revision: Union[str, None] = "8c3d4e6f1a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cn_crop_price_rollups",
+        sa.Column("period", sa.String(), nullable=False),
+        sa.Column("bucket", sa.Date(), nullable=False),
+        sa.Column("region", sa.String(), nullable=False),
+        sa.Column("district", sa.String(), nullable=False),
+        sa.Column("crop", sa.String(), nullable=False),
+        sa.Column("min_price_sum", sa.Numeric(18, 2), nullable=True),
+        sa.Column("min_price_count", sa.Integer(), nullable=False),
+        sa.Column("max_price_sum", sa.Numeric(18, 2), nullable=True),
+        sa.Column("max_price_count", sa.Integer(), nullable=False),
+        sa.Column("lowest_min_price", sa.Numeric(12, 2), nullable=True),
+        sa.Column("highest_max_price", sa.Numeric(12, 2), nullable=True),
+        sa.PrimaryKeyConstraint("period", "bucket", "region", "district", "crop"),
+    )
+    op.create_index(
+        "ix_cn_crop_price_rollups_period_crop_bucket",
+        "cn_crop_price_rollups",
+        ["period", "crop", "bucket"],
+    )
+
+    # Aggregate the prices ingested so far, later ingests refresh their own buckets
+    for period in ("day", "week", "month"):
+        op.execute(
+            f"""
+            INSERT INTO cn_crop_price_rollups
+                (period, bucket, region, district, crop,
+                 min_price_sum, min_price_count, max_price_sum, max_price_count,
+                 lowest_min_price, highest_max_price)
+            SELECT '{period}', date_trunc('{period}', ts)::date, region, district, crop,
+                   sum(min_price), count(min_price), sum(max_price), count(max_price),
+                   min(min_price), max(max_price)
+            FROM cn_crop_prices
+            GROUP BY date_trunc('{period}', ts)::date, region, district, crop
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_cn_crop_price_rollups_period_crop_bucket",
+        table_name="cn_crop_price_rollups",
+    )
+    op.drop_table("cn_crop_price_rollups")
@@ -0,0 +1,31 @@
+"""create index serving the latest price of every district and crop
+
+Revision ID: c41d8b2e7f05
+Revises: a7e2f9c4b813
+Create Date: 2026-10-17 15:02:44.318205
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c41d8b2e7f05"
+down_revision: Union[str, None] = "a7e2f9c4b813"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_cn_crop_prices_latest",
+        "cn_crop_prices",
+        ["region", "district", "crop", sa.text("ts DESC")],
+        postgresql_include=["min_price", "max_price"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cn_crop_prices_latest", table_name="cn_crop_prices")
@@ -0,0 +1,127 @@
+"""range partition cn_crop_prices by month with a BRIN index on ts
+
+Revision ID: e93a5c1d6b40
+Revises: c41d8b2e7f05
+Create Date: 2026-10-17 16:20:37.904112
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e93a5c1d6b40"
+down_revision: Union[str, None] = "c41d8b2e7f05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    "ix_cn_crop_prices_source_url",
+    "ix_cn_crop_prices_crop_ts",
+    "ix_cn_crop_prices_region_district_ts",
+    "ix_cn_crop_prices_latest",
+]
+
+
+def create_columns():
+    return [
+        sa.Column("ts", sa.Date(), nullable=False),
+        sa.Column("region", sa.String(), nullable=False),
+        sa.Column("district", sa.String(), nullable=False),
+        sa.Column("crop", sa.String(), nullable=False),
+        sa.Column("source_url", sa.String(), nullable=False),
+        sa.Column("min_price", sa.Numeric(12, 2), nullable=True),
+        sa.Column("max_price", sa.Numeric(12, 2), nullable=True),
+        sa.PrimaryKeyConstraint("ts", "region", "district", "crop"),
+    ]
+
+
+def create_indexes():
+    op.create_index("ix_cn_crop_prices_source_url", "cn_crop_prices", ["source_url"])
+    op.create_index("ix_cn_crop_prices_crop_ts", "cn_crop_prices", ["crop", "ts"])
+    op.create_index(
+        "ix_cn_crop_prices_region_district_ts",
+        "cn_crop_prices",
+        ["region", "district", "ts"],
+    )
+    op.create_index(
+        "ix_cn_crop_prices_latest",
+        "cn_crop_prices",
+        ["region", "district", "crop", sa.text("ts DESC")],
+        postgresql_include=["min_price", "max_price"],
+    )
+
+
+def move_aside():
+    # The old rows are copied from the renamed table, then dropped
+    for index in INDEXES:
+        op.drop_index(index, table_name="cn_crop_prices")
+    op.rename_table("cn_crop_prices", "cn_crop_prices_old")
+    op.execute("ALTER INDEX cn_crop_prices_pkey RENAME TO cn_crop_prices_old_pkey")
+
+
+def copy_back():
+    op.execute(
+        """
+        INSERT INTO cn_crop_prices
+            (ts, region, district, crop, source_url, min_price, max_price)
+        SELECT ts, region, district, crop, source_url, min_price, max_price
+        FROM cn_crop_prices_old
+        """
+    )
+    op.drop_table("cn_crop_prices_old")
+
+
+def upgrade() -> None:
+    move_aside()
+
+    op.create_table(
+        "cn_crop_prices", *create_columns(), postgresql_partition_by="RANGE (ts)"
+    )
+
+    # One partition per month holding prices, later ones are created on ingestion
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', min(ts)),
+                    date_trunc('month', max(ts)),
+                    interval '1 month'
+                )::date
+                FROM cn_crop_prices_old
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF cn_crop_prices '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'cn_crop_prices_y' || to_char(month, 'YYYY"m"MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+            END LOOP;
+        END
+        $$
+        """
+    )
+
+    # Indexes are built once the rows are in place instead of row by row
+    copy_back()
+    create_indexes()
+    op.create_index(
+        "ix_cn_crop_prices_ts_brin", "cn_crop_prices", ["ts"], postgresql_using="brin"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cn_crop_prices_ts_brin", table_name="cn_crop_prices")
+    move_aside()
+
+    op.create_table("cn_crop_prices", *create_columns())
+
+    copy_back()
+    create_indexes()
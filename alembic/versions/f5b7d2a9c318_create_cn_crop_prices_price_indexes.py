@@ -0,0 +1,31 @@
+"""create indexes serving the price thresholds of a crop
+
+Revision ID: f5b7d2a9c318
+Revises: e93a5c1d6b40
+Create Date: 2026-10-17 17:05:12.550871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "f5b7d2a9c318"
+down_revision: Union[str, None] = "e93a5c1d6b40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_cn_crop_prices_crop_min_price", "cn_crop_prices", ["crop", "min_price"]
+    )
+    op.create_index(
+        "ix_cn_crop_prices_crop_max_price", "cn_crop_prices", ["crop", "max_price"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cn_crop_prices_crop_max_price", table_name="cn_crop_prices")
+    op.drop_index("ix_cn_crop_prices_crop_min_price", table_name="cn_crop_prices")
@@ -0,0 +1,86 @@
+"""Benchmark the ORM and bulk ingestion paths of `download_daily_updates`
+
+Synthetic bulletins are written to the database configured by `DATABASE_URL` with
+both write paths and the elapsed time per path is printed. The rows are removed
+afterwards.
+
+Usage:
+    python -m benchmarks.bench_ingest --documents 50 --districts 150 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import delete
+
+from agritechtz.constants import CROPS
+from agritechtz.database import acquire_session
+from agritechtz.models import CropPrice
+from agritechtz.workers import save_records_bulk, save_records_orm
+
+SOURCE_URL_PREFIX = "https://benchmark.invalid/"
+
+
+def synthetic_documents(documents: int, districts: int):
+    """Build `documents` bulletins with one row per district and crop."""
+    for document in range(documents):
+        source_url = f"{SOURCE_URL_PREFIX}{document}.pdf"
+        ts = date(2000, 1, 1) + timedelta(days=document)
+        yield [
+            {
+                "ts": ts,
+                "region": "Benchmark",
+                "district": f"District {district}",
+                "crop": crop,
+                "source_url": source_url,
+                "min_price": Decimal(1000 + district),
+                "max_price": Decimal(2000 + district),
+            }
+            for district in range(districts)
+            for crop in CROPS
+        ]
+
+
+async def cleanup():
+    """Remove the synthetic rows."""
+    async with acquire_session() as session:
+        await session.execute(
+            delete(CropPrice).where(CropPrice.source_url.startswith(SOURCE_URL_PREFIX))
+        )
+        await session.commit()
+
+
+async def run(documents: int, districts: int, batch_size: int):
+    """Time both write paths over the same synthetic bulletins."""
+    results = {}
+
+    for mode in ("orm", "bulk"):
+        await cleanup()
+        async with acquire_session() as session:
+            started = time.perf_counter()
+            for records in synthetic_documents(documents, districts):
+                if mode == "orm":
+                    await save_records_orm(session, records)
+                else:
+                    await save_records_bulk(session, records, batch_size=batch_size)
+            results[mode] = time.perf_counter() - started
+
+    await cleanup()
+
+    rows = documents * districts
+    for mode, elapsed in results.items():
+        print(f"{mode:>4}: {elapsed:8.3f}s  {rows / elapsed:10.0f} rows/s")
+    print(f"speedup: {results['orm'] / results['bulk']:.1f}x")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--documents", type=int, default=50)
+    arg_parser.add_argument("--districts", type=int, default=150)
+    arg_parser.add_argument("--batch-size", type=int, default=1000)
+    args = arg_parser.parse_args()
+
+    asyncio.run(run(args.documents, args.districts, args.batch_size))
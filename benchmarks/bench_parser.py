@@ -0,0 +1,59 @@
+"""Benchmark the regex and tokens engines of `CropPricesPDFParser`
+
+Synthetic bulletin texts of growing size are parsed with both engines and the elapsed
+time per engine is printed. Each text ends with a summary table whose rows have fewer
+than 16 price cells, which is what makes `REGIONAL_PATTERN` backtrack.
+
+Usage:
+    python -m benchmarks.bench_parser --rows 500 --summary-rows 100 --steps 4
+"""
+
+import argparse
+import time
+
+from agritechtz.constants import REGIONAL_PATTERN, TZ_REGIONS
+from agritechtz.tokenizer import RowTokenizer
+
+PRICES = "1,000 2,000 NA NA 300 400.50 500 600 NA NA 700 800 900 NA 100 200"
+TRUNCATED = "100 NA 200"
+
+
+def synthetic_text(rows: int, summary_rows: int) -> str:
+    """Build a bulletin text of `rows` price rows followed by `summary_rows` short rows."""
+    regions = [region for region in TZ_REGIONS if "-" not in region]
+    lines = [f"{regions[row % len(regions)]} District {PRICES}" for row in range(rows)]
+    lines += [
+        f"{regions[row % len(regions)]} District {TRUNCATED}"
+        for row in range(summary_rows)
+    ]
+    return "\n".join(lines)
+
+
+def run(rows: int, summary_rows: int, steps: int):
+    """Time both engines over texts doubling in size."""
+    tokenizer = RowTokenizer()
+    engines = {
+        "regex": REGIONAL_PATTERN.findall,
+        "tokens": tokenizer.rows,
+    }
+
+    for step in range(steps):
+        scale = 2**step
+        size = rows * scale
+        text = synthetic_text(size, summary_rows * scale)
+        timings = []
+        for name, parse in engines.items():
+            started = time.perf_counter()
+            parse(text)
+            timings.append(f"{name}: {time.perf_counter() - started:8.3f}s")
+        print(f"{size:>7} rows  " + "  ".join(timings))
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=500)
+    arg_parser.add_argument("--summary-rows", type=int, default=100)
+    arg_parser.add_argument("--steps", type=int, default=4)
+    args = arg_parser.parse_args()
+
+    run(args.rows, args.summary_rows, args.steps)
@@ -0,0 +1,64 @@
+"""Measure how long an API worker takes to become ready
+
+Each run starts a fresh interpreter, times the import of `agritechtz.app` and then
+the application lifespan startup (pool warm up and Redis ping). The lifespan step
+needs the services configured by `DATABASE_URL` and `REDIS_BACKEND_URL`, use
+`--import-only` to skip it.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+WORKER_SCRIPT = """
+import asyncio, json, sys, time
+
+started = time.perf_counter()
+from agritechtz.app import app, lifespan
+imported = time.perf_counter()
+
+ready = imported
+if "--import-only" not in sys.argv:
+    async def boot():
+        async with lifespan(app):
+            return time.perf_counter()
+
+    ready = asyncio.run(boot())
+
+print(json.dumps({"import": imported - started, "lifespan": ready - imported}))
+"""
+
+
+def measure(import_only: bool) -> dict:
+    """Boot one worker in a fresh interpreter and return its timings."""
+    command = [sys.executable, "-c", WORKER_SCRIPT]
+    if import_only:
+        command.append("--import-only")
+    output = subprocess.run(command, capture_output=True, check=True, text=True)
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def run(runs: int, import_only: bool):
+    """Print the median and worst timings of `runs` worker boots."""
+    timings = [measure(import_only) for _ in range(runs)]
+
+    for stage in ("import", "lifespan"):
+        values = [timing[stage] * 1000 for timing in timings]
+        print(
+            f"{stage:>8}: median {statistics.median(values):8.1f} ms"
+            f"  max {max(values):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--runs", type=int, default=5)
+    arg_parser.add_argument("--import-only", action="store_true")
+    args = arg_parser.parse_args()
+
+    run(args.runs, args.import_only)
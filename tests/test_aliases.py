@@ -0,0 +1,71 @@
+"""Unit testing module for the alias indexes used to normalize names"""
+
+from unittest.mock import patch
+
+from agritechtz.aliases import AliasIndex
+from agritechtz.constants import REGION_ALIASES, REGIONAL_PATTERN, TZ_REGIONS
+from agritechtz.streamed_scrapper import CropPricesPDFParser
+
+
+def test_known_aliases_are_plain_lookups():
+    """Test that canonical names and known aliases never reach the fuzzy matcher."""
+    index = AliasIndex(TZ_REGIONS, REGION_ALIASES)
+
+    with patch("agritechtz.aliases.difflib.get_close_matches") as get_close_matches:
+        assert index.resolve("Dar es saalam") == "Dar-es-Salaam"
+        assert index.resolve("DAR ES SALAAM") == "Dar-es-Salaam"
+        assert index.resolve("mbeya") == "Mbeya"
+        assert index.resolve("Singida") == "Singinda"
+
+    get_close_matches.assert_not_called()
+    assert not index.learned_aliases()
+
+
+def test_fuzzy_matches_are_learned_once():
+    """Test that a new spelling is fuzzy matched once and then listed as learned."""
+    index = AliasIndex(TZ_REGIONS, REGION_ALIASES)
+
+    assert index.resolve("Kilimanjar0") == "Kilimanjaro"
+    assert index.resolve("Unknown") is None
+    with patch("agritechtz.aliases.difflib.get_close_matches") as get_close_matches:
+        assert index.resolve("Kilimanjar0") == "Kilimanjaro"
+        assert index.resolve("unknown") is None
+
+    get_close_matches.assert_not_called()
+    assert index.learned_aliases() == {"kilimanjar0": "Kilimanjaro"}
+
+
+def test_index_without_canonical_names_collapses_whitespace():
+    """Test that names without a reference list are normalized by their spacing."""
+    index = AliasIndex()
+
+    assert index.resolve("Mbeya\nUrban") == "Mbeya Urban"
+    assert index.resolve("Mbeya  Urban") == "Mbeya Urban"
+
+
+def test_parser_standardizes_districts():
+    """Test that the parser normalizes districts without learning them as aliases."""
+    parser = CropPricesPDFParser()
+
+    text = "Mbeya Mbeya\nUrban 100 200 NA NA NA 300 400 500 600 900 NA NA NA NA 200 300"
+    rows = parser.match_and_clean_text(text, REGIONAL_PATTERN)
+
+    assert rows[0][:2] == ("Mbeya", "Mbeya Urban")
+    assert parser.learned_aliases() == {}
+
+
+def test_parse_dataframe_attaches_the_aliases_learned_from_the_document():
+    """Test that each document lists the region spellings it first corrected."""
+    parser = CropPricesPDFParser(engine="tokens")
+    row = ("Kilimanjar0", "Moshi", *["100"] * 16)
+
+    with patch.object(parser, "extract_text_from_pdf", return_value=""), patch.object(
+        parser.tokenizer, "rows", side_effect=lambda text: [row]
+    ):
+        first = parser.parse_dataframe(b"%PDF", "Wholesale 02 January 2024.pdf")
+        second = parser.parse_dataframe(b"%PDF", "Wholesale 02 January 2024.pdf")
+
+    assert first["Region"].tolist() == ["Kilimanjaro"]
+    assert first.attrs["learned_aliases"] == {"kilimanjar0": "Kilimanjaro"}
+    assert second.attrs["learned_aliases"] == {}
+    assert parser.learned_aliases() == {"kilimanjar0": "Kilimanjaro"}
@@ -0,0 +1,70 @@
+"""Unit testing module for the application factory"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def test_api_import_graph_is_light():
+    """Test that importing the API creates no resources and skips scraper modules."""
+    script = (
+        "import json, sys\n"
+        "import agritechtz.app\n"
+        "from agritechtz.cache_config import get_redis_client\n"
+        "from agritechtz.database import get_engine_for_url\n"
+        "print(json.dumps({\n"
+        "    'modules': sorted(sys.modules),\n"
+        "    'engines': get_engine_for_url.cache_info().currsize,\n"
+        "    'redis_clients': get_redis_client.cache_info().currsize,\n"
+        "}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        env=os.environ.copy(),
+        text=True,
+    ).stdout
+    state = json.loads(output.splitlines()[-1])
+
+    for module in ("pandas", "numpy", "pypdf", "bs4", "agritechtz.streamed_scrapper"):
+        assert module not in state["modules"]
+    assert state["engines"] == 0
+    assert state["redis_clients"] == 0
+
+
+@pytest.mark.asyncio
+async def test_lifespan_warms_up_and_releases_resources(mocker):
+    """Test that the lifespan opens the pool on startup and closes it on shutdown."""
+    from agritechtz import app as app_module  # pylint: disable=import-outside-toplevel
+
+    warm_up_pool = mocker.patch.object(app_module, "warm_up_pool")
+    dispose_engine = mocker.patch.object(app_module, "dispose_engine")
+    close_redis_client = mocker.patch.object(app_module, "close_redis_client")
+    get_redis_client = mocker.patch.object(app_module, "get_redis_client")
+    get_redis_client.return_value.ping = mocker.AsyncMock()
+    get_latest_prices = mocker.patch.object(app_module, "get_latest_prices")
+    latest_prices = get_latest_prices.return_value
+    latest_prices.rebuild = mocker.AsyncMock()
+    listening = asyncio.Event()
+
+    async def listen():
+        listening.set()
+        await asyncio.Event().wait()
+
+    latest_prices.listen = listen
+
+    async with app_module.lifespan(app_module.create_app()):
+        warm_up_pool.assert_awaited_once()
+        get_redis_client.return_value.ping.assert_awaited_once()
+        await asyncio.wait_for(listening.wait(), 1)
+        # Built by the listener, so the query does not run twice at startup
+        latest_prices.rebuild.assert_not_awaited()
+        dispose_engine.assert_not_awaited()
+
+    dispose_engine.assert_awaited_once()
+    close_redis_client.assert_awaited_once()
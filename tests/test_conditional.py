@@ -0,0 +1,104 @@
+"""Unit testing module for the conditional and compressed responses"""
+
+from datetime import date, datetime, timezone
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+
+from agritechtz.api.common.compression import CompressionMiddleware
+from agritechtz.api.common.conditional import (
+    entity_tag,
+    not_modified,
+    validator_headers,
+)
+
+INGESTED_AT = datetime(2024, 1, 2, 8, 30, 15, 250000, tzinfo=timezone.utc)
+WATERMARK = (INGESTED_AT, date(2024, 1, 2))
+
+
+def test_entity_tag_follows_watermark_and_params():
+    """Test that the tag changes with the ingest watermark and the parameters."""
+    etag = entity_tag(WATERMARK, {"filter": {"region__in": ["Mbeya"]}})
+
+    assert etag == entity_tag(WATERMARK, {"filter": {"region__in": ["Mbeya"]}})
+    assert etag != entity_tag(WATERMARK, {"filter": {"region__in": ["Iringa"]}})
+    assert etag != entity_tag(
+        (datetime(2024, 1, 3, tzinfo=timezone.utc), date(2024, 1, 3)),
+        {"filter": {"region__in": ["Mbeya"]}},
+    )
+    assert etag.startswith('"') and not etag.startswith('W/"')
+
+
+def test_not_modified():
+    """Test the precedence and the comparison of the conditional headers."""
+    etag = entity_tag(WATERMARK, {})
+    last_modified = validator_headers(etag, INGESTED_AT, 5)["Last-Modified"]
+    assert last_modified == "Tue, 02 Jan 2024 08:30:15 GMT"
+
+    def check(**headers):
+        return not_modified(Headers(headers), etag, INGESTED_AT)
+
+    assert check(**{"if-none-match": etag})
+    assert check(**{"if-none-match": f'"other", {etag[:-1]}-gzip"'})
+    assert check(**{"if-none-match": f"W/{etag}"})
+    assert not check(**{"if-none-match": '"other"', "if-modified-since": last_modified})
+    assert check(**{"if-modified-since": last_modified})
+    assert not check(**{"if-modified-since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    assert not check(**{"if-modified-since": "yesterday"})
+    assert not check()
+
+
+def make_client(minimum_size: int = 16) -> TestClient:
+    """Build an application streaming a CSV body behind the compression."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/")
+    async def stream():
+        async def chunks():
+            yield "ts,region\n"
+            yield "2024-01-02,Mbeya\n" * 100
+
+        return StreamingResponse(
+            chunks(), media_type="text/csv", headers={"ETag": '"abc"'}
+        )
+
+    return TestClient(app)
+
+
+def test_compression_middleware_streams_gzip():
+    """Test that streamed bodies are gzipped part by part with their own tag."""
+    client = make_client()
+
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"abc-gzip"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    # The client decodes the body
+    assert response.text == "ts,region\n" + "2024-01-02,Mbeya\n" * 100
+
+    identity = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == '"abc"'
+
+
+def test_compression_middleware_skips_compressed_formats():
+    """Test that gzipped files are sent as they are, keeping the tag of the file."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=16)
+
+    @app.get("/")
+    async def export():
+        return Response(
+            content=gzip.compress(b"ts,region\n" * 100),
+            media_type="application/gzip",
+            headers={"ETag": '"sha256"'},
+        )
+
+    response = TestClient(app).get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"sha256"'
+    assert gzip.decompress(response.content) == b"ts,region\n" * 100
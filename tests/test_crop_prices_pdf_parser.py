@@ -1,14 +1,24 @@
 """The unit testing module for the crop prices pdf parser function"""
 
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 from unittest.mock import MagicMock, patch, AsyncMock
 import pytest
 from pytest_mock import MockFixture
 import pandas as pd
+import httpx
 
 
 from agritechtz.constants import BASE_URL, REGIONAL_PATTERN
-from agritechtz.streamed_scrapper import CropPricesPDFParser, parsed_dataframes_stream
+from agritechtz.streamed_scrapper import (
+    CropPricesPDFParser,
+    DownloadStats,
+    download_and_parse,
+    downloaded_pdf,
+    parsed_dataframes_stream,
+)
 
 
 class MockPage:
@@ -22,6 +32,12 @@ class MockPage:
         return self._text
 
 
+async def pages_stream(pages):
+    """Asynchronously yield the given `(page_url, pdf_links)` pairs."""
+    for page in pages:
+        yield page
+
+
 def test_clean_region():
     """Test the logic to clean regions"""
 
@@ -163,6 +179,68 @@ def test_parse_dataframe():
     )
 
 
+class BrokenPage:
+    """Mock class to simulate a PDF page whose text cannot be extracted."""
+
+    def extract_text(self):
+        """Simulates a failing text extraction."""
+        raise KeyError("/Contents")
+
+
+@pytest.mark.parametrize("engine", ["regex", "tokens"])
+def test_iter_row_batches_handles_rows_across_pages(engine):
+    """Test that page-by-page parsing reads the same rows as the joined text."""
+    parser = CropPricesPDFParser(engine=engine)
+    pages = [
+        "Header\nMbeya Soweto 100 200 NA NA NA 300 400 500 600 900 NA NA NA NA 200 3",
+        "00\nMbeya Mbeya\nUrban 100 200 NA NA NA 300 400 ",
+        "500 600 900 NA NA NA NA 200 300 Dodoma Kondoa ",
+        "100 200 NA NA NA 300 400 500 600 900 NA NA NA NA 200 300",
+    ]
+
+    with patch(
+        "agritechtz.streamed_scrapper.PdfReader",
+        return_value=MagicMock(pages=[MockPage(text) for text in pages]),
+    ):
+        batches = list(parser.iter_row_batches("dummy_path.pdf"))
+
+    rows = [row for batch in batches for row in batch]
+    assert rows == CropPricesPDFParser().match_and_clean_text(
+        "".join(pages), REGIONAL_PATTERN
+    )
+    assert [row[:2] for row in rows] == [
+        ("Mbeya", "Soweto"),
+        ("Mbeya", "Mbeya Urban"),
+        ("Dodoma", "Kondoa"),
+    ]
+    # The last cell of the first row continues on the second page
+    assert rows[0][-1] == "300"
+    assert len(batches) == 3
+
+
+def test_streaming_parse_dataframe_skips_broken_pages():
+    """Test that a page failing to extract does not fail the whole document."""
+    parser = CropPricesPDFParser(streaming=True)
+    pages = [
+        MockPage(
+            "Mbeya Soweto 100 200 NA NA NA 300 400 500 600 900 NA NA NA NA 200 300\n"
+        ),
+        BrokenPage(),
+        MockPage(
+            "Dodoma Kondoa 100 200 NA NA NA 300 400 500 600 900 NA NA NA NA 200 300"
+        ),
+    ]
+
+    with patch(
+        "agritechtz.streamed_scrapper.PdfReader",
+        return_value=MagicMock(pages=pages),
+    ):
+        df = parser.parse_dataframe("dummy_path.pdf", "Wholesale 01 January 2023.pdf")
+
+    assert list(df["District"]) == ["Soweto", "Kondoa"]
+    assert df.loc[1, "Maize Min"] == 100
+
+
 @pytest.mark.asyncio
 async def test_parsed_dataframes_stream(mocker: MockFixture):
     """Test downloading, parsing, and streaming of DataFrames from PDF links."""
@@ -172,18 +250,15 @@ async def test_parsed_dataframes_stream(mocker: MockFixture):
         "agritechtz.streamed_scrapper.Paginator", autospec=True
     )
     mock_paginator_instance = mock_paginator.return_value
-    mock_paginator_instance.__aiter__.return_value = iter([f"{BASE_URL}?page=1"])
-    mock_response = AsyncMock()
-    mock_response.text = (
-        f"<html>"
-        f"<a href='{BASE_URL}/sw-0000000000-Wholesale-Jan 2 2024.pdf'></a>"
-        f"</html>"
+    mock_paginator_instance.iter_pages.return_value = pages_stream(
+        [
+            (
+                f"{BASE_URL}?page=1",
+                [(BASE_URL, "/sw-0000000000-Wholesale-Jan 2 2024.pdf")],
+            )
+        ]
     )
-    mock_paginator_instance.filter_pdf_links.return_value = [
-        (BASE_URL, "/sw-0000000000-Wholesale-Jan 2 2024.pdf")
-    ]
 
-    mock_get = mocker.patch("httpx.AsyncClient.get", return_value=mock_response)
     mock_downloaded_pdf = mocker.patch(
         "agritechtz.streamed_scrapper.downloaded_pdf", return_value=AsyncMock()
     )
@@ -207,8 +282,8 @@ async def test_parsed_dataframes_stream(mocker: MockFixture):
     async for url, _ in parsed_dataframes_stream(mock_parser, BASE_URL):
         assert url == f"{BASE_URL}/{quote('sw-0000000000-Wholesale-Jan 2 2024.pdf')}"
 
-    # Verify the mock was called with expected arguments
-    mock_get.assert_called_with(f"{BASE_URL}?page=1")
+    # Verify the listing pages were walked once with the shared client
+    mock_paginator_instance.iter_pages.assert_called_once()
     # mock_parser.parse_dataframe.assert_called_with(
     #     downloaded_file_path="some-downloaded-pdf-file.pdf",
     #     source_file_path="/sw-0000000000-Wholesale-Jan 2 2024.pdf",
@@ -231,3 +306,152 @@ async def test_parsed_dataframes_stream(mocker: MockFixture):
 #     ):
 #         assert url not in skip_urls  # Ensure skipped URLs are not processed
 #         assert not df.empty
+
+
+@pytest.mark.asyncio
+async def test_parsed_dataframes_stream_concurrent_preserves_order(mocker: MockFixture):
+    """Test that concurrent downloads are bounded and yielded in listing order."""
+
+    filenames = [f"/sw-000000000{i}-Wholesale-Jan {i + 1} 2024.pdf" for i in range(5)]
+
+    mock_paginator = mocker.patch(
+        "agritechtz.streamed_scrapper.Paginator", autospec=True
+    )
+    mock_paginator_instance = mock_paginator.return_value
+    mock_paginator_instance.iter_pages.return_value = pages_stream(
+        [(f"{BASE_URL}?page=1", [(BASE_URL, filename) for filename in filenames])]
+    )
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_download_and_parse(_parser, _pdf_url, filename, *_):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Finish later downloads first to make sure the output is re-ordered
+        await asyncio.sleep(0.01 * (len(filenames) - filenames.index(filename)))
+        in_flight -= 1
+        return pd.DataFrame([{"filename": filename}])
+
+    mocker.patch(
+        "agritechtz.streamed_scrapper.download_and_parse",
+        side_effect=fake_download_and_parse,
+    )
+
+    results = [
+        df.loc[0, "filename"]
+        async for _, df in parsed_dataframes_stream(
+            MagicMock(spec=CropPricesPDFParser), BASE_URL, concurrency=2
+        )
+    ]
+
+    assert results == filenames
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_download_and_parse_uses_executor(mocker: MockFixture):
+    """Test that parsing is submitted to the given executor."""
+
+    mock_downloaded_pdf = mocker.patch(
+        "agritechtz.streamed_scrapper.downloaded_pdf", return_value=AsyncMock()
+    )
+    mock_downloaded_pdf.return_value.__aenter__.return_value = "downloaded.pdf"
+
+    parser = MagicMock(spec=CropPricesPDFParser)
+    parser.parse_dataframe.return_value = pd.DataFrame([{"Region": "Mbeya"}])
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        submit = mocker.spy(executor, "submit")
+        df = await download_and_parse(
+            parser, f"{BASE_URL}/file.pdf", "/file.pdf", executor
+        )
+
+    assert submit.call_count == 1
+    parser.parse_dataframe.assert_called_once_with("downloaded.pdf", "/file.pdf")
+    assert df.loc[0, "Region"] == "Mbeya"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("spool_max_size", [1024, 4])
+async def test_downloaded_pdf_in_memory(spool_max_size):
+    """Test that in-memory downloads yield a readable buffer and record their stats."""
+    body = b"%PDF-1.4 content"
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    stats = DownloadStats(f"{BASE_URL}/file.pdf")
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        async with downloaded_pdf(
+            f"{BASE_URL}/file.pdf", client, spool_max_size, stats
+        ) as pdf_file:
+            assert pdf_file.read() == body
+
+    assert pdf_file.closed
+    assert list(stats.stages) == ["download"]
+    assert stats.stages["download"][0] == len(body)
+
+
+@pytest.mark.asyncio
+async def test_download_and_parse_sends_in_memory_pdf_as_bytes(mocker: MockFixture):
+    """Test that an in-memory download reaches the executor as bytes."""
+
+    mock_downloaded_pdf = mocker.patch(
+        "agritechtz.streamed_scrapper.downloaded_pdf", return_value=AsyncMock()
+    )
+    mock_downloaded_pdf.return_value.__aenter__.return_value = io.BytesIO(b"%PDF")
+
+    parser = MagicMock(spec=CropPricesPDFParser)
+    parser.parse_dataframe.return_value = pd.DataFrame([{"Region": "Mbeya"}])
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        await download_and_parse(
+            parser, f"{BASE_URL}/file.pdf", "/file.pdf", executor, spool_max_size=1024
+        )
+
+    parser.parse_dataframe.assert_called_once_with(b"%PDF", "/file.pdf")
+
+
+@pytest.mark.asyncio
+async def test_parsed_dataframes_stream_incremental_stops_paging(mocker: MockFixture):
+    """Test that incremental mode stops at the first page without new bulletins."""
+
+    new_file = "/sw-0000000003-Wholesale-Jan 3 2024.pdf"
+    ingested_file = "/sw-0000000002-Wholesale-Jan 2 2024.pdf"
+    old_file = "/sw-0000000001-Wholesale-Dec 28 2023.pdf"
+    pages_pulled = []
+
+    async def listing_pages(_client):
+        for page, pdf_links in enumerate(
+            [
+                [(BASE_URL, new_file), (BASE_URL, ingested_file)],
+                [(BASE_URL, ingested_file), (BASE_URL, old_file)],
+                [(BASE_URL, "/sw-0000000000-Wholesale-Dec 1 2023.pdf")],
+            ],
+            start=1,
+        ):
+            pages_pulled.append(page)
+            yield f"{BASE_URL}?page={page}", pdf_links
+
+    mock_paginator = mocker.patch(
+        "agritechtz.streamed_scrapper.Paginator", autospec=True
+    )
+    mock_paginator.return_value.iter_pages.side_effect = listing_pages
+    mocker.patch(
+        "agritechtz.streamed_scrapper.download_and_parse",
+        return_value=pd.DataFrame([{"Region": "Mbeya"}]),
+    )
+
+    urls = [
+        url
+        async for url, _ in parsed_dataframes_stream(
+            CropPricesPDFParser(),
+            BASE_URL,
+            skip_urls={f"{BASE_URL}{quote(ingested_file)}"},
+            incremental=True,
+            since=pd.Timestamp("2024-01-02").date(),
+        )
+    ]
+
+    assert urls == [f"{BASE_URL}{quote(new_file)}"]
+    assert pages_pulled == [1, 2]
@@ -0,0 +1,69 @@
+"""Unit testing module for the crop prices API endpoints"""
+
+import csv
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from agritechtz.api.v1.crops import CSV_HEADER, csv_chunks, reject_price_bounds
+from agritechtz.api.v1.schema import CropPricesFilter
+
+
+def make_price(district: str, crop: str = "maize"):
+    """Build a crop price row for the tests."""
+    return SimpleNamespace(
+        ts=date(2024, 1, 2),
+        region="Mbeya",
+        district=district,
+        crop=crop,
+        min_price=Decimal("100.00"),
+        max_price=None,
+    )
+
+
+async def price_chunks(chunks):
+    """Asynchronously yield the given chunks of rows."""
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_csv_chunks_streams_one_chunk_per_partition():
+    """Test that the header is sent first and every partition becomes one chunk."""
+    chunks = [
+        chunk
+        async for chunk in csv_chunks(
+            price_chunks([[make_price("Soweto"), make_price("Mbalizi")], []])
+        )
+    ]
+
+    assert len(chunks) == 3
+    rows = list(csv.reader(StringIO("".join(chunks))))
+    assert rows == [
+        CSV_HEADER,
+        ["2024-01-02", "Mbeya", "Soweto", "maize", "100.00", ""],
+        ["2024-01-02", "Mbeya", "Mbalizi", "maize", "100.00", ""],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_chunks_without_rows_sends_header():
+    """Test that an empty result still produces a CSV header."""
+    chunks = [chunk async for chunk in csv_chunks(price_chunks([]))]
+
+    assert list(csv.reader(StringIO("".join(chunks)))) == [CSV_HEADER]
+
+
+def test_reject_price_bounds():
+    """Test that price bounds are refused where they cannot be applied."""
+    reject_price_bounds(CropPricesFilter(crop_prices__in=["maize"]))
+
+    with pytest.raises(HTTPException) as raised:
+        reject_price_bounds(CropPricesFilter(price__max__lte=Decimal(500)))
+
+    assert raised.value.status_code == 422
+    assert "price__max__lte" in raised.value.detail
@@ -0,0 +1,91 @@
+"""Unit testing module for the database engines"""
+
+import pytest
+
+from agritechtz import database
+from agritechtz.settings import Settings
+
+
+@pytest.fixture(name="engines")
+def fixture_engines(mocker):
+    """Record the engines created from the given settings instead of creating them."""
+
+    def configure(**settings):
+        created = []
+        mocker.patch.object(
+            database,
+            "get_settings",
+            return_value=Settings(
+                database_url="postgresql+asyncpg://primary/prices",
+                redis_backend_url="redis://localhost",
+                **settings,
+            ),
+        )
+        mocker.patch.object(
+            database,
+            "create_async_engine",
+            side_effect=lambda url, **options: created.append((url, options)) or url,
+        )
+        database.get_engine_for_url.cache_clear()
+        database.get_sessionmaker.cache_clear()
+        return created
+
+    yield configure
+    database.get_engine_for_url.cache_clear()
+    database.get_sessionmaker.cache_clear()
+
+
+def test_engine_options_come_from_the_settings(engines):
+    """Test that the pool, logging and timeout options are configurable."""
+    created = engines(db_pool_size=20, db_statement_timeout_ms=30000)
+
+    assert database.get_engine() == "postgresql+asyncpg://primary/prices"
+    ((_, options),) = created
+    assert options["echo"] is False
+    assert options["pool_size"] == 20
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {
+        "prepared_statement_cache_size": 100,
+        "server_settings": {"statement_timeout": "30000"},
+    }
+
+
+def test_read_only_engine_uses_the_replica(engines):
+    """Test that reads go to the replica, or share the primary without one."""
+    created = engines()
+    assert (
+        database.get_sessionmaker().kw["bind"]
+        is database.get_sessionmaker(True).kw["bind"]
+    )
+    assert database.get_engine(read_only=True) is database.get_engine(False)
+    assert len(created) == 1
+
+    created = engines(database_replica_url="postgresql+asyncpg://replica/prices")
+    assert database.get_sessionmaker(True).kw["bind"] == (
+        "postgresql+asyncpg://replica/prices"
+    )
+    assert database.get_sessionmaker().kw["bind"] == (
+        "postgresql+asyncpg://primary/prices"
+    )
+    assert len(created) == 2
+
+
+@pytest.mark.asyncio
+async def test_dispose_engine_closes_the_engines_in_use(engines, mocker):
+    """Test that shutdown disposes the pools the sessions used, and only them."""
+    engines(database_replica_url="postgresql+asyncpg://replica/prices")
+    in_use = {}
+    mocker.patch.object(
+        database,
+        "create_async_engine",
+        side_effect=lambda url, **options: in_use.setdefault(url, mocker.AsyncMock()),
+    )
+    primary = database.get_sessionmaker().kw["bind"]
+    replica = database.get_sessionmaker(True).kw["bind"]
+
+    await database.dispose_engine()
+
+    primary.dispose.assert_awaited_once()
+    replica.dispose.assert_awaited_once()
+    assert len(in_use) == 2
+    assert database.get_engine_for_url.cache_info().currsize == 0
@@ -0,0 +1,84 @@
+"""Unit testing module for the full-dataset snapshots"""
+
+import gzip
+import os
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agritechtz import exports
+from agritechtz.exports import prune_snapshots, read_manifest, write_snapshot
+from agritechtz.repository import CropPricesRepository
+
+WATERMARK = (datetime(2024, 1, 2, 8, 30, tzinfo=timezone.utc), date(2024, 1, 2))
+
+
+@pytest.fixture(name="repository")
+def fixture_repository(mocker):
+    """Serve two chunks of prices without a database."""
+    rows = [
+        SimpleNamespace(
+            ts=date(2024, 1, 2),
+            region="Mbeya",
+            district=district,
+            crop="maize",
+            min_price=Decimal("100.00"),
+            max_price=None,
+        )
+        for district in ("Soweto", "Mbalizi")
+    ]
+
+    async def stream_prices(self, crop_prices_filter, chunk_size=1000):
+        # pylint: disable=unused-argument
+        yield rows[:1]
+        yield rows[1:]
+
+    mocker.patch.object(CropPricesRepository, "stream_prices", stream_prices)
+    mocker.patch.object(
+        CropPricesRepository, "watermark", AsyncMock(return_value=WATERMARK)
+    )
+    mocker.patch.object(exports, "find_spec", lambda name: None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("repository")
+async def test_write_snapshot_publishes_a_new_version(tmp_path):
+    """Test that the snapshot is written, described and skipped while current."""
+    manifest = await write_snapshot(AsyncMock(), str(tmp_path))
+
+    assert manifest == read_manifest(str(tmp_path))
+    assert manifest["rows"] == 2
+    assert manifest["watermark"] == {
+        "ingested_at": "2024-01-02T08:30:00+00:00",
+        "latest_ts": "2024-01-02",
+    }
+    entry = manifest["files"]["csv.gz"]
+    assert entry["path"] == f"{manifest['version']}/crop_prices.csv.gz"
+    with open(tmp_path / entry["path"], "rb") as file:
+        data = file.read()
+    assert entry["bytes"] == len(data)
+    assert gzip.decompress(data).decode().splitlines() == [
+        "ts,region,district,crop,min_price,max_price",
+        "2024-01-02,Mbeya,Soweto,maize,100.00,",
+        "2024-01-02,Mbeya,Mbalizi,maize,100.00,",
+    ]
+
+    assert await write_snapshot(AsyncMock(), str(tmp_path)) is None
+
+
+def test_prune_snapshots_keeps_the_newest_versions(tmp_path):
+    """Test that only the newest version directories are kept."""
+    for version in ("20240101T000000Z", "20240102T000000Z", "20240103T000000Z"):
+        os.makedirs(tmp_path / version)
+    (tmp_path / "manifest.json").write_text("{}")
+
+    prune_snapshots(str(tmp_path), keep=2)
+
+    assert sorted(os.listdir(tmp_path)) == [
+        "20240102T000000Z",
+        "20240103T000000Z",
+        "manifest.json",
+    ]
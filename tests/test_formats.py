@@ -0,0 +1,85 @@
+"""Unit testing module for the output formats of the crop prices"""
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from agritechtz.api.common import formats
+from agritechtz.api.common.formats import columnar_chunks, negotiate_format
+
+ROWS = [
+    SimpleNamespace(
+        ts=date(2024, 1, 2),
+        region="Mbeya",
+        district=district,
+        crop="maize",
+        min_price=Decimal("100.00"),
+        max_price=None,
+    )
+    for district in ("Soweto", "Mbalizi")
+]
+
+
+@pytest.fixture(name="with_pyarrow")
+def fixture_with_pyarrow(monkeypatch):
+    """Pretend pyarrow is installed, the negotiation only looks it up."""
+    monkeypatch.setattr(formats, "find_spec", lambda name: object())
+
+
+@pytest.mark.parametrize(
+    "accept, requested, expected",
+    [
+        (None, None, "csv"),
+        ("*/*", None, "csv"),
+        ("text/html, application/vnd.apache.parquet;q=0.9", None, "parquet"),
+        ("application/vnd.apache.parquet;q=0.5, text/csv", None, "csv"),
+        ("application/vnd.apache.arrow.stream", None, "arrow"),
+        ("application/vnd.apache.parquet;q=0, text/csv", None, "csv"),
+        ("text/csv", "parquet", "parquet"),
+    ],
+)
+def test_negotiate_format(with_pyarrow, accept, requested, expected):
+    """Test that the parameter wins and media ranges are tried by quality."""
+    # pylint: disable=unused-argument
+    assert negotiate_format(accept, requested) == expected
+
+
+def test_negotiate_format_without_pyarrow(monkeypatch):
+    """Test that columnar formats are refused when pyarrow is missing."""
+    monkeypatch.setattr(formats, "find_spec", lambda name: None)
+
+    assert negotiate_format("text/csv", None) == "csv"
+    with pytest.raises(HTTPException) as error:
+        negotiate_format(None, "arrow")
+    assert error.value.status_code == 406
+
+
+async def two_chunks():
+    """Asynchronously yield the test rows in two chunks."""
+    yield ROWS[:1]
+    yield ROWS[1:]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+async def test_columnar_chunks_round_trip(output_format):
+    """Test that the encoded body reads back as the original rows."""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc  # pylint: disable=import-outside-toplevel
+    import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+
+    body = b"".join(
+        [chunk async for chunk in columnar_chunks(two_chunks(), output_format)]
+    )
+
+    if output_format == "parquet":
+        table = pyarrow.parquet.read_table(pa.BufferReader(body))
+    else:
+        table = pyarrow.ipc.open_stream(body).read_all()
+    assert table.column_names == formats.COLUMNS
+    assert table.column("district").to_pylist() == ["Soweto", "Mbalizi"]
+    assert table.column("min_price").to_pylist() == [Decimal("100.00")] * 2
+    assert table.column("max_price").to_pylist() == [None, None]
@@ -0,0 +1,125 @@
+"""Unit testing module for the latest prices snapshot"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+from sqlalchemy.dialects import postgresql
+
+from agritechtz import latest_prices
+from agritechtz.latest_prices import (
+    INGEST_CHANNEL,
+    LatestPricesSnapshot,
+    latest_prices_query,
+    publish_ingest,
+)
+
+
+def test_latest_prices_query_keeps_newest_row_per_crop():
+    """Test that the query keeps the newest row of every district and crop."""
+    sql = str(latest_prices_query().compile(dialect=postgresql.dialect()))
+
+    assert (
+        "DISTINCT ON (cn_crop_prices.region, cn_crop_prices.district, "
+        "cn_crop_prices.crop)" in sql
+    )
+    assert sql.endswith(
+        "ORDER BY cn_crop_prices.region, cn_crop_prices.district, "
+        "cn_crop_prices.crop, cn_crop_prices.ts DESC"
+    )
+
+
+@pytest.mark.asyncio
+async def test_rebuild_renders_the_snapshot(mocker):
+    """Test that a rebuild queries the database once and renders JSON."""
+    row = SimpleNamespace(
+        region="Arusha",
+        district="Arusha",
+        crop="maize",
+        ts=date(2024, 1, 3),
+        min_price=Decimal("600.00"),
+        max_price=None,
+    )
+    session = AsyncMock()
+    session.execute.return_value.all = lambda: [row]
+
+    @asynccontextmanager
+    async def acquire_session():
+        yield session
+
+    mocker.patch.object(latest_prices, "acquire_session", acquire_session)
+    snapshot = LatestPricesSnapshot(AsyncMock())
+    assert snapshot.body is None
+
+    await snapshot.rebuild()
+
+    session.execute.assert_awaited_once()
+    assert json.loads(snapshot.body) == [
+        {
+            "region": "Arusha",
+            "district": "Arusha",
+            "crop": "maize",
+            "ts": "2024-01-03",
+            "min_price": 600.0,
+            "max_price": None,
+        }
+    ]
+    assert snapshot.built_at is not None
+
+
+@pytest.mark.asyncio
+async def test_listen_rebuilds_after_the_first_subscription():
+    """Test that prices announced before the subscription are not missed."""
+    pubsub = AsyncMock()
+    redis = AsyncMock()
+    redis.pubsub = lambda: pubsub
+    pubsub.__aenter__.return_value = pubsub
+    snapshot = LatestPricesSnapshot(redis)
+    snapshot.rebuild = AsyncMock(side_effect=asyncio.CancelledError)
+
+    with pytest.raises(asyncio.CancelledError):
+        await snapshot.listen()
+
+    pubsub.subscribe.assert_awaited_once_with(INGEST_CHANNEL)
+    snapshot.rebuild.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_listen_retries_until_the_snapshot_is_built():
+    """Test that a snapshot missing after startup is built without a notification."""
+    redis = MagicMock()
+    redis.pubsub.side_effect = RedisError("down")
+    snapshot = LatestPricesSnapshot(redis, retry_delay=0)
+
+    async def rebuild():
+        if snapshot.rebuild.await_count == 1:
+            raise OSError("database down")
+        # Stops the listener once the snapshot is built
+        snapshot.body = b"[]"
+        raise asyncio.CancelledError
+
+    snapshot.rebuild = AsyncMock(side_effect=rebuild)
+
+    with pytest.raises(asyncio.CancelledError):
+        await snapshot.listen()
+
+    assert snapshot.body == b"[]"
+    assert snapshot.rebuild.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_publish_ingest_tolerates_redis_errors():
+    """Test that announcing an ingestion never fails the ingestion."""
+    redis = AsyncMock()
+
+    await publish_ingest(redis)
+    assert redis.publish.await_args.args[0] == INGEST_CHANNEL
+
+    redis.publish.side_effect = RedisError("down")
+    await publish_ingest(redis)
@@ -0,0 +1,63 @@
+"""Unit testing module for the application logging"""
+
+import json
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from agritechtz.logger import (
+    configure_logging,
+    logger,
+    request_sampled,
+    stop_logging,
+)
+
+
+@pytest.fixture(name="restore_logger")
+def fixture_restore_logger():
+    """Restore the handlers and the level of the application logger."""
+    handlers, level = list(logger.handlers), logger.level
+    yield
+    stop_logging()
+    logger.handlers[:] = handlers
+    logger.setLevel(level)
+
+
+@pytest.mark.usefixtures("restore_logger")
+def test_queued_json_logging(capsys):
+    """Test that queued records are written as JSON once the listener stops."""
+    configure_logging("warning", json_output=True, queued=True)
+    assert [type(handler) for handler in logger.handlers] == [QueueHandler]
+
+    logger.info("Hidden")
+    logger.warning("Parsed %d rows", 3)
+    stop_logging()
+
+    (line,) = capsys.readouterr().err.splitlines()
+    entry = json.loads(line)
+    assert entry["level"] == "WARNING"
+    assert entry["message"] == "Parsed 3 rows"
+    assert entry["logger"] == "AGRITECH-TZ"
+    assert logger.level == logging.WARNING
+    assert not any(isinstance(handler, QueueHandler) for handler in logger.handlers)
+
+
+@pytest.mark.usefixtures("restore_logger")
+def test_requests_out_of_the_sample_only_log_warnings(capsys):
+    """Test that unsampled requests keep their warnings and drop the rest."""
+    configure_logging("debug", queued=False)
+
+    token = request_sampled.set(False)
+    try:
+        logger.info("Finished processing")
+        logger.warning("Redis is not reachable")
+    finally:
+        request_sampled.reset(token)
+    logger.info("Sampled")
+
+    lines = capsys.readouterr().err.splitlines()
+    assert [line.rsplit(" - ", 1)[-1] for line in lines] == [
+        "Redis is not reachable",
+        "Sampled",
+    ]
@@ -0,0 +1,58 @@
+"""Unit testing module for the keyset pagination helpers"""
+
+from datetime import date
+import json
+
+import pytest
+from fastapi import HTTPException
+from fastapi_pagination.cursor import encode_cursor
+
+from agritechtz.api.common.pagination import (
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+)
+
+
+def test_keyset_cursor_round_trip():
+    """Test that a cursor decodes back to the key it was built from."""
+    cursor = encode_keyset_cursor(
+        ["-ts"], (date(2024, 1, 2), "Mbeya", "Soweto", "rice")
+    )
+
+    assert decode_keyset_cursor(cursor, ["-ts"], 4) == [
+        "2024-01-02",
+        "Mbeya",
+        "Soweto",
+        "rice",
+    ]
+
+
+def test_keyset_cursor_rejects_other_ordering():
+    """Test that a cursor cannot be reused with a different ordering."""
+    cursor = encode_keyset_cursor(
+        ["+ts"], (date(2024, 1, 2), "Mbeya", "Soweto", "rice")
+    )
+
+    with pytest.raises(HTTPException) as error:
+        decode_keyset_cursor(cursor, ["-ts"], 4)
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("key", [["2024-01-02"], "2024-01-02", None])
+def test_keyset_cursor_rejects_keys_of_another_size(key):
+    """Test that a cursor must hold one value per keyset column."""
+    cursor = encode_cursor(json.dumps({"o": ["+ts"], "k": key}))
+
+    with pytest.raises(HTTPException) as error:
+        decode_keyset_cursor(cursor, ["+ts"], 4)
+
+    assert error.value.status_code == 400
+
+
+def test_keyset_cursor_rejects_garbage():
+    """Test that malformed cursors are reported as bad requests."""
+    with pytest.raises(HTTPException) as error:
+        decode_keyset_cursor("bm90LWpzb24=", ["+ts"], 4)
+
+    assert error.value.status_code == 400
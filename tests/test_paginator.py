@@ -1,5 +1,9 @@
 """Unittesting module to assess the functionality of pagination logic"""
 
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
 from agritechtz.streamed_scrapper import Paginator
 
 
@@ -38,3 +42,48 @@ def test_paginator_empty_page():
 
     links = [{"href": "?page=1"}]  # Assume the only available page is page 1
     assert paginator.get_next_page(1, links) is None
+
+
+def test_paginator_get_last_page():
+    """Test getting the highest page number from a list of page links."""
+    paginator = Paginator(base_url=BASE_URL)
+
+    links = [{"href": "?page=2"}, {"href": "?page=7"}, {"href": "?page=3"}]
+    assert paginator.get_last_page(1, links) == 7
+    assert paginator.get_last_page(9, links) == 9
+    assert paginator.get_last_page(1, []) == 1
+
+
+@pytest.mark.asyncio
+async def test_paginator_iter_pages_single_pass():
+    """Test that every listing page is fetched exactly once and yielded in order."""
+    pages = {
+        1: '<a href="?page=2">2</a><a href="?page=3">3</a>'
+        f'<a href="{BASE_URL}/sw-0000000001-Wholesale-Jan 1 2024.pdf">1</a>',
+        2: '<a href="?page=1">1</a><a href="?page=4">4</a>'
+        f'<a href="{BASE_URL}/sw-0000000002-Wholesale-Jan 2 2024.pdf">2</a>',
+        3: f'<a href="{BASE_URL}/sw-0000000003-Wholesale-Jan 3 2024.pdf">3</a>',
+        4: f'<a href="{BASE_URL}/sw-0000000004-Wholesale-Jan 4 2024.pdf">4</a>',
+    }
+    client = MagicMock()
+    client.get = AsyncMock(
+        side_effect=lambda url: MagicMock(text=pages[int(url.rsplit("=", 1)[1])])
+    )
+
+    paginator = Paginator(base_url=BASE_URL, concurrency=3)
+    result = [
+        (page_url, [filename for _, filename in pdf_links])
+        async for page_url, pdf_links in paginator.iter_pages(client)
+    ]
+
+    assert result == [
+        (
+            f"{BASE_URL}?page={page}",
+            [f"sw-000000000{page}-Wholesale-Jan {page} 2024.pdf"],
+        )
+        for page in range(1, 5)
+    ]
+    assert sorted(call.args[0] for call in client.get.call_args_list) == [
+        f"{BASE_URL}?page={page}" for page in range(1, 5)
+    ]
+    assert paginator.total_pages == 4
@@ -0,0 +1,54 @@
+"""Unit testing module for the monthly partitions of the crop prices"""
+
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from agritechtz.models import CropPrice
+from agritechtz.partitions import ensure_partitions, partition_ddl
+
+
+def test_crop_prices_table_is_partitioned_by_month():
+    """Test that the table is range partitioned on ts with a BRIN index."""
+    dialect = postgresql.dialect()
+    table = CropPrice.__table__
+
+    assert (
+        str(CreateTable(table).compile(dialect=dialect))
+        .rstrip()
+        .endswith("PARTITION BY RANGE (ts)")
+    )
+    (brin,) = [index for index in table.indexes if index.name.endswith("_brin")]
+    assert "USING brin (ts)" in str(CreateIndex(brin).compile(dialect=dialect))
+
+
+def test_partition_ddl_covers_one_month():
+    """Test that a partition spans the month, up to the first day of the next one."""
+    assert partition_ddl(date(2024, 12, 1)) == (
+        "CREATE TABLE IF NOT EXISTS cn_crop_prices_y2024m12 "
+        "PARTITION OF cn_crop_prices "
+        "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')"
+    )
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_missing_months_only():
+    """Test that only the partitions missing for the ingested days are created."""
+    session = AsyncMock()
+    session.scalars.return_value = MagicMock(
+        all=MagicMock(return_value=["cn_crop_prices_y2024m01"])
+    )
+
+    created = await ensure_partitions(
+        session, [date(2024, 1, 3), date(2024, 2, 7), date(2024, 2, 8)]
+    )
+
+    assert created == ["cn_crop_prices_y2024m02"]
+    (statement,) = [call.args[0] for call in session.execute.call_args_list]
+    assert "FROM ('2024-02-01') TO ('2024-03-01')" in str(statement)
+    session.commit.assert_not_awaited()
+
+    assert await ensure_partitions(session, []) == []
@@ -0,0 +1,121 @@
+"""Unit testing module for the local cache of raw PDFs"""
+
+import os
+
+import httpx
+import pytest
+
+from agritechtz.pdf_cache import PDFCache
+from agritechtz.streamed_scrapper import DownloadStats, downloaded_pdf
+
+PDF_URL = "https://example.invalid/bulletin.pdf"
+
+
+async def chunks_of(*chunks):
+    """Asynchronously yield the given chunks."""
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_store_is_content_addressed(tmp_path):
+    """Test that URLs serving the same content share a single cached object."""
+    cache = PDFCache(str(tmp_path))
+
+    first = await cache.store(PDF_URL, chunks_of(b"%PDF", b" body"), etag='"v1"')
+    second = await cache.store(f"{PDF_URL}?copy", chunks_of(b"%PDF body"))
+
+    assert first["sha256"] == second["sha256"]
+    assert cache.lookup(PDF_URL)["etag"] == '"v1"'
+    with open(cache.object_path(first["sha256"]), "rb") as fh:
+        assert fh.read() == b"%PDF body"
+    assert cache.conditional_headers(first) == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used(tmp_path):
+    """Test that the least recently used contents are evicted beyond `max_bytes`."""
+    cache = PDFCache(str(tmp_path), max_bytes=10)
+
+    old = await cache.store(f"{PDF_URL}?old", chunks_of(b"12345"))
+    used = await cache.store(f"{PDF_URL}?used", chunks_of(b"67890"))
+    os.utime(cache.object_path(old["sha256"]), (0, 0))
+    os.utime(cache.object_path(used["sha256"]), (1, 1))
+    assert cache.lookup(f"{PDF_URL}?used") is not None
+
+    await cache.store(f"{PDF_URL}?new", chunks_of(b"abcde"))
+
+    assert cache.lookup(f"{PDF_URL}?old") is None
+    assert cache.lookup(f"{PDF_URL}?used") is not None
+    assert cache.lookup(f"{PDF_URL}?new") is not None
+
+
+@pytest.mark.asyncio
+async def test_eviction_keeps_stored_and_in_use_contents(tmp_path):
+    """Test that neither the content just stored nor the ones in use are evicted."""
+    cache = PDFCache(str(tmp_path), max_bytes=4)
+
+    used = await cache.store(f"{PDF_URL}?used", chunks_of(b"12345"))
+    used_path = cache.object_path(used["sha256"])
+    assert os.path.exists(used_path)
+
+    with cache.in_use(used_path):
+        await cache.store(f"{PDF_URL}?new", chunks_of(b"abcde"))
+    assert cache.lookup(f"{PDF_URL}?used") is not None
+    assert cache.lookup(f"{PDF_URL}?new") is not None
+
+    await cache.store(f"{PDF_URL}?newer", chunks_of(b"fghij"))
+    assert cache.lookup(f"{PDF_URL}?used") is None
+    assert cache.lookup(f"{PDF_URL}?new") is None
+    assert cache.lookup(f"{PDF_URL}?newer") is not None
+
+
+@pytest.mark.asyncio
+async def test_downloaded_pdf_uses_cache(tmp_path):
+    """Test that cached PDFs are read from disk without reaching the server."""
+    cache = PDFCache(str(tmp_path))
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=b"%PDF body")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        for _ in range(2):
+            async with downloaded_pdf(PDF_URL, client, pdf_cache=cache) as pdf_file:
+                with open(pdf_file, "rb") as fh:
+                    assert fh.read() == b"%PDF body"
+
+    assert len(requests) == 1
+    assert os.path.exists(pdf_file)
+
+
+@pytest.mark.asyncio
+async def test_downloaded_pdf_revalidates_cache(tmp_path):
+    """Test that revalidation sends the validators and keeps the cached copy."""
+    cache = PDFCache(str(tmp_path), revalidate=True)
+    await cache.store(
+        PDF_URL,
+        chunks_of(b"%PDF body"),
+        etag='"v1"',
+        last_modified="Mon, 01 Jan 2024 00:00:00 GMT",
+    )
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) > 1:
+            raise httpx.ConnectError("upstream is down")
+        return httpx.Response(304)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        for _ in range(2):
+            stats = DownloadStats(PDF_URL)
+            async with downloaded_pdf(
+                PDF_URL, client, spool_max_size=1024, stats=stats, pdf_cache=cache
+            ) as pdf_file:
+                assert pdf_file.read() == b"%PDF body"
+
+    assert requests[0].headers["If-None-Match"] == '"v1"'
+    assert requests[0].headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert len(requests) == 2
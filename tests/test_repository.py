@@ -0,0 +1,118 @@
+"""Unit testing module for the crop prices repository"""
+
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from agritechtz.api.v1.schema import CropPricesFilter
+from agritechtz.repository import CropPricesRepository, expand_crops
+
+
+def test_expand_crops():
+    """Test that requested crops resolve to stored names by suffix, ignoring case."""
+    assert expand_crops(["Maize"]) == ["maize"]
+    assert expand_crops(["millet"]) == [
+        "sorghum_millet",
+        "bulrush_millet",
+        "finger_millet",
+    ]
+    assert expand_crops(["irish potato", "rice"]) == ["rice", "irish_potato"]
+    assert not expand_crops(["cassava"])
+
+
+@pytest.mark.asyncio
+async def test_filter_prices_uses_plain_predicates():
+    """Test that crop and region filters become plain column predicates."""
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    repository = CropPricesRepository(session)
+
+    await repository.filter_prices(
+        CropPricesFilter(crop_prices__in=["maize"], region__in=["Mbeya"])
+    )
+
+    (statement,) = [call.args[0] for call in session.execute.call_args_list]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "cn_crop_prices.crop IN" in sql
+    assert "cn_crop_prices.region IN" in sql
+    assert "json" not in sql.lower()
+    assert "ORDER BY cn_crop_prices.ts" in sql
+
+
+@pytest.mark.asyncio
+async def test_filter_prices_compares_price_bounds():
+    """Test that the price thresholds compare the price columns of each crop."""
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    repository = CropPricesRepository(session)
+
+    await repository.filter_prices(
+        CropPricesFilter(
+            crop_prices__in=["maize"],
+            ts__gte=date(2024, 1, 1),
+            price__min__gte=1000,
+            price__max__lte=2500,
+        )
+    )
+
+    (statement,) = [call.args[0] for call in session.execute.call_args_list]
+    sql = str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert "cn_crop_prices.min_price >= 1000" in sql
+    assert "cn_crop_prices.max_price <= 2500" in sql
+    assert "cn_crop_prices.ts >= '2024-01-01'" in sql
+    assert "price__" not in sql
+
+
+def test_keyset_ordering_completes_the_key():
+    """Test that the ordering is extended with the remaining keyset columns."""
+    repository = CropPricesRepository(AsyncMock())
+
+    assert repository.keyset_ordering(CropPricesFilter(ordering=["-ts"])) == [
+        ("ts", True),
+        ("region", True),
+        ("district", True),
+        ("crop", True),
+    ]
+    assert repository.keyset_ordering(
+        CropPricesFilter(ordering=["+region", "-ts"])
+    ) == [("region", False), ("ts", True), ("district", False), ("crop", False)]
+
+    with pytest.raises(ValueError):
+        repository.keyset_ordering(CropPricesFilter(ordering=["+min_price"]))
+
+
+@pytest.mark.asyncio
+async def test_page_prices_continues_after_the_cursor_key():
+    """Test that pages are selected with a row comparison instead of an OFFSET."""
+    session = AsyncMock()
+    last = SimpleNamespace(
+        ts=date(2024, 1, 2), region="Mbeya", district="Soweto", crop="rice"
+    )
+    session.execute.return_value = MagicMock(
+        all=MagicMock(return_value=[MagicMock(), last, MagicMock()])
+    )
+    repository = CropPricesRepository(session)
+
+    rows, next_key = await repository.page_prices(
+        CropPricesFilter(),
+        limit=2,
+        after=["2024-01-01", "Mbeya", "Soweto", "maize"],
+    )
+
+    (statement,) = [call.args[0] for call in session.execute.call_args_list]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert (
+        "(cn_crop_prices.ts, cn_crop_prices.region, cn_crop_prices.district, "
+        "cn_crop_prices.crop) >" in sql
+    )
+    assert "OFFSET" not in sql
+    assert "LIMIT" in sql
+    assert len(rows) == 2
+    assert next_key == (date(2024, 1, 2), "Mbeya", "Soweto", "rice")
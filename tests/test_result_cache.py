@@ -0,0 +1,78 @@
+"""Unit testing module for the Redis backed query result cache"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from agritechtz.api.v1.schema import CropPricesFilter
+from agritechtz.result_cache import QueryResultCache
+
+
+async def body_chunks(chunks):
+    """Asynchronously yield the given body chunks."""
+    for chunk in chunks:
+        yield chunk
+
+
+def test_key_depends_on_generation_and_normalized_filter():
+    """Test that equivalent filters share a key within one generation only."""
+    cache = QueryResultCache(AsyncMock())
+
+    first = CropPricesFilter(region__in=["Mbeya", "Arusha"], crop_prices__in=["Maize"])
+    second = CropPricesFilter(
+        region__in=["Arusha", "Mbeya", "Arusha"], crop_prices__in=["maize"]
+    )
+
+    assert cache.key(1, {"filter": first.normalized()}) == cache.key(
+        1, {"filter": second.normalized()}
+    )
+    assert cache.key(1, {"filter": first.normalized()}) != cache.key(
+        2, {"filter": first.normalized()}
+    )
+
+
+@pytest.mark.asyncio
+async def test_tee_caches_small_bodies_only():
+    """Test that streamed bodies are stored once sent unless they are too large."""
+    cache = QueryResultCache(AsyncMock(), max_bytes=10)
+    cache.set = AsyncMock()
+
+    sent = [chunk async for chunk in cache.tee("small", body_chunks(["a,b\n"]), {})]
+    assert sent == ["a,b\n"]
+    cache.set.assert_awaited_once_with("small", b"a,b\n", {})
+
+    cache.set.reset_mock()
+    sent = [
+        chunk async for chunk in cache.tee("large", body_chunks(["a" * 8, "b" * 8]), {})
+    ]
+    assert sent == ["a" * 8, "b" * 8]
+    cache.set.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_are_cache_misses():
+    """Test that an unavailable Redis server does not break the API."""
+    redis = AsyncMock()
+    redis.get.side_effect = RedisConnectionError()
+    redis.hgetall.side_effect = RedisConnectionError()
+    redis.incr.side_effect = RedisConnectionError()
+    cache = QueryResultCache(redis)
+
+    assert await cache.generation() == 0
+    assert await cache.get("key") is None
+    await cache.invalidate()
+
+
+@pytest.mark.asyncio
+async def test_get_returns_body_and_headers():
+    """Test reading back a stored entry."""
+    redis = AsyncMock()
+    redis.hgetall.return_value = {
+        b"body": b"a,b\n",
+        b"headers": b'{"X-Next-Cursor": "c"}',
+    }
+    cache = QueryResultCache(redis)
+
+    assert await cache.get("key") == (b"a,b\n", {"X-Next-Cursor": "c"})
+    redis.zadd.assert_awaited_once()
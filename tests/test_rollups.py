@@ -0,0 +1,73 @@
+"""Unit testing module for the pre-aggregated crop prices"""
+
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from agritechtz.api.v1.schema import CropPricesFilter
+from agritechtz.repository import CropPricesRepository
+from agritechtz.rollups import bucket_ranges, refresh_rollups
+
+
+def compile_sql(statement) -> str:
+    """Render a statement with its parameters for the assertions."""
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_bucket_ranges_merge_adjacent_buckets():
+    """Test that the buckets of the ingested days are merged into ranges."""
+    days = [date(2024, 1, 31), date(2024, 2, 7), date(2024, 4, 1), date(2024, 1, 2)]
+
+    assert bucket_ranges("month", days) == [
+        (date(2024, 1, 1), date(2024, 3, 1)),
+        (date(2024, 4, 1), date(2024, 5, 1)),
+    ]
+    assert bucket_ranges("week", [date(2024, 1, 3), date(2024, 1, 10)]) == [
+        (date(2024, 1, 1), date(2024, 1, 15))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_refresh_rollups_only_touches_affected_buckets():
+    """Test that a partial refresh replaces the buckets holding the given days."""
+    session = AsyncMock()
+
+    await refresh_rollups(session, [date(2024, 1, 3)])
+
+    statements = [compile_sql(call.args[0]) for call in session.execute.call_args_list]
+    assert len(statements) == 6
+    delete_month, insert_month = statements[4:]
+    assert "DELETE FROM cn_crop_price_rollups" in delete_month
+    assert "bucket >= '2024-01-01' AND cn_crop_price_rollups.bucket < '2024-02-01'" in (
+        delete_month
+    )
+    assert "INSERT INTO cn_crop_price_rollups" in insert_month
+    assert "date_trunc('month', cn_crop_prices.ts)" in insert_month
+    assert "cn_crop_prices.ts >= '2024-01-01'" in insert_month
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_aggregate_prices_groups_by_level():
+    """Test that aggregates are grouped by the places of the requested level."""
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    repository = CropPricesRepository(session)
+
+    await repository.aggregate_prices(
+        CropPricesFilter(crop_prices__in=["maize"], ts__gte=date(2024, 1, 15)),
+        period="month",
+        level="country",
+    )
+
+    sql = compile_sql(session.execute.call_args.args[0])
+    assert "NULL AS region" in sql
+    assert "GROUP BY cn_crop_price_rollups.bucket, cn_crop_price_rollups.crop" in sql
+    assert "cn_crop_price_rollups.bucket >= '2024-01-01'" in sql
+    assert "cn_crop_price_rollups.period = 'month'" in sql
@@ -0,0 +1,40 @@
+"""Unit testing module for the token-based row parser"""
+
+import pytest
+
+from agritechtz.constants import REGIONAL_PATTERN
+from agritechtz.streamed_scrapper import CropPricesPDFParser
+from agritechtz.tokenizer import RowTokenizer
+
+PRICES = "100 200 NA NA NA 300 400 500 600 900 NA NA NA NA 200 300"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        f"Mbeya Soweto {PRICES}",
+        f"Mbeya Mbeya\nUrban {PRICES}",
+        f"REGION DISTRICT\nDar es salaam Ilala 1,000 2,000.50 {PRICES[8:]}"
+        f"Mbeya Mbeya/Urban {PRICES}\nKigoma Kasulu {PRICES} 999",
+    ],
+)
+def test_tokens_engine_matches_regex_engine(text):
+    """Test that both engines read the same rows from well-formed bulletins."""
+    regex_rows = CropPricesPDFParser().match_and_clean_text(text, REGIONAL_PATTERN)
+    token_rows = CropPricesPDFParser(engine="tokens").tokenize_and_clean_text(text)
+
+    assert token_rows == regex_rows
+    assert len(token_rows[0]) == 18
+
+
+def test_tokenizer_skips_rows_with_missing_cells():
+    """Test that a truncated row is dropped instead of swallowing the next row."""
+    rows = RowTokenizer().rows(f"Arusha Arusha 100 NA\nKigoma Kasulu {PRICES}")
+
+    assert rows == [("Kigoma", "Kasulu", *PRICES.split())]
+
+
+def test_unknown_engine_is_rejected():
+    """Test that only the supported parsing engines can be selected."""
+    with pytest.raises(ValueError, match="Unknown parser engine"):
+        CropPricesPDFParser(engine="lxml")
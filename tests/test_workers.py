@@ -0,0 +1,311 @@
+"""Unit testing module for the ingestion tasks"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from agritechtz.pdf_cache import PDFCache
+from agritechtz.streamed_scrapper import CropPricesPDFParser
+import agritechtz.workers as workers
+from agritechtz.workers import (
+    dataframe_to_records,
+    download_daily_updates,
+    ingest_and_publish,
+    parser_executor,
+    parser_processes,
+    reparse_documents,
+    save_records_bulk,
+)
+
+SOURCE_URL = "https://www.viwanda.go.tz/uploads/documents/sw-0000000000-Wholesale.pdf"
+
+
+def test_parser_executor_parses_inline_without_workers(monkeypatch):
+    """Test that 0 workers parses on the event loop and unset ones use every core."""
+    monkeypatch.setattr(workers.os, "cpu_count", lambda: 3)
+    assert parser_processes(None) == 3
+    assert parser_processes(0) == 0
+
+    with parser_executor(0) as executor:
+        assert executor is None
+
+    with parser_executor(None) as executor:
+        assert isinstance(executor, ProcessPoolExecutor)
+        assert executor._max_workers == 3  # pylint: disable=protected-access
+
+    with parser_executor(2) as executor:
+        assert executor._max_workers == 2  # pylint: disable=protected-access
+
+
+def make_record(district: str, maize_min: int = 100):
+    """Build a `cn_crop_prices` row for the tests."""
+    return {
+        "ts": date(2024, 1, 2),
+        "region": "Mbeya",
+        "district": district,
+        "crop": "maize",
+        "source_url": SOURCE_URL,
+        "min_price": Decimal(maize_min),
+        "max_price": Decimal(200),
+    }
+
+
+def test_dataframe_to_records():
+    """Test converting a parsed bulletin into table rows, dropping missing crops."""
+    df = pd.DataFrame(
+        [
+            {
+                "ts": pd.Timestamp("2024-01-02"),
+                "region": "Mbeya",
+                "district": "Soweto",
+                "maize_min": 100.0,
+                "maize_max": 200.0,
+                "rice_min": np.nan,
+                "rice_max": np.nan,
+                "beans_min": np.nan,
+                "beans_max": 300.0,
+            }
+        ]
+    )
+
+    records = dataframe_to_records(SOURCE_URL, df)
+
+    assert [
+        (record["crop"], record["min_price"], record["max_price"]) for record in records
+    ] == [
+        ("maize", Decimal("100.0"), Decimal("200.0")),
+        ("beans", None, Decimal("300.0")),
+    ]
+    assert all(record["source_url"] == SOURCE_URL for record in records)
+    assert all(record["district"] == "Soweto" for record in records)
+
+
+@pytest.mark.asyncio
+async def test_save_records_bulk_batches_and_upserts():
+    """Test that rows are de-duplicated and sent in multi-row upsert batches."""
+    session = AsyncMock()
+    records = [
+        make_record("Soweto"),
+        make_record("Mbalizi"),
+        make_record("Soweto", maize_min=150),
+    ]
+
+    await save_records_bulk(session, records, batch_size=1, on_conflict="update")
+
+    statements = [call.args[0] for call in session.execute.call_args_list]
+    assert len(statements) == 2
+    compiled = [
+        statement.compile(dialect=postgresql.dialect()) for statement in statements
+    ]
+    assert all("ON CONFLICT" in str(sql) for sql in compiled)
+    assert all("DO UPDATE" in str(sql) for sql in compiled)
+    assert compiled[0].params["min_price_m0"] == 150
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_save_records_bulk_ignores_existing_rows_by_default():
+    """Test that existing rows are skipped instead of aborting the ingestion."""
+    session = AsyncMock()
+
+    await save_records_bulk(session, [make_record("Soweto"), make_record("Mbalizi")])
+
+    (statement,) = [call.args[0] for call in session.execute.call_args_list]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (ts, region, district, crop) DO NOTHING" in sql
+
+
+async def pdf_chunks():
+    """Asynchronously yield the content of a cached PDF."""
+    yield b"%PDF"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("maize_min, changed", [(100, False), (150, True)])
+async def test_reparse_documents_replaces_changed_bulletins(
+    tmp_path, maize_min, changed
+):
+    """Test that only bulletins whose parsed rows changed get their rows replaced."""
+    pdf_cache = PDFCache(str(tmp_path))
+    await pdf_cache.store(SOURCE_URL, pdf_chunks())
+    missing_url = SOURCE_URL.replace("0000000000", "0000000001")
+
+    parser = MagicMock(spec=CropPricesPDFParser, version="v2")
+    parser.parse_dataframe.return_value = pd.DataFrame(
+        [
+            {
+                "Date": pd.Timestamp("2024-01-02"),
+                "Region": "Mbeya",
+                "District": "Soweto",
+                "Maize Min": float(maize_min),
+                "Maize Max": 200.0,
+            }
+        ]
+    )
+
+    stored = MagicMock()
+    stored.all.return_value = [
+        (
+            SOURCE_URL,
+            date(2024, 1, 2),
+            "Mbeya",
+            "Soweto",
+            "maize",
+            Decimal("100.00"),
+            Decimal(200),
+        )
+    ]
+    session = AsyncMock()
+    session.scalars.return_value = MagicMock(
+        all=MagicMock(return_value=[SOURCE_URL, missing_url])
+    )
+    session.execute.return_value = stored
+
+    counts = await reparse_documents(session, parser, pdf_cache)
+
+    assert counts == {
+        "changed": int(changed),
+        "unchanged": int(not changed),
+        "missing": 1,
+    }
+    parser.parse_dataframe.assert_called_once_with(
+        pdf_cache.object_path(pdf_cache.lookup(SOURCE_URL)["sha256"]),
+        "sw-0000000000-Wholesale.pdf",
+    )
+    sql = [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.call_args_list
+    ]
+    assert any("INSERT INTO cn_documents" in statement for statement in sql)
+    assert (
+        any("DELETE FROM cn_crop_prices" in statement for statement in sql) == changed
+    )
+
+
+@pytest.mark.asyncio
+async def test_reparse_documents_leaves_keys_of_other_bulletins(tmp_path):
+    """Test that rows saved from another bulletin of the same day are not a change."""
+    pdf_cache = PDFCache(str(tmp_path))
+    await pdf_cache.store(SOURCE_URL, pdf_chunks())
+    other_url = SOURCE_URL.replace("0000000000", "0000000001")
+
+    parser = MagicMock(spec=CropPricesPDFParser, version="v2")
+    parser.parse_dataframe.return_value = pd.DataFrame(
+        [
+            {
+                "Date": pd.Timestamp("2024-01-02"),
+                "Region": "Mbeya",
+                "District": district,
+                "Maize Min": 100.0,
+                "Maize Max": 200.0,
+            }
+            for district in ("Soweto", "Mbalizi")
+        ]
+    )
+
+    # Soweto was saved from the other bulletin published the same day
+    stored = MagicMock()
+    stored.all.return_value = [
+        (url, date(2024, 1, 2), "Mbeya", district, "maize", Decimal(100), Decimal(200))
+        for url, district in ((other_url, "Soweto"), (SOURCE_URL, "Mbalizi"))
+    ]
+    session = AsyncMock()
+    session.scalars.return_value = MagicMock(all=MagicMock(return_value=[SOURCE_URL]))
+    session.execute.return_value = stored
+
+    for _ in range(2):
+        counts = await reparse_documents(session, parser, pdf_cache, everything=True)
+        assert counts == {"changed": 0, "unchanged": 1, "missing": 0}
+
+    sql = [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.call_args_list
+    ]
+    assert not any("DELETE FROM cn_crop_prices" in statement for statement in sql)
+
+
+@pytest.mark.asyncio
+async def test_download_daily_updates_keeps_dates_committed_before_a_failure(
+    monkeypatch,
+):
+    """Test that the dates of the bulletins saved before a failing one are kept."""
+
+    async def failing_stream(**_):
+        yield SOURCE_URL, pd.DataFrame(
+            [
+                {
+                    "Date": pd.Timestamp("2024-01-02"),
+                    "Region": "Mbeya",
+                    "District": "Soweto",
+                    "Maize Min": 100.0,
+                    "Maize Max": 200.0,
+                }
+            ]
+        )
+        raise RuntimeError("Broken bulletin")
+
+    monkeypatch.setattr(workers, "parsed_dataframes_stream", failing_stream)
+    monkeypatch.setattr(workers, "record_document", AsyncMock())
+    monkeypatch.setattr(workers, "ensure_partitions", AsyncMock())
+    monkeypatch.setattr(workers, "save_records_bulk", AsyncMock())
+
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(fetchall=MagicMock(return_value=[]))
+    ingested_dates = set()
+
+    with pytest.raises(RuntimeError):
+        await download_daily_updates(
+            base_url="https://www.viwanda.go.tz",
+            session=session,
+            parser=MagicMock(spec=CropPricesPDFParser, version="v2"),
+            ingested_dates=ingested_dates,
+        )
+
+    assert ingested_dates == {date(2024, 1, 2)}
+    session.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ingest_and_publish_publishes_dates_committed_before_a_failure(
+    monkeypatch, tmp_path
+):
+    """Test that a failing ingestion still refreshes and announces the saved dates."""
+
+    async def failing_download(ingested_dates, **_):
+        ingested_dates.add(date(2024, 1, 2))
+        raise RuntimeError("Broken bulletin")
+
+    sessions = []
+
+    @asynccontextmanager
+    async def acquire_session():
+        sessions.append(AsyncMock())
+        yield sessions[-1]
+
+    result_cache = AsyncMock()
+    settings = MagicMock(export_dir=str(tmp_path), export_keep=2)
+    monkeypatch.setattr(workers, "get_settings", lambda: settings)
+    monkeypatch.setattr(workers, "acquire_session", acquire_session)
+    monkeypatch.setattr(workers, "download_daily_updates", failing_download)
+    monkeypatch.setattr(workers, "get_result_cache", lambda: result_cache)
+    monkeypatch.setattr(workers, "get_pdf_cache", MagicMock())
+    monkeypatch.setattr(workers, "get_redis_client", MagicMock())
+    monkeypatch.setattr(workers, "CropPricesPDFParser", MagicMock())
+    for name in ("refresh_rollups", "publish_ingest", "write_snapshot"):
+        monkeypatch.setattr(workers, name, AsyncMock())
+
+    with pytest.raises(RuntimeError):
+        await ingest_and_publish()
+
+    workers.refresh_rollups.assert_awaited_once_with(sessions[0], {date(2024, 1, 2)})
+    result_cache.invalidate.assert_awaited_once()
+    workers.publish_ingest.assert_awaited_once()
+    # The snapshot is only written after a successful ingestion
+    workers.write_snapshot.assert_not_awaited()